@@ -0,0 +1,164 @@
+"""Materialized dashboard aggregates for each teacher.
+
+:class:`DashboardAggregates` derives every teacher's dashboard counters from
+the section, roster and assignment fixtures once, then keeps them current by
+subscribing to :class:`~api.mock_data.MockAssignmentStore` writes instead of
+rescanning. Per teacher it holds the set of sections taught, a count of
+sections per enrolled student (so a student in two of the teacher's sections
+is counted once) and a sorted list of assignment due dates. Reading a
+dashboard is then O(1) for the counts and O(log n) for the two due-date
+counts, which depend on the current date and so are answered by bisection
+at read time.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Mapping, Sequence, Set, Tuple
+
+from . import mock_data
+from .mock_data import (
+    AssignmentChange,
+    AssignmentRecord,
+    DatasetVersions,
+    MockAssignmentStore,
+)
+
+DUE_SOON_DAYS = 7
+"""``assignments_due`` counts assignments due from today through this many days ahead."""
+
+
+@dataclass
+class TeacherDashboard:
+    """Running aggregates for one teacher's sections."""
+
+    sections: Set[int] = field(default_factory=set)
+    students: Counter = field(default_factory=Counter)
+    assignments: Dict[int, str] = field(default_factory=dict)
+    due_dates: List[Tuple[str, int]] = field(default_factory=list)
+
+    def add_assignment(self, record: AssignmentRecord) -> None:
+        due_date = record.get("due_date") or ""
+        self.assignments[record["id"]] = due_date
+        if due_date:
+            insort(self.due_dates, (due_date, record["id"]))
+
+    def remove_assignment(self, assignment_id: int) -> None:
+        due_date = self.assignments.pop(assignment_id, None)
+        if due_date:
+            index = bisect_left(self.due_dates, (due_date, assignment_id))
+            del self.due_dates[index]
+
+    def _due_before(self, day: date) -> int:
+        return bisect_left(self.due_dates, (day.isoformat(), 0))
+
+    def payload(self, today: date, extra: Mapping[str, Any]) -> Dict[str, Any]:
+        past_due = self._due_before(today)
+        due_soon = self._due_before(today + timedelta(days=DUE_SOON_DAYS + 1)) - past_due
+        return {
+            "sections": len(self.sections),
+            "students": len(self.students),
+            "assignments": len(self.assignments),
+            "assignments_due": due_soon,
+            "assignments_past_due": past_due,
+            **extra,
+        }
+
+
+class DashboardAggregates:
+    """Per-teacher dashboard counters maintained from store change events.
+
+    ``section_teachers`` maps section ids to teacher ids and ``rosters`` is
+    ``SECTION_ROSTERS``-shaped. Assignments count towards the teacher of
+    their ``section_id``; past-due ones are reported as
+    ``assignments_past_due``. Every change bumps the ``dashboard`` dataset
+    version.
+    """
+
+    def __init__(
+        self,
+        section_teachers: Mapping[int, int],
+        rosters: Mapping[int, Mapping[str, Any]],
+        store: MockAssignmentStore,
+        versions: DatasetVersions,
+        extra: Mapping[str, Any] | None = None,
+    ) -> None:
+        self._section_teachers = section_teachers
+        self._versions = versions
+        self._extra = dict(extra or {})
+        self._teachers: Dict[int, TeacherDashboard] = {}
+        self._lock = threading.Lock()
+        for section_id, teacher_id in section_teachers.items():
+            dashboard = self._teachers.setdefault(teacher_id, TeacherDashboard())
+            dashboard.sections.add(section_id)
+            roster = rosters.get(section_id) or {}
+            dashboard.students.update(student["id"] for student in roster.get("students", ()))
+        for record in store.all():
+            self._assignment_added(record)
+        store.subscribe(self.assignments_changed)
+
+    def _teacher(self, record: AssignmentRecord | None) -> TeacherDashboard | None:
+        if record is None:
+            return None
+        teacher_id = self._section_teachers.get(record.get("section_id"))
+        return self._teachers.get(teacher_id)
+
+    def _assignment_added(self, record: AssignmentRecord) -> None:
+        dashboard = self._teacher(record)
+        if dashboard is not None:
+            dashboard.add_assignment(record)
+
+    def assignments_changed(self, changes: Sequence[AssignmentChange]) -> None:
+        """Store listener: move each changed assignment between teachers' aggregates."""
+        changed = False
+        with self._lock:
+            for before, after in changes:
+                previous = self._teacher(before)
+                if previous is not None:
+                    previous.remove_assignment(before["id"])
+                    changed = True
+                if after is not None and self._teacher(after) is not None:
+                    self._assignment_added(after)
+                    changed = True
+        if changed:
+            self._versions.bump("dashboard")
+
+    def roster_changed(
+        self,
+        section_id: int,
+        before: Mapping[str, Any] | None,
+        after: Mapping[str, Any],
+    ) -> None:
+        """:class:`~api.mock_data.RosterFixtures` listener: recount the section's students."""
+        teacher_id = self._section_teachers.get(section_id)
+        if teacher_id not in self._teachers:
+            return
+        with self._lock:
+            students = self._teachers[teacher_id].students
+            students.subtract(student["id"] for student in (before or {}).get("students", ()))
+            students.update(student["id"] for student in after.get("students", ()))
+            for student_id in [key for key, count in students.items() if count <= 0]:
+                del students[student_id]
+        self._versions.bump("dashboard")
+
+    def __contains__(self, teacher_id: Any) -> bool:
+        return teacher_id in self._teachers
+
+    def payload(self, teacher_id: int, today: date | None = None) -> Dict[str, Any]:
+        """Dashboard counters for ``teacher_id``; raises ``KeyError`` if unknown."""
+        with self._lock:
+            return self._teachers[teacher_id].payload(today or date.today(), self._extra)
+
+
+DASHBOARDS = DashboardAggregates(
+    mock_data.SECTION_TEACHERS,
+    mock_data.SECTION_ROSTERS,
+    mock_data.ASSIGNMENT_STORE,
+    mock_data.DATASET_VERSIONS,
+    extra=mock_data.DASHBOARD_STATS,
+)
+"""Dashboards for the mock teachers, kept in sync with ``ASSIGNMENT_STORE`` and the rosters."""
+mock_data.SECTION_ROSTERS.subscribe(DASHBOARDS.roster_changed)
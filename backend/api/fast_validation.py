@@ -0,0 +1,216 @@
+"""Precompiled fast-path validation for flat DRF serializers.
+
+DRF's generic field machinery is general but slow for small flat payloads.
+:func:`compile_serializer` inspects a serializer's declared fields once and
+builds a plain function that validates the common, well-formed case directly.
+
+The compiled validator only ever *accepts* input that DRF would accept with
+the same result. Anything it is unsure about -- invalid values, coercions DRF
+performs leniently, unsupported field types -- makes it return ``None`` so the
+caller falls back to the real serializer. Error responses therefore always
+come from DRF and keep their exact shape.
+"""
+from __future__ import annotations
+
+import datetime
+import re
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Type
+
+from django.core import validators as django_validators
+from rest_framework import fields, serializers
+from rest_framework.fields import empty
+from rest_framework.settings import ISO_8601, api_settings
+from rest_framework.validators import ProhibitSurrogateCharactersValidator
+
+Converter = Callable[[Any], Any]
+CompiledValidator = Callable[..., Optional[Dict[str, Any]]]
+
+_INTEGER_RE = re.compile(r"-?\d{1,50}\Z")
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}\Z")
+_SURROGATES_RE = re.compile("[\ud800-\udfff]")
+
+
+class _Reject(Exception):
+    """Internal signal: hand this payload to the DRF serializer."""
+
+
+def _limits(field: fields.Field) -> Tuple[Any, Any, Any, Any, bool]:
+    """Return (min_value, max_value, min_length, max_length, check_chars).
+
+    Raises ``TypeError`` when the field carries a validator we cannot mirror.
+    """
+    min_value = max_value = min_length = max_length = None
+    check_chars = False
+    for validator in field.validators:
+        if isinstance(validator, django_validators.MinValueValidator):
+            min_value = validator.limit_value
+        elif isinstance(validator, django_validators.MaxValueValidator):
+            max_value = validator.limit_value
+        elif isinstance(validator, django_validators.MinLengthValidator):
+            min_length = validator.limit_value
+        elif isinstance(validator, django_validators.MaxLengthValidator):
+            max_length = validator.limit_value
+        elif isinstance(
+            validator,
+            (
+                django_validators.ProhibitNullCharactersValidator,
+                ProhibitSurrogateCharactersValidator,
+            ),
+        ):
+            check_chars = True
+        else:
+            raise TypeError(f"Unsupported validator {validator!r}")
+    return min_value, max_value, min_length, max_length, check_chars
+
+
+def _integer_converter(field: fields.IntegerField) -> Converter:
+    min_value, max_value, _, _, _ = _limits(field)
+
+    def convert(value: Any) -> int:
+        if type(value) is int:
+            number = value
+        elif type(value) is str and _INTEGER_RE.match(value):
+            number = int(value)
+        else:
+            raise _Reject
+        if (min_value is not None and number < min_value) or (
+            max_value is not None and number > max_value
+        ):
+            raise _Reject
+        return number
+
+    return convert
+
+
+def _char_converter(field: fields.CharField) -> Converter:
+    _, _, min_length, max_length, check_chars = _limits(field)
+    trim = field.trim_whitespace
+    allow_blank = field.allow_blank
+
+    def convert(value: Any) -> str:
+        if type(value) is not str:
+            raise _Reject
+        text = value.strip() if trim else value
+        if text == "":
+            if not allow_blank:
+                raise _Reject
+            return ""
+        if (min_length is not None and len(text) < min_length) or (
+            max_length is not None and len(text) > max_length
+        ):
+            raise _Reject
+        if check_chars and ("\x00" in text or _SURROGATES_RE.search(text)):
+            raise _Reject
+        return text
+
+    return convert
+
+
+def _date_converter(field: fields.DateField) -> Converter:
+    input_formats = getattr(field, "input_formats", None) or api_settings.DATE_INPUT_FORMATS
+    if [fmt.lower() for fmt in input_formats] != [ISO_8601]:
+        raise TypeError("Only ISO 8601 date input is supported")
+    _limits(field)
+
+    def convert(value: Any) -> datetime.date:
+        if type(value) is datetime.date:
+            return value
+        if type(value) is not str or not _ISO_DATE_RE.match(value):
+            raise _Reject
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            raise _Reject from None
+
+    return convert
+
+
+def _nullable(convert: Converter) -> Converter:
+    """Accept ``None`` as DRF does for ``allow_null`` fields, before any type check."""
+
+    def nullable(value: Any) -> Any:
+        return None if value is None else convert(value)
+
+    return nullable
+
+
+_CONVERTERS: Dict[Type[fields.Field], Callable[[Any], Converter]] = {
+    fields.IntegerField: _integer_converter,
+    fields.CharField: _char_converter,
+    fields.DateField: _date_converter,
+}
+
+
+def compile_serializer(
+    serializer_class: Type[serializers.Serializer],
+) -> CompiledValidator | None:
+    """Compile ``serializer_class`` into a fast validator, if it is simple enough.
+
+    Returns ``None`` when the serializer uses anything the fast path does not
+    mirror exactly (custom ``validate`` hooks, serializer-level validators,
+    nested or unsupported fields, defaults, ...). The returned
+    callable takes ``(data, partial=False)`` and returns the validated data, or
+    ``None`` when the caller must run the DRF serializer instead.
+    """
+    if serializer_class.validate is not serializers.Serializer.validate:
+        return None
+    serializer = serializer_class()
+    if serializer.get_validators():
+        return None
+
+    plan: List[Tuple[str, Converter, bool]] = []
+    for name, field in serializer.fields.items():
+        if field.read_only:
+            continue
+        if hasattr(serializer_class, f"validate_{name}"):
+            return None
+        if (
+            field.source != name
+            or field.default is not empty
+            or type(field) not in _CONVERTERS
+        ):
+            return None
+        try:
+            converter = _CONVERTERS[type(field)](field)
+        except TypeError:
+            return None
+        if field.allow_null:
+            converter = _nullable(converter)
+        plan.append((name, converter, field.required))
+
+    def validate(data: Any, partial: bool = False) -> Dict[str, Any] | None:
+        if type(data) is not dict:
+            return None
+        validated: Dict[str, Any] = {}
+        try:
+            for name, convert, required in plan:
+                if name in data:
+                    validated[name] = convert(data[name])
+                elif required and not partial:
+                    return None
+        except _Reject:
+            return None
+        return validated
+
+    return validate
+
+
+def validate_with_fallback(
+    serializer_class: Type[serializers.Serializer],
+    compiled: CompiledValidator | None,
+    data: Any,
+    *,
+    partial: bool = False,
+) -> Mapping[str, Any]:
+    """Validate ``data`` on the fast path, falling back to the DRF serializer.
+
+    Raises DRF's ``ValidationError`` exactly as ``is_valid(raise_exception=True)``
+    would when the payload is invalid.
+    """
+    if compiled is not None:
+        validated = compiled(data, partial=partial)
+        if validated is not None:
+            return validated
+    serializer = serializer_class(data=data, partial=partial)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
@@ -0,0 +1,972 @@
+"""Vectorized gradebook computations.
+
+A section gradebook is loaded once into a column-major students x assignments
+``float32`` matrix of scores plus a sparse set of exemptions, after which
+totals, category-weighted grades and per-assignment statistics are
+whole-matrix NumPy operations instead of per-student Python loops.
+:class:`LiveGradebook` keeps those totals cached and adjusts them per changed
+cell or assignment, and :data:`GRADEBOOKS` holds one per mock section. It keeps
+no dict copy of the gradebook; that shape is rebuilt from the columns on demand.
+
+Grade semantics:
+
+* an assignment absent from a student's ``grades`` is *missing* (not yet
+  graded) and is left out of both earned and possible points;
+* an assignment listed in a student's ``exempt`` ids is *exempt* and is left
+  out the same way, even if a score was recorded.
+"""
+from __future__ import annotations
+
+import bisect
+import copy
+import sys
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+import numpy as np
+
+from . import mock_data
+from .mock_data import AssignmentChange, DatasetVersions, MockAssignmentStore
+from .section_stats import RunningStats, SectionStats
+
+_NAN = float("nan")
+
+SCORE_DTYPE = np.float32
+"""Storage type for scores: exact for integers and halves, 4 bytes per cell."""
+
+_SCORE_DIGITS = 4
+
+_T = TypeVar("_T")
+
+
+def _rounded(values: np.ndarray, digits: int = 2) -> List[float | None]:
+    """Return ``values`` as JSON-friendly floats, with ``NaN`` mapped to ``None``."""
+    rounded = np.round(values.astype(np.float64), digits)
+    return [None if value != value else value for value in rounded.tolist()]
+
+
+def _scores(values: np.ndarray) -> List[float | None]:
+    """Stored scores as JSON values: ints when integral, ``None`` for ``NaN``."""
+    rounded = np.round(values.astype(np.float64), _SCORE_DIGITS).tolist()
+    return [
+        None if value != value else int(value) if value.is_integer() else value
+        for value in rounded
+    ]
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise ``numerator / denominator`` with ``NaN`` where the latter is 0."""
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    return np.divide(numerator, denominator, out=out, where=denominator > 0)
+
+
+def _weighted_percentages(
+    category_earned: np.ndarray,
+    category_possible: np.ndarray,
+    category_names: Sequence[str],
+    weights: Mapping[str, float],
+) -> np.ndarray:
+    """Combine per-category subtotals (``students x categories``) by weight.
+
+    Weights are renormalised per student over the categories that student
+    has counted grades in, so an empty category does not drag a grade down.
+    Students with no weighted grades get ``NaN``.
+    """
+    weight_vector = np.array([float(weights.get(name, 0.0)) for name in category_names])
+    present = category_possible > 0
+    applied = np.where(present, weight_vector, 0.0)
+    per_category = np.where(present, _ratio(category_earned, category_possible), 0.0)
+    return _ratio((per_category * applied).sum(axis=1), applied.sum(axis=1)) * 100.0
+
+
+class GradebookMatrix:
+    """A section gradebook held column-wise in NumPy arrays.
+
+    ``scores`` is a ``(students, assignments)`` ``float32`` matrix in column
+    (Fortran) order, so each assignment's scores are one contiguous array;
+    ``NaN`` marks a missing grade. Exemptions are rare and kept sparse in
+    ``exempt``, a mapping of row to its sorted list of exempt columns.
+    """
+
+    def __init__(
+        self,
+        student_ids: Sequence[int],
+        assignment_ids: Sequence[int],
+        points_possible: Sequence[float],
+        categories: Sequence[str | None],
+        scores: np.ndarray,
+        exempt: Dict[int, List[int]],
+    ) -> None:
+        self.student_ids = np.asarray(student_ids, dtype=np.int64)
+        self.assignment_ids = np.asarray(assignment_ids, dtype=np.int64)
+        self.points_possible = np.asarray(points_possible, dtype=np.float64)
+        self.categories = list(categories)
+        self.scores = np.asfortranarray(scores, dtype=SCORE_DTYPE)
+        self.exempt = exempt
+        self.category_names = sorted({name for name in self.categories if name})
+
+    @classmethod
+    def from_gradebook(cls, gradebook: Mapping[str, Any]) -> "GradebookMatrix":
+        """Load a ``SECTION_GRADEBOOKS``-shaped payload into matrix form."""
+        assignments = gradebook["assignments"]
+        students = gradebook["students"]
+        assignment_ids = [assignment["id"] for assignment in assignments]
+        # JSON round-trips turn the integer grade keys into strings.
+        string_ids = [str(assignment_id) for assignment_id in assignment_ids]
+        columns = {assignment_id: index for index, assignment_id in enumerate(assignment_ids)}
+        columns.update({key: index for index, key in enumerate(string_ids)})
+
+        rows: List[List[Any]] = []
+        exempt: Dict[int, List[int]] = {}
+        for row, student in enumerate(students):
+            grades = student.get("grades") or {}
+            keys = string_ids if grades and isinstance(next(iter(grades)), str) else assignment_ids
+            rows.append([grades.get(key) for key in keys])
+            exempt_columns = {
+                columns[assignment_id]
+                for assignment_id in student.get("exempt", ())
+                if assignment_id in columns
+            }
+            if exempt_columns:
+                exempt[row] = sorted(exempt_columns)
+
+        shape = (len(students), len(assignments))
+        # ``None`` (no grade recorded) converts to NaN.
+        scores = np.array(rows, dtype=SCORE_DTYPE).reshape(shape)
+        return cls(
+            student_ids=[student["student_id"] for student in students],
+            assignment_ids=assignment_ids,
+            points_possible=[assignment["points_possible"] for assignment in assignments],
+            categories=[assignment.get("category") for assignment in assignments],
+            scores=scores,
+            exempt=exempt,
+        )
+
+    @property
+    def category_matrix(self) -> np.ndarray:
+        """Assignment -> category one-hot matrix; uncategorised rows stay zero."""
+        codes = {name: index for index, name in enumerate(self.category_names)}
+        matrix = np.zeros((len(self.categories), len(self.category_names)), dtype=np.float64)
+        for column, name in enumerate(self.categories):
+            if name:
+                matrix[column, codes[name]] = 1.0
+        return matrix
+
+    def is_exempt(self, row: int, column: int) -> bool:
+        return column in self.exempt.get(row, ())
+
+    def set_exempt(self, row: int, column: int, exempt: bool) -> None:
+        columns = self.exempt.get(row, [])
+        index = bisect.bisect_left(columns, column)
+        present = index < len(columns) and columns[index] == column
+        if exempt and not present:
+            columns.insert(index, column)
+            self.exempt[row] = columns
+        elif not exempt and present:
+            del columns[index]
+            if not columns:
+                del self.exempt[row]
+
+    def counted_mask(self, columns: Any = slice(None)) -> np.ndarray:
+        """Boolean mask of grades that count towards totals, for ``columns``."""
+        mask = ~np.isnan(self.scores[:, columns])
+        if self.exempt:
+            positions = np.atleast_1d(np.arange(len(self.assignment_ids))[columns])
+            lookup = {column: index for index, column in enumerate(positions.tolist())}
+            # A view that is 2-D even when ``columns`` is a single column.
+            grid = mask.reshape(len(mask), -1)
+            for row, exempt_columns in self.exempt.items():
+                for column in exempt_columns:
+                    index = lookup.get(column)
+                    if index is not None:
+                        grid[row, index] = False
+        return mask
+
+    @property
+    def counted(self) -> np.ndarray:
+        """Boolean mask of grades that count towards totals."""
+        return self.counted_mask()
+
+    def _earned_matrix(self, counted: np.ndarray) -> np.ndarray:
+        return np.where(counted, self.scores, 0.0).astype(np.float64)
+
+    def student_totals(self) -> Dict[str, np.ndarray]:
+        """Per-student earned points, possible points and percentage."""
+        counted = self.counted
+        earned = self._earned_matrix(counted).sum(axis=1)
+        possible = counted.astype(np.float64) @ self.points_possible
+        return {
+            "earned": earned,
+            "possible": possible,
+            "percentage": _ratio(earned, possible) * 100.0,
+        }
+
+    def category_subtotals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-student earned and possible points per category (``students x categories``)."""
+        counted = self.counted
+        earned = self._earned_matrix(counted) @ self.category_matrix
+        possible = counted.astype(np.float64) @ (
+            self.category_matrix * self.points_possible[:, None]
+        )
+        return earned, possible
+
+    def category_percentages(self) -> np.ndarray:
+        """Per-student, per-category percentage (``students x categories``)."""
+        earned, possible = self.category_subtotals()
+        return _ratio(earned, possible) * 100.0
+
+    def weighted_percentages(self, weights: Mapping[str, float]) -> np.ndarray:
+        """Category-weighted percentage per student; see :func:`_weighted_percentages`."""
+        earned, possible = self.category_subtotals()
+        return _weighted_percentages(earned, possible, self.category_names, weights)
+
+    def assignment_stats(self, columns: Any = slice(None)) -> Dict[str, np.ndarray]:
+        """Per-assignment count, mean, median, min, max and population stdev.
+
+        ``columns`` restricts the computation to a subset of assignments (any
+        NumPy column index); the result arrays follow that subset.
+        """
+        scores = self.scores[:, columns].astype(np.float64)
+        counted = self.counted_mask(columns)
+        count = counted.sum(axis=0)
+        mean = _ratio(np.where(counted, scores, 0.0).sum(axis=0), count)
+        deviations = np.where(counted, scores - mean, 0.0)
+        stdev = np.sqrt(_ratio((deviations**2).sum(axis=0), count))
+        # NaN sorts last, so each column starts with its ``count`` counted scores.
+        ordered = np.sort(np.where(counted, scores, np.nan), axis=0)
+        if not ordered.shape[0]:
+            ordered = np.full((1, ordered.shape[1]), np.nan)
+        positions = np.arange(ordered.shape[1])
+        median = (ordered[(count - 1) // 2, positions] + ordered[count // 2, positions]) / 2
+        empty = count == 0
+        # Copy, so the result does not keep the whole sorted matrix alive.
+        minimum = ordered[0].copy()
+        maximum = ordered[np.maximum(count - 1, 0), positions]
+        return {
+            "count": count,
+            "mean": mean,
+            "median": np.where(empty, np.nan, median),
+            "min": minimum,
+            "max": np.where(empty, np.nan, maximum),
+            "stdev": stdev,
+            "mean_percentage": _ratio(mean, self.points_possible[columns]) * 100.0,
+        }
+
+
+def _student_entries(
+    students: Sequence[Mapping[str, Any]],
+    totals: Mapping[str, np.ndarray],
+    weighted: np.ndarray | None,
+) -> List[Dict[str, Any]]:
+    """Pair each student with its row of ``totals``/``weighted``."""
+    earned = _rounded(totals["earned"])
+    possible = _rounded(totals["possible"])
+    percentage = _rounded(totals["percentage"])
+    weighted_percentage = (
+        _rounded(weighted) if weighted is not None else [None] * len(percentage)
+    )
+    return [
+        {
+            **student,
+            "earned": earned[row],
+            "possible": possible[row],
+            "percentage": percentage[row],
+            "weighted_percentage": weighted_percentage[row],
+        }
+        for row, student in enumerate(students)
+    ]
+
+
+def _section_entries(
+    assignment_ids: Sequence[int],
+    totals: Mapping[str, np.ndarray],
+    weighted: np.ndarray | None,
+    stats: Mapping[str, np.ndarray],
+) -> Dict[str, Any]:
+    """Return the section-level ``assignment_stats`` and ``class_average``."""
+    columns = {
+        name: values.tolist() if name == "count" else _rounded(values)
+        for name, values in stats.items()
+    }
+    assignment_stats = [
+        {
+            "assignment_id": assignment_id,
+            **{name: column[index] for name, column in columns.items()},
+        }
+        for index, assignment_id in enumerate(assignment_ids)
+    ]
+    final = weighted if weighted is not None else totals["percentage"]
+    graded = final[~np.isnan(final)]
+    class_average = _rounded(np.array([graded.mean() if graded.size else _NAN]))[0]
+    return {"assignment_stats": assignment_stats, "class_average": class_average}
+
+
+def gradebook_payload(gradebook: Mapping[str, Any]) -> Dict[str, Any]:
+    """Return ``gradebook`` extended with computed totals and statistics.
+
+    Each student gains ``earned``, ``possible``, ``percentage`` and
+    ``weighted_percentage``; the section gains ``assignment_stats`` and
+    ``class_average``. Existing keys are passed through unchanged.
+    """
+    matrix = GradebookMatrix.from_gradebook(gradebook)
+    weights = gradebook.get("category_weights") or {}
+    totals = matrix.student_totals()
+    weighted = matrix.weighted_percentages(weights) if weights else None
+    return {
+        **gradebook,
+        "students": _student_entries(gradebook["students"], totals, weighted),
+        **_section_entries(
+            matrix.assignment_ids.tolist(), totals, weighted, matrix.assignment_stats()
+        ),
+    }
+
+
+def _interned(value: _T) -> _T:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _extra_fields(
+    records: Sequence[Mapping[str, Any]], known: frozenset
+) -> Dict[int, Dict[str, Any]]:
+    """Fields beyond ``known`` by record index, for the few records that have any."""
+    extras = {}
+    for index, record in enumerate(records):
+        extra = {key: value for key, value in record.items() if key not in known}
+        if extra:
+            extras[index] = copy.deepcopy(extra)
+    return extras
+
+
+class LiveGradebook:
+    """A section gradebook whose totals are maintained incrementally.
+
+    Per-student earned/possible sums and per-category subtotals are computed
+    once, then adjusted in place: :meth:`set_grade` touches a single cell in
+    O(1) and :meth:`update_assignment` a single column in O(students).
+    Per-assignment statistics are recomputed lazily, and only for the
+    columns that changed. The fuller :meth:`section_stats` summaries are
+    built on first request and from then on updated per change.
+
+    Grades live only in the columnar :class:`GradebookMatrix`; student names
+    are interned and looked up by row through a student-id index. The
+    dict-shaped gradebook (see :meth:`to_dict`) is rebuilt on demand, so a
+    whole school's sections fit in a fraction of the memory the JSON-shaped
+    fixtures take.
+    """
+
+    _STUDENT_KEYS = frozenset({"student_id", "name", "grades", "exempt"})
+    _ASSIGNMENT_KEYS = frozenset({"id", "title", "points_possible", "category"})
+
+    def __init__(self, gradebook: Mapping[str, Any]) -> None:
+        self.matrix = GradebookMatrix.from_gradebook(gradebook)
+        matrix = self.matrix
+        # Section fields; ``assignments`` keeps its slot and is rebuilt on demand.
+        self._section: Dict[str, Any] = {
+            key: None if key == "assignments" else copy.deepcopy(value)
+            for key, value in gradebook.items()
+            if key != "students"
+        }
+        assignments = gradebook["assignments"]
+        self._titles = [_interned(assignment["title"]) for assignment in assignments]
+        # As entered, so integral points stay ints in the JSON.
+        self._points: List[Any] = [assignment["points_possible"] for assignment in assignments]
+        matrix.categories = [_interned(name) for name in matrix.categories]
+        self._assignment_extras = _extra_fields(assignments, self._ASSIGNMENT_KEYS)
+        students = gradebook["students"]
+        self._names = [_interned(student.get("name")) for student in students]
+        self._student_extras = _extra_fields(students, self._STUDENT_KEYS)
+        self._rows = {
+            student_id: row for row, student_id in enumerate(matrix.student_ids.tolist())
+        }
+        self._columns = {
+            assignment_id: column
+            for column, assignment_id in enumerate(matrix.assignment_ids.tolist())
+        }
+        self._category_codes = {name: code for code, name in enumerate(matrix.category_names)}
+        counted = matrix.counted
+        self.earned = matrix._earned_matrix(counted).sum(axis=1)
+        self.possible = counted.astype(np.float64) @ matrix.points_possible
+        self.category_earned, self.category_possible = matrix.category_subtotals()
+        self._stats = matrix.assignment_stats()
+        self._stale_columns: Set[int] = set()
+        self._section_stats: SectionStats | None = None
+        self._lock = threading.Lock()
+
+    def __contains__(self, assignment_id: Any) -> bool:
+        return assignment_id in self._columns
+
+    def _category_code(self, name: str | None) -> int | None:
+        """Return the subtotal column for ``name``, adding one if it is new."""
+        if not name:
+            return None
+        code = self._category_codes.get(name)
+        if code is None:
+            matrix = self.matrix
+            code = len(matrix.category_names)
+            self._category_codes[name] = code
+            matrix.category_names.append(name)
+            padding = np.zeros((len(self.earned), 1))
+            self.category_earned = np.hstack([self.category_earned, padding])
+            self.category_possible = np.hstack([self.category_possible, padding])
+        return code
+
+    def set_grade(
+        self,
+        student_id: int,
+        assignment_id: int,
+        score: float | None,
+        *,
+        exempt: bool = False,
+    ) -> None:
+        """Record one grade (``None`` clears it) and adjust the running totals.
+
+        Raises ``KeyError`` when the student or assignment is not part of the
+        gradebook.
+        """
+        matrix = self.matrix
+        # Totals are adjusted by the stored (float32) value so they never drift
+        # from a recomputation over the matrix.
+        stored = _NAN if score is None else float(SCORE_DTYPE(score))
+        with self._lock:
+            # Looked up under the lock: removing an assignment shifts columns.
+            row = self._rows[student_id]
+            column = self._columns[assignment_id]
+            old_score = float(matrix.scores[row, column])
+            old_counted = not (old_score != old_score or matrix.is_exempt(row, column))
+            new_counted = score is not None and not exempt
+            earned_delta = (stored if new_counted else 0.0) - (old_score if old_counted else 0.0)
+            possible_delta = matrix.points_possible[column] * (new_counted - old_counted)
+
+            matrix.scores[row, column] = stored
+            matrix.set_exempt(row, column, exempt)
+            self.earned[row] += earned_delta
+            self.possible[row] += possible_delta
+            code = self._category_codes.get(matrix.categories[column])
+            if code is not None:
+                self.category_earned[row, code] += earned_delta
+                self.category_possible[row, code] += possible_delta
+            self._stale_columns.add(column)
+            if self._section_stats is not None:
+                points = float(matrix.points_possible[column])
+                if old_counted:
+                    self._section_stats.remove(row, column, old_score, points)
+                if new_counted:
+                    self._section_stats.add(row, column, stored, points)
+
+    def set_grades(
+        self, grades: Iterable[Tuple[int, int, float | None]]
+    ) -> List[Tuple[int, int]]:
+        """Record many ``(student_id, assignment_id, score)`` grades.
+
+        Returns the ``(student_id, assignment_id)`` pairs skipped because the
+        student or assignment is not in this gradebook.
+        """
+        skipped = []
+        for student_id, assignment_id, score in grades:
+            try:
+                self.set_grade(student_id, assignment_id, score)
+            except KeyError:
+                skipped.append((student_id, assignment_id))
+        return skipped
+
+    def add_assignments(self, records: Sequence[Mapping[str, Any]]) -> int:
+        """Append an ungraded column per new assignment record; returns how many were added.
+
+        Records already in the gradebook are left alone (see
+        :meth:`update_assignment`). The score matrix is copied once per call,
+        so add assignments in batches.
+        """
+        with self._lock:
+            unique: Dict[int, Mapping[str, Any]] = {}
+            for record in records:
+                if record["id"] not in self._columns:
+                    unique.setdefault(record["id"], record)
+            new = list(unique.values())
+            if not new:
+                return 0
+            matrix = self.matrix
+            first = len(self._titles)
+            empty = np.full((len(self._names), len(new)), np.nan, dtype=SCORE_DTYPE)
+            matrix.scores = np.asfortranarray(np.hstack([matrix.scores, empty]))
+            matrix.assignment_ids = np.append(
+                matrix.assignment_ids, [record["id"] for record in new]
+            )
+            matrix.points_possible = np.append(
+                matrix.points_possible, [float(record.get("points_possible", 0)) for record in new]
+            )
+            for column, record in enumerate(new, first):
+                category = _interned(record.get("category"))
+                matrix.categories.append(category)
+                self._category_code(category)
+                self._titles.append(_interned(record.get("title")))
+                self._points.append(record.get("points_possible", 0))
+                self._columns[record["id"]] = column
+                self._stale_columns.add(column)
+                if self._section_stats is not None:
+                    self._section_stats.assignments.append(RunningStats())
+            for name, values in self._stats.items():
+                self._stats[name] = np.append(values, np.zeros(len(new), dtype=values.dtype))
+        return len(new)
+
+    def update_assignment(self, record: Mapping[str, Any]) -> bool:
+        """Apply a changed assignment record's points, category and title.
+
+        Returns ``False`` (and does nothing) if nothing the gradebook uses
+        changed or the assignment is not in this gradebook.
+        """
+        matrix = self.matrix
+        with self._lock:
+            column = self._columns.get(record["id"])
+            if column is None:
+                return False
+            points_value = record.get("points_possible", self._points[column])
+            points = float(points_value)
+            category = _interned(record.get("category", matrix.categories[column]))
+            title = _interned(record.get("title", self._titles[column]))
+            if (
+                points == matrix.points_possible[column]
+                and category == matrix.categories[column]
+                and title == self._titles[column]
+            ):
+                return False
+            counted = matrix.counted_mask(column)
+            earned = np.where(counted, matrix.scores[:, column], 0.0).astype(np.float64)
+            old_possible = counted * matrix.points_possible[column]
+            new_possible = counted * points
+            old_code = self._category_codes.get(matrix.categories[column])
+            new_code = self._category_code(category)
+            old_points = float(matrix.points_possible[column])
+            if self._section_stats is not None and points != old_points:
+                rows = np.flatnonzero(counted).tolist()
+                for row, score in zip(rows, matrix.scores[rows, column].tolist()):
+                    self._section_stats.remove(row, column, score, old_points)
+                    self._section_stats.add(row, column, score, points)
+
+            self.possible += new_possible - old_possible
+            if old_code is not None:
+                self.category_earned[:, old_code] -= earned
+                self.category_possible[:, old_code] -= old_possible
+            if new_code is not None:
+                self.category_earned[:, new_code] += earned
+                self.category_possible[:, new_code] += new_possible
+            matrix.points_possible[column] = points
+            matrix.categories[column] = category
+            self._points[column] = points_value
+            self._titles[column] = title
+            self._stale_columns.add(column)
+        return True
+
+    def remove_assignment(self, assignment_id: int) -> bool:
+        """Drop an assignment's column and take its grades out of the totals.
+
+        Returns ``False`` if the assignment is not in this gradebook. Like
+        :meth:`add_assignments`, this copies the score matrix.
+        """
+        with self._lock:
+            column = self._columns.get(assignment_id)
+            if column is None:
+                return False
+            matrix = self.matrix
+            counted = matrix.counted_mask(column)
+            earned = np.where(counted, matrix.scores[:, column], 0.0).astype(np.float64)
+            possible = counted * matrix.points_possible[column]
+            self.earned -= earned
+            self.possible -= possible
+            code = self._category_codes.get(matrix.categories[column])
+            if code is not None:
+                self.category_earned[:, code] -= earned
+                self.category_possible[:, code] -= possible
+            if self._section_stats is not None:
+                points = float(matrix.points_possible[column])
+                rows = np.flatnonzero(counted).tolist()
+                for row, score in zip(rows, matrix.scores[rows, column].tolist()):
+                    self._section_stats.remove(row, column, score, points)
+                del self._section_stats.assignments[column]
+
+            def shifted(columns: Iterable[int]) -> List[int]:
+                return [index - (index > column) for index in columns if index != column]
+
+            matrix.scores = np.asfortranarray(np.delete(matrix.scores, column, axis=1))
+            matrix.assignment_ids = np.delete(matrix.assignment_ids, column)
+            matrix.points_possible = np.delete(matrix.points_possible, column)
+            del matrix.categories[column]
+            for row, exempt_columns in list(matrix.exempt.items()):
+                remaining = shifted(exempt_columns)
+                if remaining:
+                    matrix.exempt[row] = remaining
+                else:
+                    del matrix.exempt[row]
+            del self._titles[column]
+            del self._points[column]
+            self._assignment_extras = {
+                index - (index > column): extra
+                for index, extra in self._assignment_extras.items()
+                if index != column
+            }
+            self._columns = {
+                assignment: index
+                for index, assignment in enumerate(matrix.assignment_ids.tolist())
+            }
+            for name, values in self._stats.items():
+                self._stats[name] = np.delete(values, column)
+            self._stale_columns = set(shifted(self._stale_columns))
+        return True
+
+    def _assignments(self) -> List[Dict[str, Any]]:
+        """The section's assignment entries. Caller must hold the lock."""
+        entries = []
+        columns = zip(
+            self.matrix.assignment_ids.tolist(), self._titles, self._points, self.matrix.categories
+        )
+        for column, (assignment_id, title, points, category) in enumerate(columns):
+            entry = {
+                "id": assignment_id,
+                "title": title,
+                "points_possible": points,
+                "category": category,
+            }
+            if column in self._assignment_extras:
+                entry.update(copy.deepcopy(self._assignment_extras[column]))
+            entries.append(entry)
+        return entries
+
+    def _section_fields(self) -> Dict[str, Any]:
+        """Every section field but the students. Caller must hold the lock."""
+        return {**copy.deepcopy(self._section), "assignments": self._assignments()}
+
+    def _student_dicts(self, rows: slice = slice(None)) -> List[Dict[str, Any]]:
+        """Student dicts for ``rows``. Caller must hold the lock."""
+        matrix = self.matrix
+        assignment_ids = matrix.assignment_ids.tolist()
+        scores = matrix.scores[rows]
+        graded = ~np.isnan(scores)
+        # One conversion of the whole block beats per-row NumPy calls; whole
+        # number scores (the usual case) come out as ints directly.
+        filled = np.where(graded, scores, 0.0)
+        if np.array_equal(filled, np.trunc(filled)):
+            values = filled.astype(np.int64).tolist()
+        else:
+            rounded = np.round(filled.astype(np.float64), _SCORE_DIGITS)
+            values = [
+                [int(value) if value.is_integer() else value for value in row]
+                for row in rounded.tolist()
+            ]
+        present = graded.tolist()
+        student_ids = matrix.student_ids[rows].tolist()
+        students = []
+        for offset, row in enumerate(range(len(self._names))[rows]):
+            student = {"student_id": student_ids[offset], "name": self._names[row]}
+            if row in self._student_extras:
+                student.update(copy.deepcopy(self._student_extras[row]))
+            student["grades"] = {
+                assignment_id: value
+                for assignment_id, value, recorded in zip(
+                    assignment_ids, values[offset], present[offset]
+                )
+                if recorded
+            }
+            exempt_columns = matrix.exempt.get(row)
+            if exempt_columns:
+                student["exempt"] = [assignment_ids[column] for column in exempt_columns]
+            students.append(student)
+        return students
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the gradebook in its ``SECTION_GRADEBOOKS`` shape.
+
+        Scores come back as ints when integral and otherwise rounded to
+        four decimal places, the precision kept in storage.
+        """
+        with self._lock:
+            return {**self._section_fields(), "students": self._student_dicts()}
+
+    def read(self, func: Callable[[Mapping[str, Any]], _T]) -> _T:
+        """Call ``func`` with the gradebook, as :meth:`to_dict` returns it."""
+        return func(self.to_dict())
+
+    def _refresh_stats(self) -> None:
+        """Recompute statistics for changed columns. Caller must hold the lock."""
+        if self._stale_columns:
+            columns = np.fromiter(sorted(self._stale_columns), dtype=np.intp)
+            fresh = self.matrix.assignment_stats(columns)
+            for name, values in fresh.items():
+                self._stats[name][columns] = values
+            self._stale_columns.clear()
+
+    def _totals(
+        self, rows: slice = slice(None)
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray | None]:
+        """Totals and weighted percentages for ``rows``. Caller must hold the lock."""
+        earned = self.earned[rows]
+        possible = self.possible[rows]
+        totals = {
+            "earned": earned.copy(),
+            "possible": possible.copy(),
+            "percentage": _ratio(earned, possible) * 100.0,
+        }
+        weights = self._section.get("category_weights") or {}
+        weighted = (
+            _weighted_percentages(
+                self.category_earned[rows],
+                self.category_possible[rows],
+                self.matrix.category_names,
+                weights,
+            )
+            if weights
+            else None
+        )
+        return totals, weighted
+
+    def _students(self, rows: slice = slice(None)) -> List[Dict[str, Any]]:
+        """Student entries for ``rows``, detached from later grade changes."""
+        totals, weighted = self._totals(rows)
+        return _student_entries(self._student_dicts(rows), totals, weighted)
+
+    def _header(self) -> Dict[str, Any]:
+        """Everything but the students. Caller must hold the lock."""
+        self._refresh_stats()
+        totals, weighted = self._totals()
+        header = self._section_fields()
+        header.update(
+            _section_entries(
+                self.matrix.assignment_ids.tolist(),
+                totals,
+                weighted,
+                {name: values.copy() for name, values in self._stats.items()},
+            )
+        )
+        return header
+
+    def payload(self) -> Dict[str, Any]:
+        """Return the gradebook response body from the maintained totals."""
+        with self._lock:
+            return {**self._header(), "students": self._students()}
+
+    def section_stats(self) -> Dict[str, Any]:
+        """Per-assignment and per-student score statistics; see :mod:`api.section_stats`.
+
+        The statistics are built on first use and then maintained along with
+        the totals, so later calls only read the running summaries.
+        """
+        with self._lock:
+            matrix = self.matrix
+            if self._section_stats is None:
+                self._section_stats = SectionStats(
+                    matrix.scores, matrix.counted, matrix.points_possible
+                )
+            return {
+                "section_id": self._section.get("section_id"),
+                **self._section_stats.payload(
+                    matrix.student_ids.tolist(), matrix.assignment_ids.tolist()
+                ),
+            }
+
+    def export_batches(self, chunk_size: int = 256) -> Iterator[Dict[str, List[Any]]]:
+        """Yield the recorded grade cells as columns, ``chunk_size`` students at a time.
+
+        Each batch maps every name in :data:`EXPORT_COLUMNS` to an equal-length
+        list, one entry per graded or exempt cell, in student then assignment
+        order. Like :meth:`stream`, each batch is built under the lock and
+        nothing larger than a batch is held.
+        """
+        for start in range(0, len(self._names), chunk_size):
+            with self._lock:
+                matrix = self.matrix
+                rows = slice(start, start + chunk_size)
+                scores = matrix.scores[rows]
+                exempt = np.zeros(scores.shape, dtype=bool)
+                for row, columns in matrix.exempt.items():
+                    if start <= row < start + scores.shape[0]:
+                        exempt[row - start, columns] = True
+                offsets, columns = np.nonzero(~np.isnan(scores) | exempt)
+                names = self._names[rows]
+                column_list = columns.tolist()
+                batch = {
+                    "section_id": [self._section.get("section_id")] * len(column_list),
+                    "student_id": matrix.student_ids[rows][offsets].tolist(),
+                    "student_name": [names[offset] for offset in offsets.tolist()],
+                    "assignment_id": matrix.assignment_ids[columns].tolist(),
+                    "assignment_title": [self._titles[column] for column in column_list],
+                    "category": [matrix.categories[column] for column in column_list],
+                    "points_possible": [self._points[column] for column in column_list],
+                    "score": _scores(scores[offsets, columns]),
+                    "exempt": exempt[offsets, columns].tolist(),
+                }
+            if column_list:
+                yield batch
+
+    def stream(
+        self, encode: Callable[[Any], bytes], chunk_size: int = 256
+    ) -> Iterator[bytes]:
+        """Yield ``encode``d lines: a header, then one line per student.
+
+        The header holds the section fields, ``assignment_stats``,
+        ``class_average`` and ``student_count``. Students are encoded
+        ``chunk_size`` rows at a time under the lock, so memory use does not
+        grow with the section and a slow consumer never blocks writers.
+        """
+        with self._lock:
+            header = self._header()
+            header["student_count"] = len(self._names)
+        yield encode(header)
+        for start in range(0, header["student_count"], chunk_size):
+            with self._lock:
+                chunk = b"".join(
+                    encode(student)
+                    for student in self._students(slice(start, start + chunk_size))
+                )
+            yield chunk
+
+
+EXPORT_COLUMNS: Sequence[str] = (
+    "section_id",
+    "student_id",
+    "student_name",
+    "assignment_id",
+    "assignment_title",
+    "category",
+    "points_possible",
+    "score",
+    "exempt",
+)
+"""Columns of :meth:`LiveGradebook.export_batches`, one row per grade cell."""
+
+
+class GradebookRegistry:
+    """Live gradebooks for the sections in ``fixtures``, built on first use.
+
+    The registry subscribes to ``store`` so edits to an assignment that
+    appears in a section's gradebook (matched by id and ``section_id``) are
+    folded into that gradebook, and bumps the ``gradebook:<section_id>``
+    dataset version whenever a gradebook changes. Deleting an assignment, or
+    moving it to another section, drops its column from the section it left;
+    the registry remembers that so a later rebuild from the fixture does not
+    bring the column back.
+    """
+
+    def __init__(
+        self,
+        fixtures: Mapping[int, Mapping[str, Any]],
+        store: MockAssignmentStore,
+        versions: DatasetVersions,
+    ) -> None:
+        self._fixtures = fixtures
+        self._store = store
+        self._versions = versions
+        self._live: Dict[int, Tuple[Mapping[str, Any], LiveGradebook]] = {}
+        self._removed: Dict[int, Set[int]] = {}
+        self._lock = threading.RLock()
+        store.subscribe(self.assignments_changed)
+
+    def get(self, section_id: int) -> LiveGradebook | None:
+        fixture = self._fixtures.get(section_id)
+        if not fixture:
+            return None
+        cached = self._live.get(section_id)
+        if cached is not None and cached[0] is fixture:
+            return cached[1]
+        with self._lock:
+            cached = self._live.get(section_id)
+            if cached is not None and cached[0] is fixture:
+                return cached[1]
+            live = LiveGradebook(fixture)
+            for assignment_id in self._removed.get(section_id, ()):
+                live.remove_assignment(assignment_id)
+            for assignment in fixture["assignments"]:
+                record = self._store.get(assignment["id"])
+                if record is not None and record.get("section_id") == section_id:
+                    live.update_assignment(record)
+            self._live[section_id] = (fixture, live)
+            return live
+
+    def set_grade(
+        self,
+        section_id: int,
+        student_id: int,
+        assignment_id: int,
+        score: float | None,
+        *,
+        exempt: bool = False,
+    ) -> LiveGradebook:
+        """Record a grade; raises ``KeyError`` for unknown sections, students or assignments."""
+        live = self.get(section_id)
+        if live is None:
+            raise KeyError(section_id)
+        live.set_grade(student_id, assignment_id, score, exempt=exempt)
+        self._versions.bump(f"gradebook:{section_id}")
+        return live
+
+    def set_grades(
+        self, section_id: int, grades: Iterable[Tuple[int, int, float | None]]
+    ) -> List[Tuple[int, int]]:
+        """Record many grades with one version bump; see :meth:`LiveGradebook.set_grades`.
+
+        Raises ``KeyError`` for an unknown section.
+        """
+        live = self.get(section_id)
+        if live is None:
+            raise KeyError(section_id)
+        skipped = live.set_grades(grades)
+        self._versions.bump(f"gradebook:{section_id}")
+        return skipped
+
+    def add_assignments(self, section_id: int, records: Sequence[Mapping[str, Any]]) -> int:
+        """Add columns for new assignment records; raises ``KeyError`` for an unknown section.
+
+        Store edits only reach columns a gradebook already has, so importers
+        call this for the assignments they create.
+        """
+        live = self.get(section_id)
+        if live is None:
+            raise KeyError(section_id)
+        added = live.add_assignments(records)
+        if added:
+            self._versions.bump(f"gradebook:{section_id}")
+        return added
+
+    def assignments_changed(self, changes: Sequence[AssignmentChange]) -> None:
+        """Store listener: fold assignment edits into the affected gradebooks."""
+        with self._lock:
+            for before, after in changes:
+                section_id = after.get("section_id") if after is not None else None
+                if before is not None and (after is None or before.get("section_id") != section_id):
+                    self._remove(before.get("section_id"), before["id"])
+                if after is None:
+                    continue
+                self._removed.get(section_id, set()).discard(after["id"])
+                cached = self._live.get(section_id)
+                if cached is not None and cached[1].update_assignment(after):
+                    self._versions.bump(f"gradebook:{section_id}")
+
+    def _remove(self, section_id: int, assignment_id: int) -> None:
+        """Drop an assignment that left ``section_id``. Caller must hold the lock."""
+        self._removed.setdefault(section_id, set()).add(assignment_id)
+        cached = self._live.get(section_id)
+        if cached is not None and cached[1].remove_assignment(assignment_id):
+            self._versions.bump(f"gradebook:{section_id}")
+
+    def reset(self) -> None:
+        """Drop every live gradebook so the next read rebuilds from the fixtures."""
+        with self._lock:
+            sections = list(self._live)
+            self._live.clear()
+        for section_id in sections:
+            self._versions.bump(f"gradebook:{section_id}")
+
+
+GRADEBOOKS = GradebookRegistry(
+    mock_data.SECTION_GRADEBOOKS, mock_data.ASSIGNMENT_STORE, mock_data.DATASET_VERSIONS
+)
+"""Live gradebooks for the mock sections, kept in sync with ``ASSIGNMENT_STORE``."""
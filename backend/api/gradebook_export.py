@@ -0,0 +1,135 @@
+"""Streaming gradebook exports for spreadsheets and SIS imports.
+
+Exports are "long" tables with one row per recorded grade cell (see
+:data:`~api.gradebook.EXPORT_COLUMNS`), so sections with different
+assignments concatenate into a single district-wide file. Rows flow through
+a generator pipeline: each :class:`~api.gradebook.LiveGradebook` yields
+bounded column batches, and an encoder turns every batch into bytes for the
+response. No list of all rows is ever built.
+
+CSV is always available. Arrow IPC streams and Parquet need ``pyarrow``;
+:func:`export_stream` raises ``RuntimeError`` up front when it is missing.
+"""
+from __future__ import annotations
+
+import csv
+import io
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List
+
+from .gradebook import EXPORT_COLUMNS, LiveGradebook
+
+EXPORT_FORMATS = ("csv", "arrow", "parquet")
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+FILE_EXTENSIONS = {"csv": "csv", "arrow": "arrows", "parquet": "parquet"}
+
+BUFFER_SIZE = 64 * 1024
+"""Encoded output is yielded in pieces of about this many bytes."""
+
+Batch = Dict[str, List[Any]]
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Write-only sink whose contents are taken in pieces with :meth:`drain`."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as exc:  # pragma: no cover - executed only without deps
+        raise RuntimeError("pyarrow is required for Arrow and Parquet exports") from exc
+    return pyarrow
+
+
+def _csv_chunks(batches: Iterable[Batch]) -> Iterator[bytes]:
+    buffer = _ChunkBuffer()
+    text = io.TextIOWrapper(buffer, encoding="utf-8", newline="", write_through=True)
+    writer = csv.writer(text)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        writer.writerows(zip(*(batch[column] for column in EXPORT_COLUMNS)))
+        if len(buffer) >= BUFFER_SIZE:
+            yield buffer.drain()
+    text.flush()
+    if len(buffer):
+        yield buffer.drain()
+
+
+def _arrow_schema(pa):
+    return pa.schema(
+        [
+            ("section_id", pa.int64()),
+            ("student_id", pa.int64()),
+            ("student_name", pa.string()),
+            ("assignment_id", pa.int64()),
+            ("assignment_title", pa.string()),
+            ("category", pa.string()),
+            ("points_possible", pa.float64()),
+            ("score", pa.float64()),
+            ("exempt", pa.bool_()),
+        ]
+    )
+
+
+def _arrow_chunks(pa, batches: Iterable[Batch], fmt: str) -> Iterator[bytes]:
+    schema = _arrow_schema(pa)
+    buffer = _ChunkBuffer()
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(buffer, schema)
+    else:
+        writer = pa.ipc.new_stream(buffer, schema)
+    with writer:
+        for batch in batches:
+            writer.write_batch(pa.RecordBatch.from_pydict(batch, schema=schema))
+            if len(buffer) >= BUFFER_SIZE:
+                yield buffer.drain()
+    if len(buffer):
+        yield buffer.drain()
+
+
+def export_stream(gradebooks: Iterable[LiveGradebook], fmt: str) -> Iterator[bytes]:
+    """Encode the grade cells of ``gradebooks`` in ``fmt``, one piece at a time.
+
+    ``gradebooks`` is consumed lazily, so a generator of sections is only
+    loaded as the export reaches it. Raises ``ValueError`` for an unknown
+    format and ``RuntimeError`` when ``fmt`` needs ``pyarrow`` and it is not
+    installed; both are raised here, before any output.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    batches = chain.from_iterable(gradebook.export_batches() for gradebook in gradebooks)
+    if fmt == "csv":
+        return _csv_chunks(batches)
+    return _arrow_chunks(_pyarrow(), batches, fmt)
@@ -0,0 +1,314 @@
+"""Grading-policy engine for term and course grades.
+
+Implements the grading algorithm from the system design: normalise scores,
+group them by category, drop the lowest scores where configured, combine
+categories by weight into a term grade, combine terms by weight into a course
+grade, then map the course grade to a letter and GPA.
+
+A :class:`GradingPolicy` is compiled once by :func:`compile_policy` into an
+:class:`EvaluationPlan`. For each section the plan resolves every assignment
+to a ``(term, category)`` bucket up front, then grades all students in one
+pass over those buckets. All arithmetic is :class:`~decimal.Decimal` in one
+fixed context, whatever the caller's decimal context is; results are rounded
+half-up to two places only at the end, and drops are ordered by
+``(percentage, assignment id)`` so ties are broken the same way every time.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Context, Decimal, localcontext
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+_CONTEXT = Context(prec=28, rounding=ROUND_HALF_UP)
+_CENT = Decimal("0.01")
+_HUNDRED = Decimal(100)
+_ZERO = Decimal(0)
+
+
+def _decimal(value: Any) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _round(value: Decimal) -> Decimal:
+    return value.quantize(_CENT, context=_CONTEXT)
+
+
+@dataclass(frozen=True)
+class CategoryRule:
+    """Weight and drop-lowest count for one assignment category."""
+
+    name: str
+    weight: Decimal
+    drop_lowest: int = 0
+
+
+@dataclass(frozen=True)
+class GradeBand:
+    """Lowest rounded percentage that earns ``letter`` and ``gpa``."""
+
+    minimum: Decimal
+    letter: str
+    gpa: Decimal
+
+
+DEFAULT_SCALE: Tuple[GradeBand, ...] = (
+    GradeBand(Decimal(90), "A", Decimal("4.0")),
+    GradeBand(Decimal(80), "B", Decimal("3.0")),
+    GradeBand(Decimal(70), "C", Decimal("2.0")),
+    GradeBand(Decimal(60), "D", Decimal("1.0")),
+    GradeBand(_ZERO, "F", Decimal("0.0")),
+)
+
+
+@dataclass(frozen=True)
+class GradingPolicy:
+    """A school- or section-level grading policy.
+
+    ``term_weights`` is a tuple of ``(term, weight)`` pairs; when empty every
+    term counts equally. With ``missing_as_zero`` an ungraded assignment
+    scores zero, otherwise it is skipped like an exempt one. Assignments in
+    categories the policy does not list are not graded.
+    """
+
+    categories: Tuple[CategoryRule, ...]
+    term_weights: Tuple[Tuple[str, Decimal], ...] = ()
+    scale: Tuple[GradeBand, ...] = DEFAULT_SCALE
+    missing_as_zero: bool = True
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "GradingPolicy":
+        """Build a policy from its JSON form, raising ``ValueError`` if invalid."""
+        categories = tuple(
+            CategoryRule(
+                name=str(item["name"]),
+                weight=_decimal(item["weight"]),
+                drop_lowest=int(item.get("drop_lowest", 0)),
+            )
+            for item in data.get("categories", ())
+        )
+        if not categories:
+            raise ValueError("A grading policy needs at least one category")
+        names = [rule.name for rule in categories]
+        if len(set(names)) != len(names):
+            raise ValueError("Category names must be unique")
+        if any(rule.weight < 0 or rule.drop_lowest < 0 for rule in categories):
+            raise ValueError("Weights and drop counts must not be negative")
+        scale = tuple(
+            sorted(
+                (
+                    GradeBand(_decimal(band["min"]), str(band["letter"]), _decimal(band["gpa"]))
+                    for band in data.get("scale", ())
+                ),
+                key=lambda band: band.minimum,
+                reverse=True,
+            )
+        )
+        return cls(
+            categories=categories,
+            term_weights=tuple(
+                (str(term), _decimal(weight))
+                for term, weight in data.get("term_weights", {}).items()
+            ),
+            scale=scale or DEFAULT_SCALE,
+            missing_as_zero=bool(data.get("missing_as_zero", True)),
+        )
+
+
+def _drop_lowest(items: List[Tuple[Any, Any, int]], count: int) -> None:
+    """Remove the ``count`` lowest ``(score, points, id)`` items in place.
+
+    Items are compared by ``score / points`` using exact cross-multiplication,
+    with ties going to the lower assignment id.
+    """
+    for _ in range(count):
+        lowest = 0
+        low_score, low_points, low_id = items[0]
+        for index in range(1, len(items)):
+            score, points, assignment_id = items[index]
+            left, right = score * low_points, low_score * points
+            if left < right or (left == right and assignment_id < low_id):
+                lowest = index
+                low_score, low_points, low_id = score, points, assignment_id
+        del items[lowest]
+
+
+def _native(value: Any) -> Any:
+    """Return ``value`` as an int when integral, otherwise as a ``Decimal``."""
+    number = _decimal(value)
+    return int(number) if number == number.to_integral_value() else number
+
+
+@dataclass(frozen=True)
+class _Column:
+    keys: Tuple[Any, ...]
+    assignment_id: int
+    points: Any
+    extra_credit: bool
+
+
+@dataclass
+class _Bucket:
+    term: int
+    category: int
+    columns: List[_Column] = field(default_factory=list)
+
+
+class EvaluationPlan:
+    """A compiled :class:`GradingPolicy`; see :func:`compile_policy`."""
+
+    def __init__(self, policy: GradingPolicy) -> None:
+        self.policy = policy
+        self._category_index = {rule.name: index for index, rule in enumerate(policy.categories)}
+        self._weights = [rule.weight for rule in policy.categories]
+        self._drops = [rule.drop_lowest for rule in policy.categories]
+        self._term_weights = dict(policy.term_weights)
+
+    def _layout(
+        self, gradebook: Mapping[str, Any]
+    ) -> Tuple[List[str], List[Decimal], List[_Bucket]]:
+        """Resolve each assignment of ``gradebook`` to its (term, category) bucket."""
+        default_term = gradebook.get("grading_period") or ""
+        terms: List[str] = []
+        buckets: Dict[Tuple[int, int], _Bucket] = {}
+        for assignment in gradebook["assignments"]:
+            category = self._category_index.get(assignment.get("category"))
+            if category is None:
+                continue
+            term_name = assignment.get("term") or default_term
+            if term_name not in terms:
+                terms.append(term_name)
+            term = terms.index(term_name)
+            bucket = buckets.setdefault((term, category), _Bucket(term, category))
+            assignment_id = assignment["id"]
+            bucket.columns.append(
+                _Column(
+                    keys=(assignment_id, str(assignment_id)),
+                    assignment_id=assignment_id,
+                    points=_native(assignment["points_possible"]),
+                    extra_credit=bool(assignment.get("extra_credit", False)),
+                )
+            )
+        if self._term_weights:
+            term_weights = [self._term_weights.get(term, _ZERO) for term in terms]
+        else:
+            term_weights = [Decimal(1)] * len(terms)
+        ordered = sorted(buckets.values(), key=lambda bucket: (bucket.term, bucket.category))
+        return terms, term_weights, ordered
+
+    def _bucket_percentage(
+        self, bucket: _Bucket, grades: Mapping[Any, Any], exempt: Iterable[Any]
+    ) -> Decimal | None:
+        # Sums stay in exact native arithmetic (ints, or Decimals for fractional
+        # scores) and become one Decimal division at the end.
+        regular: List[Tuple[Any, Any, int]] = []
+        bonus: Any = 0
+        for column in bucket.columns:
+            if column.assignment_id in exempt:
+                continue
+            score = grades.get(column.keys[0], grades.get(column.keys[1]))
+            if score is None:
+                if column.extra_credit or not self.policy.missing_as_zero:
+                    continue
+                score = 0
+            elif type(score) is not int:
+                score = _decimal(score)
+            if column.extra_credit:
+                bonus += score
+            elif column.points > 0:
+                regular.append((score, column.points, column.assignment_id))
+        drop = self._drops[bucket.category]
+        if drop and len(regular) > 1:
+            _drop_lowest(regular, min(drop, len(regular) - 1))
+        possible = sum(item[1] for item in regular)
+        if not possible:
+            return None
+        earned = sum((item[0] for item in regular), bonus)
+        return _CONTEXT.divide(Decimal(earned) * _HUNDRED, Decimal(possible))
+
+    def _letter(self, percentage: Decimal) -> Tuple[str, Decimal]:
+        for band in self.policy.scale:
+            if percentage >= band.minimum:
+                return band.letter, band.gpa
+        last = self.policy.scale[-1]
+        return last.letter, last.gpa
+
+    def evaluate(self, gradebook: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        """Grade every student in ``gradebook``.
+
+        Returns one entry per student with per-term category and term
+        percentages, plus the course ``percentage``, ``letter`` and ``gpa``.
+        Percentages are two-place ``Decimal`` values, or ``None`` when nothing
+        was graded.
+        """
+        with localcontext(_CONTEXT):
+            return self._evaluate(gradebook)
+
+    def _evaluate(self, gradebook: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        terms, term_weights, buckets = self._layout(gradebook)
+        results = []
+        for student in gradebook["students"]:
+            grades = student.get("grades") or {}
+            exempt = set(student.get("exempt", ()))
+            # Per term: weighted category sum and the weight actually applied.
+            term_totals = [[_ZERO, _ZERO] for _ in terms]
+            categories: List[Dict[str, Decimal]] = [{} for _ in terms]
+            for bucket in buckets:
+                percentage = self._bucket_percentage(bucket, grades, exempt)
+                if percentage is None:
+                    continue
+                weight = self._weights[bucket.category]
+                name = self.policy.categories[bucket.category].name
+                categories[bucket.term][name] = _round(percentage)
+                term_totals[bucket.term][0] += percentage * weight
+                term_totals[bucket.term][1] += weight
+
+            term_results: Dict[str, Dict[str, Any]] = {}
+            course_sum = course_weight = _ZERO
+            for index, term in enumerate(terms):
+                weighted, applied = term_totals[index]
+                if not applied:
+                    term_results[term] = {"percentage": None, "categories": {}}
+                    continue
+                term_percentage = _CONTEXT.divide(weighted, applied)
+                term_results[term] = {
+                    "percentage": _round(term_percentage),
+                    "categories": categories[index],
+                }
+                if term_weights[index]:
+                    course_sum += term_percentage * term_weights[index]
+                    course_weight += term_weights[index]
+
+            course = _round(_CONTEXT.divide(course_sum, course_weight)) if course_weight else None
+            letter, gpa = self._letter(course) if course is not None else (None, None)
+            results.append(
+                {
+                    "student_id": student["student_id"],
+                    "terms": term_results,
+                    "percentage": course,
+                    "letter": letter,
+                    "gpa": gpa,
+                }
+            )
+        return results
+
+
+@lru_cache(maxsize=64)
+def compile_policy(policy: GradingPolicy) -> EvaluationPlan:
+    """Return the (cached) evaluation plan for ``policy``."""
+    return EvaluationPlan(policy)
+
+
+def evaluate_sections(
+    gradebooks: Sequence[Mapping[str, Any]],
+    policy_for: Callable[[Mapping[str, Any]], GradingPolicy],
+) -> Dict[int, List[Dict[str, Any]]]:
+    """Grade many sections, e.g. a whole school at term end.
+
+    ``policy_for`` maps a gradebook to its :class:`GradingPolicy`; sections
+    sharing a policy share one compiled plan.
+    """
+    return {
+        gradebook["section_id"]: compile_policy(policy_for(gradebook)).evaluate(gradebook)
+        for gradebook in gradebooks
+    }
@@ -1,10 +1,76 @@
 """Mock data fixtures for the SchoolOS API."""
 from __future__ import annotations
 
-from copy import deepcopy
+import sys
+import threading
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass, field
-from datetime import date
-from typing import Dict, List
+from datetime import date, datetime, timezone
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+
+BOOT_ID = uuid.uuid4().hex[:12]
+"""Identifies this process' copy of the mock data in ETags."""
+
+_BOOT_TIME = datetime.now(timezone.utc)
+
+
+class DatasetVersion(NamedTuple):
+    """Version stamp for one cacheable dataset."""
+
+    key: str
+    version: int
+    modified: datetime
+
+    @property
+    def etag(self) -> str:
+        """Strong ETag; the boot id keeps restarted counters from colliding."""
+        return f'"{BOOT_ID}-{self.key}-{self.version}"'
+
+
+class DatasetVersions:
+    """Thread-safe version counters for the fixture payloads below.
+
+    Code that mutates ``ME_PAYLOAD``, the dashboard aggregates, ``COURSES``, a
+    roster or a gradebook must call :meth:`bump` with the matching key (``"me"``,
+    ``"dashboard"``, ``"courses"``, ``"roster:<section_id>"`` or
+    ``"gradebook:<section_id>"``) after the change so cached representations
+    and ETags are invalidated.
+    """
+
+    def __init__(self) -> None:
+        self._versions: Dict[str, DatasetVersion] = {}
+        self._lock = threading.Lock()
+
+    def current(self, key: str) -> DatasetVersion:
+        return self._versions.get(key) or DatasetVersion(key, 0, _BOOT_TIME)
+
+    def bump(self, key: str) -> DatasetVersion:
+        with self._lock:
+            stamp = DatasetVersion(
+                key, self.current(key).version + 1, datetime.now(timezone.utc)
+            )
+            self._versions[key] = stamp
+        return stamp
+
+
+DATASET_VERSIONS = DatasetVersions()
 
 
 ME_PAYLOAD = {
@@ -17,12 +83,10 @@ ME_PAYLOAD = {
 }
 
 DASHBOARD_STATS = {
-    "sections": 3,
-    "students": 74,
-    "assignments_due": 5,
     "assignments_to_grade": 12,
     "attendance_rate": 0.96,
 }
+"""Dashboard figures no mock store backs yet; ``api.dashboard`` computes the rest."""
 
 COURSES = [
     {
@@ -46,71 +110,349 @@ COURSES = [
     },
 ]
 
-SECTION_ROSTERS = {
-    301: {
-        "section_id": 301,
-        "students": [
-            {"id": 501, "first_name": "Alice", "last_name": "Nguyen"},
-            {"id": 502, "first_name": "Miguel", "last_name": "Lopez"},
-            {"id": 503, "first_name": "Priya", "last_name": "Singh"},
-        ],
-    },
-    302: {
-        "section_id": 302,
-        "students": [
-            {"id": 504, "first_name": "Jon", "last_name": "Martinez"},
-            {"id": 505, "first_name": "Keisha", "last_name": "Wright"},
-        ],
-    },
-    303: {
-        "section_id": 303,
-        "students": [
-            {"id": 506, "first_name": "Cam", "last_name": "Davis"},
-            {"id": 507, "first_name": "Noah", "last_name": "Kim"},
-        ],
+SECTION_TEACHERS: Dict[int, int] = {301: 1, 302: 1, 303: 2}
+"""Teacher (user) id for each section; ``ME_PAYLOAD`` is teacher 1."""
+
+class StudentRecord(NamedTuple):
+    """One student; stored once in a :class:`StudentTable` and referenced by id."""
+
+    id: int
+    first_name: str
+    last_name: str
+
+    def to_json(self) -> Dict[str, Any]:
+        """The roster entry shape served by the API."""
+        return {"id": self.id, "first_name": self.first_name, "last_name": self.last_name}
+
+
+class StudentTable:
+    """The shared student records that rosters and gradebooks refer to by id.
+
+    Name strings are interned so the many rosters and gradebooks naming the
+    same student, and students sharing a first or last name, hold one copy.
+    """
+
+    def __init__(self, students: Sequence[StudentRecord] = ()) -> None:
+        self._records: Dict[int, StudentRecord] = {}
+        for student in students:
+            self.put(student)
+
+    def put(self, student: StudentRecord) -> StudentRecord:
+        """Add or replace a student; returns the stored record."""
+        record = StudentRecord(
+            student.id, sys.intern(student.first_name), sys.intern(student.last_name)
+        )
+        self._records[record.id] = record
+        return record
+
+    def __getitem__(self, student_id: int) -> StudentRecord:
+        return self._records[student_id]
+
+    def __contains__(self, student_id: Any) -> bool:
+        return student_id in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def name(self, student_id: int) -> str:
+        """Display name (``"First Last"``) as used in gradebook rows."""
+        record = self._records[student_id]
+        return sys.intern(f"{record.first_name} {record.last_name}")
+
+    def to_json(self, student_ids: Sequence[int]) -> List[Dict[str, Any]]:
+        """Roster entries for ``student_ids``, in order."""
+        # Inlined rather than calling StudentRecord.to_json per row: rosters
+        # are serialized on every uncached read.
+        return [
+            {"id": student_id, "first_name": first_name, "last_name": last_name}
+            for student_id, first_name, last_name in map(self._records.__getitem__, student_ids)
+        ]
+
+
+class SectionRoster(NamedTuple):
+    """A section's enrolment as ids into the shared :class:`StudentTable`."""
+
+    section_id: int
+    student_ids: array
+
+
+RosterListener = Callable[[int, Dict[str, Any] | None, Dict[str, Any]], None]
+"""Called as ``listener(section_id, before, after)`` with roster payloads; ``before``
+is ``None`` for a new section."""
+
+
+class RosterFixtures(Mapping[int, Dict[str, Any]]):
+    """Read-only ``{section_id: roster}`` view serialized from compact rosters.
+
+    Each lookup builds the ``{"section_id", "students": [...]}`` payload from
+    the section's student ids and the shared table, so only ids are stored per
+    section. Change a roster with :meth:`replace`, which bumps its
+    ``roster:<section_id>`` version in ``versions`` (when given) and tells the
+    listeners registered with :meth:`subscribe`.
+    """
+
+    def __init__(
+        self,
+        students: StudentTable,
+        rosters: Mapping[int, Sequence[int]],
+        versions: DatasetVersions | None = None,
+    ) -> None:
+        self.students = students
+        self._rosters: Dict[int, SectionRoster] = {}
+        self._versions: DatasetVersions | None = None
+        self._listeners: List[RosterListener] = []
+        self._lock = threading.Lock()
+        for section_id, student_ids in rosters.items():
+            self.replace(section_id, student_ids)
+        self._versions = versions
+
+    def replace(self, section_id: int, student_ids: Sequence[int]) -> None:
+        missing = [student_id for student_id in student_ids if student_id not in self.students]
+        if missing:
+            raise KeyError(f"Unknown student ids: {missing}")
+        with self._lock:
+            before = self.get(section_id) if self._listeners else None
+            self._rosters[section_id] = SectionRoster(section_id, array("q", student_ids))
+            if self._versions is not None:
+                self._versions.bump(f"roster:{section_id}")
+            if self._listeners:
+                after = self[section_id]
+                for listener in self._listeners:
+                    listener(section_id, before, after)
+
+    def subscribe(self, listener: RosterListener) -> None:
+        """Call ``listener`` after every subsequent :meth:`replace`."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def student_ids(self, section_id: int) -> array:
+        return self._rosters[section_id].student_ids
+
+    def __getitem__(self, section_id: int) -> Dict[str, Any]:
+        roster = self._rosters[section_id]
+        return {
+            "section_id": roster.section_id,
+            "students": self.students.to_json(roster.student_ids),
+        }
+
+    def __contains__(self, section_id: Any) -> bool:
+        return section_id in self._rosters
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._rosters)
+
+    def __len__(self) -> int:
+        return len(self._rosters)
+
+
+STUDENTS = StudentTable(
+    [
+        StudentRecord(501, "Alice", "Nguyen"),
+        StudentRecord(502, "Miguel", "Lopez"),
+        StudentRecord(503, "Priya", "Singh"),
+        StudentRecord(504, "Jon", "Martinez"),
+        StudentRecord(505, "Keisha", "Wright"),
+        StudentRecord(506, "Cam", "Davis"),
+        StudentRecord(507, "Noah", "Kim"),
+    ]
+)
+"""Every mock student, shared by the rosters and gradebooks below."""
+
+SECTION_ROSTERS = RosterFixtures(
+    STUDENTS,
+    {
+        301: [501, 502, 503],
+        302: [504, 505],
+        303: [506, 507],
     },
-}
+    DATASET_VERSIONS,
+)
+
+
+def _gradebook_row(student_id: int, grades: Dict[int, float]) -> Dict[str, Any]:
+    return {"student_id": student_id, "name": STUDENTS.name(student_id), "grades": grades}
+
 
 SECTION_GRADEBOOKS = {
     301: {
         "section_id": 301,
         "grading_period": "Fall 2024",
+        "category_weights": {"Quiz": 60, "Homework": 40},
         "assignments": [
-            {"id": 1, "title": "Quiz: Linear Functions", "points_possible": 20},
-            {"id": 2, "title": "Homework Set 3", "points_possible": 15},
-        ],
-        "students": [
-            {
-                "student_id": 501,
-                "name": "Alice Nguyen",
-                "grades": {1: 18, 2: 15},
-            },
             {
-                "student_id": 502,
-                "name": "Miguel Lopez",
-                "grades": {1: 15, 2: 12},
+                "id": 1,
+                "title": "Quiz: Linear Functions",
+                "points_possible": 20,
+                "category": "Quiz",
             },
             {
-                "student_id": 503,
-                "name": "Priya Singh",
-                "grades": {1: 19, 2: 15},
+                "id": 2,
+                "title": "Homework Set 3",
+                "points_possible": 15,
+                "category": "Homework",
             },
         ],
+        "students": [
+            _gradebook_row(501, {1: 18, 2: 15}),
+            _gradebook_row(502, {1: 15, 2: 12}),
+            _gradebook_row(503, {1: 19, 2: 15}),
+        ],
     }
 }
 
 
+GRADING_POLICY = {
+    "categories": [
+        {"name": "Test", "weight": "40"},
+        {"name": "Quiz", "weight": "30", "drop_lowest": 1},
+        {"name": "Homework", "weight": "20", "drop_lowest": 1},
+        {"name": "Project", "weight": "10"},
+    ],
+    "term_weights": {},
+    "missing_as_zero": True,
+    "scale": [
+        {"min": "90", "letter": "A", "gpa": "4.0"},
+        {"min": "80", "letter": "B", "gpa": "3.0"},
+        {"min": "70", "letter": "C", "gpa": "2.0"},
+        {"min": "60", "letter": "D", "gpa": "1.0"},
+        {"min": "0", "letter": "F", "gpa": "0.0"},
+    ],
+}
+"""School-wide grading policy, in the JSON form read by ``GradingPolicy.from_dict``."""
+
+SECTION_GRADING_POLICIES: Dict[int, Dict[str, Any]] = {
+    301: {
+        **GRADING_POLICY,
+        "categories": [
+            {"name": "Quiz", "weight": "60"},
+            {"name": "Homework", "weight": "40"},
+        ],
+    },
+}
+"""Per-section overrides of :data:`GRADING_POLICY`."""
+
+AssignmentRecord = Mapping[str, Any]
+
+_T = TypeVar("_T")
+_MAX_ID = sys.maxsize
+
+ASSIGNMENT_ORDERINGS = ("id", "due_date")
+
+
+def _id_key(record: AssignmentRecord) -> int:
+    return record["id"]
+
+
+def _due_key(record: AssignmentRecord) -> Tuple[str, int]:
+    return (record.get("due_date") or "", record["id"])
+
+
+def _window(items: Sequence[_T], start: int, limit: int | None) -> Sequence[_T]:
+    return items[start:] if limit is None else items[start : start + limit]
+
+
+def _freeze(payload: Mapping[str, Any], assignment_id: int) -> AssignmentRecord:
+    """Return an immutable assignment record built from ``payload``."""
+
+    record = dict(payload)
+    record["id"] = assignment_id
+    due_date = record.get("due_date")
+    if isinstance(due_date, date):
+        record["due_date"] = due_date.isoformat()
+    return MappingProxyType(record)
+
+
+def thaw(record: AssignmentRecord) -> dict:
+    """Return a mutable copy of a stored assignment record.
+
+    Records only hold scalar values, so a shallow copy is a full copy.
+    """
+
+    return dict(record)
+
+
+class StaleAssignmentError(Exception):
+    """Raised when a conditional update loses a race with another writer."""
+
+
+class BulkOperationError(Exception):
+    """Raised when a bulk batch references a missing assignment.
+
+    ``index`` is the position of the offending operation; nothing in the
+    batch has been written when this is raised.
+    """
+
+    def __init__(self, index: int, assignment_id: int) -> None:
+        super().__init__(f"Operation {index}: assignment {assignment_id} not found")
+        self.index = index
+        self.assignment_id = assignment_id
+
+
+_HASH_INDEXED_FIELDS = ("section_id", "course_id", "category")
+
+AssignmentChange = Tuple[AssignmentRecord | None, AssignmentRecord | None]
+"""A ``(before, after)`` pair; ``before`` is ``None`` for creates, ``after`` for deletes."""
+
+
 @dataclass
 class MockAssignmentStore:
-    """A lightweight in-memory store for assignment mocks."""
+    """A lightweight, thread-safe in-memory store for assignment mocks.
+
+    Records are stored as read-only mappings and shared with callers, so reads
+    never copy. Writers replace whole records; callers that need to mutate a
+    record should work on :func:`thaw` output.
+
+    Writes are serialised by a single lock and bump ``_version`` once before
+    and once after mutating, so the counter is odd while a write is in flight.
+    Reads take no lock: they run optimistically and retry if the version was
+    odd or moved underneath them. Ids are allocated in increasing order, so
+    dict insertion order is also id order.
+
+    Secondary indexes are kept in sync by every write: hash indexes from
+    ``section_id``, ``course_id`` and ``category`` to id sets, and a sorted
+    list of ``(due_date, id)`` pairs for range queries.
+
+    Listeners registered with :meth:`subscribe` receive the
+    :data:`AssignmentChange` pairs of every committed write, in commit order.
+    They run under the write lock, so they must be quick and must not write
+    to the store.
+    """
 
-    _items: Dict[int, dict] = field(default_factory=dict)
+    _items: Dict[int, AssignmentRecord] = field(default_factory=dict)
     _next_id: int = 1
+    _version: int = 0
+    _modified: datetime = _BOOT_TIME
+    _snapshot: Tuple[int, Tuple[AssignmentRecord, ...]] | None = None
+    _hash_indexes: Dict[str, Dict[Any, Set[int]]] = field(default_factory=dict)
+    _due_index: List[Tuple[str, int]] = field(default_factory=list)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+    _listeners: List[Callable[[Sequence[AssignmentChange]], None]] = field(
+        default_factory=list, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         if not self._items:
             self.reset()
 
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped by every write."""
+        return self._version
+
+    @property
+    def dataset_version(self) -> DatasetVersion:
+        """Version stamp of the whole collection, for ETags and caching."""
+        return DatasetVersion("assignments", self._version, self._modified)
+
+    def _begin_write(self) -> None:
+        self._version += 1
+
+    def _end_write(self) -> None:
+        self._modified = datetime.now(timezone.utc)
+        self._version += 1
+
     def reset(self) -> None:
         """Reset the store to its initial fixture state."""
         fixtures = [
@@ -135,33 +477,273 @@ class MockAssignmentStore:
                 "category": "Homework",
             },
         ]
-        self._items = {item["id"]: item for item in fixtures}
-        self._next_id = max(self._items) + 1
-
-    def all(self) -> List[dict]:
-        return [deepcopy(self._items[key]) for key in sorted(self._items)]
-
-    def get(self, assignment_id: int) -> dict | None:
-        item = self._items.get(assignment_id)
-        return deepcopy(item) if item else None
-
-    def create(self, payload: dict) -> dict:
-        assignment = deepcopy(payload)
-        assignment["id"] = self._next_id
-        self._next_id += 1
-        self._items[assignment["id"]] = assignment
-        return deepcopy(assignment)
-
-    def update(self, assignment_id: int, payload: dict) -> dict | None:
-        if assignment_id not in self._items:
-            return None
-        updated = deepcopy(payload)
-        updated["id"] = assignment_id
-        self._items[assignment_id] = updated
-        return deepcopy(updated)
+        with self._lock:
+            self._begin_write()
+            previous = self._items
+            self._items = {}
+            self._hash_indexes = {name: {} for name in _HASH_INDEXED_FIELDS}
+            self._due_index = []
+            for item in fixtures:
+                self._put(_freeze(item, item["id"]))
+            self._next_id = max(self._items) + 1
+            self._end_write()
+            changes: List[AssignmentChange] = [
+                (previous.get(assignment_id), record)
+                for assignment_id, record in self._items.items()
+            ]
+            changes.extend(
+                (record, None)
+                for assignment_id, record in previous.items()
+                if assignment_id not in self._items
+            )
+            self._notify(changes)
+
+    def subscribe(self, listener: Callable[[Sequence[AssignmentChange]], None]) -> None:
+        """Call ``listener`` with the changes of every subsequent write."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _notify(self, changes: Sequence[AssignmentChange]) -> None:
+        """Publish committed ``changes``. Caller must hold the write lock."""
+        for listener in self._listeners:
+            listener(changes)
+
+    def _put(self, record: AssignmentRecord) -> None:
+        """Store ``record`` and index it. Caller must hold the write lock."""
+        previous = self._items.get(record["id"])
+        if previous is not None:
+            self._unindex(previous)
+        self._items[record["id"]] = record
+        for name in _HASH_INDEXED_FIELDS:
+            self._hash_indexes[name].setdefault(record.get(name), set()).add(
+                record["id"]
+            )
+        insort(self._due_index, (record.get("due_date") or "", record["id"]))
+
+    def _unindex(self, record: AssignmentRecord) -> None:
+        for name in _HASH_INDEXED_FIELDS:
+            index = self._hash_indexes[name]
+            key = record.get(name)
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.discard(record["id"])
+                if not bucket:
+                    del index[key]
+        entry = (record.get("due_date") or "", record["id"])
+        position = bisect_left(self._due_index, entry)
+        if position < len(self._due_index) and self._due_index[position] == entry:
+            del self._due_index[position]
+
+    def _read(self, func: Callable[[], _T]) -> _T:
+        """Run ``func`` against a consistent view of the store without locking."""
+        while True:
+            version = self._version
+            if version & 1:
+                # A write is in flight; wait for it rather than spin.
+                with self._lock:
+                    pass
+                continue
+            try:
+                result = func()
+            except (RuntimeError, KeyError):  # pragma: no cover - torn read
+                continue
+            if version == self._version:
+                return result
+
+    def all(self) -> Tuple[AssignmentRecord, ...]:
+        """Return every assignment ordered by id as a shared snapshot."""
+        cached = self._snapshot
+        version = self._version
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        records = self._read(lambda: (self._version, tuple(self._items.values())))
+        self._snapshot = records
+        return records[1]
+
+    def filter(
+        self,
+        *,
+        section_id: int | None = None,
+        course_id: int | None = None,
+        category: str | None = None,
+        due_after: date | None = None,
+        due_before: date | None = None,
+    ) -> Tuple[AssignmentRecord, ...]:
+        """Return assignments matching every given criterion, ordered by id.
+
+        Date bounds are inclusive. Lookups go through the secondary indexes,
+        so the cost scales with the smallest matching index bucket rather than
+        with the number of stored assignments.
+        """
+        criteria = {
+            "section_id": section_id,
+            "course_id": course_id,
+            "category": category,
+        }
+        criteria = {name: value for name, value in criteria.items() if value is not None}
+        if not criteria and due_after is None and due_before is None:
+            return self.all()
+        return self._read(
+            lambda: self._filter(criteria, due_after, due_before)
+        )
+
+    def _filter(
+        self,
+        criteria: Mapping[str, Any],
+        due_after: date | None,
+        due_before: date | None,
+    ) -> Tuple[AssignmentRecord, ...]:
+        candidates: List[Collection[int]] = [
+            self._hash_indexes[name].get(value, ()) for name, value in criteria.items()
+        ]
+        if due_after is not None or due_before is not None:
+            # Undated assignments sit under "" and never match a date bound.
+            low = (due_after.isoformat(),) if due_after else ("\x00",)
+            high = (due_before.isoformat(), _MAX_ID) if due_before else None
+            start = bisect_left(self._due_index, low)
+            stop = (
+                bisect_right(self._due_index, high)
+                if high is not None
+                else len(self._due_index)
+            )
+            candidates.append({entry[1] for entry in self._due_index[start:stop]})
+        candidates.sort(key=len)
+        smallest, others = candidates[0], candidates[1:]
+        matches = sorted(
+            assignment_id
+            for assignment_id in smallest
+            if all(assignment_id in other for other in others)
+        )
+        return tuple(self._items[assignment_id] for assignment_id in matches)
+
+    def page(
+        self,
+        *,
+        ordering: str = "id",
+        after: Any = None,
+        limit: int | None = None,
+        **criteria: Any,
+    ) -> Tuple[AssignmentRecord, ...]:
+        """Return up to ``limit`` assignments positioned strictly after ``after``.
+
+        ``ordering`` is either ``"id"`` (``after`` is an id) or ``"due_date"``
+        (``after`` is a ``(due_date, id)`` pair). Both orders come from
+        structures the store already maintains, so paging never re-sorts the
+        whole collection; ``criteria`` are passed through to :meth:`filter`.
+        """
+        if ordering not in ASSIGNMENT_ORDERINGS:
+            raise ValueError(f"Unsupported ordering: {ordering}")
+        if ordering == "id":
+            records = self.filter(**criteria)
+            start = 0 if after is None else bisect_right(records, after, key=_id_key)
+            return _window(records, start, limit)
+        if any(value is not None for value in criteria.values()):
+            records = tuple(sorted(self.filter(**criteria), key=_due_key))
+            start = 0 if after is None else bisect_right(records, tuple(after), key=_due_key)
+            return _window(records, start, limit)
+
+        def _due_page() -> Tuple[AssignmentRecord, ...]:
+            start = 0 if after is None else bisect_right(self._due_index, tuple(after))
+            entries = _window(self._due_index, start, limit)
+            return tuple(self._items[assignment_id] for _, assignment_id in entries)
+
+        return self._read(_due_page)
+
+    def get(self, assignment_id: int) -> AssignmentRecord | None:
+        return self._items.get(assignment_id)
+
+    def create(self, payload: Mapping[str, Any]) -> AssignmentRecord:
+        with self._lock:
+            self._begin_write()
+            assignment = _freeze(payload, self._next_id)
+            self._next_id += 1
+            self._put(assignment)
+            self._end_write()
+            self._notify([(None, assignment)])
+        return assignment
+
+    def update(
+        self,
+        assignment_id: int,
+        payload: Mapping[str, Any],
+        *,
+        expected: AssignmentRecord | None = None,
+    ) -> AssignmentRecord | None:
+        """Replace an assignment, returning ``None`` when it does not exist.
+
+        When ``expected`` is given the write only happens if it is still the
+        stored record; otherwise :class:`StaleAssignmentError` is raised so the
+        caller can re-read and retry.
+        """
+        updated = _freeze(payload, assignment_id)
+        with self._lock:
+            current = self._items.get(assignment_id)
+            if current is None:
+                return None
+            if expected is not None and current is not expected:
+                raise StaleAssignmentError(assignment_id)
+            self._begin_write()
+            self._put(updated)
+            self._end_write()
+            self._notify([(current, updated)])
+        return updated
+
+    def apply(
+        self, operations: Sequence[Mapping[str, Any]]
+    ) -> List[AssignmentRecord | None]:
+        """Apply create/update/delete operations as one atomic write.
+
+        Each operation has an ``op`` key plus ``id`` (update/delete) and
+        ``data`` (create/update). Targets are checked before anything is
+        written, and readers only ever observe the batch fully applied.
+        Returns the written record per operation, or ``None`` for deletes.
+        """
+        with self._lock:
+            removed: Set[int] = set()
+            for index, operation in enumerate(operations):
+                if operation["op"] == "create":
+                    continue
+                assignment_id = operation["id"]
+                if assignment_id not in self._items or assignment_id in removed:
+                    raise BulkOperationError(index, assignment_id)
+                if operation["op"] == "delete":
+                    removed.add(assignment_id)
+
+            results: List[AssignmentRecord | None] = []
+            changes: List[AssignmentChange] = []
+            self._begin_write()
+            for operation in operations:
+                if operation["op"] == "create":
+                    record = _freeze(operation["data"], self._next_id)
+                    self._next_id += 1
+                    changes.append((None, record))
+                    self._put(record)
+                    results.append(record)
+                elif operation["op"] == "update":
+                    record = _freeze(operation["data"], operation["id"])
+                    changes.append((self._items[operation["id"]], record))
+                    self._put(record)
+                    results.append(record)
+                else:
+                    removed_record = self._items.pop(operation["id"])
+                    changes.append((removed_record, None))
+                    self._unindex(removed_record)
+                    results.append(None)
+            self._end_write()
+            self._notify(changes)
+        return results
 
     def delete(self, assignment_id: int) -> bool:
-        return self._items.pop(assignment_id, None) is not None
+        with self._lock:
+            current = self._items.get(assignment_id)
+            if current is None:
+                return False
+            self._begin_write()
+            self._unindex(current)
+            del self._items[assignment_id]
+            self._end_write()
+            self._notify([(current, None)])
+        return True
 
 
 ASSIGNMENT_STORE = MockAssignmentStore()
@@ -0,0 +1,110 @@
+"""Keyset pagination for the mock-backed assignment endpoints."""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any, Mapping, Sequence
+
+from django.conf import settings
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .mock_data import MockAssignmentStore
+
+
+def encode_cursor(ordering: str, key: Any) -> str:
+    """Encode a keyset position as an opaque, URL-safe token."""
+
+    raw = json.dumps({"o": ordering, "k": key}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[str, Any]:
+    """Decode a cursor produced by :func:`encode_cursor`."""
+
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        ordering, key = payload["o"], payload["k"]
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError):
+        raise NotFound("Invalid cursor")
+    if ordering == "id" and isinstance(key, int):
+        return ordering, key
+    if (
+        ordering == "due_date"
+        and isinstance(key, list)
+        and len(key) == 2
+        and isinstance(key[0], str)
+        and isinstance(key[1], int)
+    ):
+        return ordering, tuple(key)
+    raise NotFound("Invalid cursor")
+
+
+class AssignmentKeysetPagination(BasePagination):
+    """Cursor pagination over ``id`` or ``(due_date, id)``.
+
+    Pages are cut from the store's ordered snapshot and due-date index, so a
+    cursor keeps pointing at the same position when assignments are inserted
+    concurrently. Pagination is opt-in: it only applies when the request
+    carries a ``cursor`` or ``page_size`` parameter.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+
+    def __init__(self) -> None:
+        self.page_size = getattr(settings, "ASSIGNMENTS_PAGE_SIZE", 50)
+        self.max_page_size = getattr(settings, "ASSIGNMENTS_MAX_PAGE_SIZE", 500)
+        self.next_link: str | None = None
+
+    def is_requested(self, request) -> bool:
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request) -> int:
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw is None:
+            return self.page_size
+        try:
+            size = int(raw)
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_store(
+        self,
+        store: MockAssignmentStore,
+        request,
+        ordering: str,
+        criteria: Mapping[str, Any],
+    ) -> Sequence[Mapping[str, Any]]:
+        after = None
+        token = request.query_params.get(self.cursor_query_param)
+        if token:
+            cursor_ordering, after = decode_cursor(token)
+            if cursor_ordering != ordering:
+                raise NotFound("Invalid cursor")
+        page_size = self.get_page_size(request)
+
+        records = store.page(
+            ordering=ordering, after=after, limit=page_size + 1, **criteria
+        )
+        page = records[:page_size]
+        self.next_link = None
+        if len(records) > page_size:
+            last = page[-1]
+            # Undated assignments sort first, under "" as in the store's due-date index.
+            key = last["id"] if ordering == "id" else [last["due_date"] or "", last["id"]]
+            self.next_link = replace_query_param(
+                request.build_absolute_uri(),
+                self.cursor_query_param,
+                encode_cursor(ordering, key),
+            )
+        return page
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({"next": self.next_link, "results": data})
@@ -0,0 +1,58 @@
+"""Additional DRF renderers for the SchoolOS API."""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils import encoders
+
+
+def ndjson_line(data: Any) -> bytes:
+    """Encode ``data`` as one compact JSON line, the way ``JSONRenderer`` would."""
+    return (
+        json.dumps(
+            data,
+            cls=encoders.JSONEncoder,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        )
+        + "\n"
+    ).encode("utf-8")
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Newline-delimited JSON, selected by ``?format=ndjson`` or ``Accept``.
+
+    Views that support it normally stream their own lines; this renderer
+    covers plain ``Response`` objects (errors, for example), writing a list as
+    one line per item and anything else as a single line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b""
+        if isinstance(data, list):
+            return b"".join(ndjson_line(item) for item in data)
+        return ndjson_line(data)
+
+
+class FirstRendererNegotiation(BaseContentNegotiation):
+    """Always pick the view's first renderer and parser.
+
+    For views that read ``?format=`` themselves and stream their own bodies:
+    DRF would otherwise treat the parameter as a renderer choice and answer
+    404 for formats no renderer provides. Error responses stay JSON.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
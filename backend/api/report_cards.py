@@ -0,0 +1,312 @@
+"""Report card generation fanned out across a process pool.
+
+:func:`report_cards` turns a section's gradebook and policy-evaluated grades
+into one plain-dict card per student in the web process. The CPU-heavy part,
+rendering each card to a PDF, runs in a :class:`ProcessPoolExecutor`.
+Workers keep the compiled template and WeasyPrint's font configuration in
+module state, so both are loaded once per worker rather than once per card.
+Cards are written to ``<storage>/<job id>/<student id>.<format>``.
+
+:class:`ReportCardJobs` tracks each request as a :class:`ReportJob` whose
+counters are updated as per-student renders finish, for the job-status
+endpoint to report. PDFs need WeasyPrint; without it PDF jobs raise
+``RuntimeError`` at submission, while ``html`` output (the same document,
+unconverted) always works.
+"""
+from __future__ import annotations
+
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Sequence
+
+from django.conf import settings
+
+from .grading import EvaluationPlan
+
+REPORT_FORMATS = ("pdf", "html")
+
+TEMPLATE_NAME = "api/report_card.html"
+
+MAX_JOBS = 200
+"""Finished jobs beyond this many are forgotten, oldest first (artifacts stay on disk)."""
+
+# Per-process render state, filled lazily so a worker compiles the template
+# and loads fonts on its first card and reuses them for every later one.
+_WORKER: Dict[str, Any] = {}
+
+
+def _weasyprint():
+    try:
+        import weasyprint
+        from weasyprint.text.fonts import FontConfiguration
+    except ImportError as exc:  # pragma: no cover - executed only without deps
+        raise RuntimeError("WeasyPrint is required for PDF report cards") from exc
+    return weasyprint, FontConfiguration
+
+
+def _template():
+    if "template" not in _WORKER:
+        import django
+
+        django.setup()  # no-op in forked workers; needed under spawn
+        from django.template.loader import get_template
+
+        _WORKER["template"] = get_template(TEMPLATE_NAME)
+    return _WORKER["template"]
+
+
+def _fonts():
+    if "fonts" not in _WORKER:
+        _weasyprint_module, FontConfiguration = _weasyprint()
+        _WORKER["fonts"] = FontConfiguration()
+    return _WORKER["fonts"]
+
+
+def _warm_worker() -> None:
+    """Process pool initializer: compile the template before the first card arrives."""
+    _template()
+
+
+def render_report_card(card: Mapping[str, Any], fmt: str, path: str) -> str:
+    """Render ``card`` to ``path`` as ``fmt`` and return the path (runs in a worker)."""
+    html = _template().render(dict(card))
+    if fmt == "pdf":
+        weasyprint, _font_configuration = _weasyprint()
+        document = weasyprint.HTML(string=html)
+        document.write_pdf(path, font_config=_fonts())
+    else:
+        Path(path).write_text(html, encoding="utf-8")
+    return path
+
+
+def _percent(value: Any) -> str | None:
+    return None if value is None else f"{value}%"
+
+
+def _number(value: Any) -> str:
+    if value is None:
+        return "–"
+    return str(int(value)) if float(value).is_integer() else f"{value:g}"
+
+
+def report_cards(
+    gradebook: Mapping[str, Any],
+    plan: EvaluationPlan,
+    course: Mapping[str, Any] | None = None,
+    issued_on: date | None = None,
+) -> List[Dict[str, Any]]:
+    """One render-ready card per student of a ``SECTION_GRADEBOOKS``-shaped ``gradebook``.
+
+    Grades come from ``plan``; ``course`` is the ``COURSES`` entry holding the
+    section, when known. Every value is preformatted text, so workers only
+    render.
+    """
+    course = course or {}
+    section_id = gradebook.get("section_id")
+    section_name = next(
+        (
+            section.get("name")
+            for section in course.get("sections", ())
+            if section.get("id") == section_id
+        ),
+        None,
+    )
+    shared = {
+        "section_id": section_id,
+        "section_name": section_name,
+        "course_name": course.get("name", f"Section {section_id}"),
+        "course_code": course.get("code"),
+        "grading_period": gradebook.get("grading_period") or "",
+        "issued_on": (issued_on or date.today()).isoformat(),
+    }
+    assignments = gradebook["assignments"]
+    grades = {result["student_id"]: result for result in plan.evaluate(gradebook)}
+    cards = []
+    for student in gradebook["students"]:
+        result = grades[student["student_id"]]
+        scores = student.get("grades") or {}
+        exempt = set(student.get("exempt", ()))
+        cards.append(
+            {
+                **shared,
+                "student_id": student["student_id"],
+                "student_name": student.get("name") or str(student["student_id"]),
+                "percentage": _percent(result["percentage"]),
+                "letter": result["letter"],
+                "gpa": None if result["gpa"] is None else str(result["gpa"]),
+                "terms": [
+                    {
+                        "name": term,
+                        "percentage": _percent(term_result["percentage"]),
+                        "categories": [
+                            {"name": name, "percentage": _percent(percentage)}
+                            for name, percentage in term_result["categories"].items()
+                        ],
+                    }
+                    for term, term_result in result["terms"].items()
+                ],
+                "assignments": [
+                    {
+                        "title": assignment["title"],
+                        "category": assignment.get("category"),
+                        "score": (
+                            "Exempt"
+                            if assignment["id"] in exempt
+                            else _number(
+                                scores.get(assignment["id"], scores.get(str(assignment["id"])))
+                            )
+                        ),
+                        "points_possible": _number(assignment["points_possible"]),
+                    }
+                    for assignment in assignments
+                ],
+            }
+        )
+    return cards
+
+
+@dataclass
+class ReportJob:
+    """Progress of one report card run; mutated only under the owning manager's lock."""
+
+    id: str
+    section_id: int
+    format: str
+    total: int
+    directory: Path
+    status: str = "running"
+    completed: int = 0
+    failed: int = 0
+    artifacts: List[str] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: datetime | None = None
+    finished: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.completed + self.failed == self.total
+
+    def payload(self) -> Dict[str, Any]:
+        processed = self.completed + self.failed
+        return {
+            "id": self.id,
+            "section_id": self.section_id,
+            "format": self.format,
+            "status": self.status,
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "progress": round(processed / self.total, 4) if self.total else 1.0,
+            "artifacts": sorted(self.artifacts),
+            "errors": list(self.errors),
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ReportCardJobs:
+    """Submit report card jobs to a shared process pool and track their progress.
+
+    The pool is created on first use with ``max_workers`` processes (default:
+    one per core). ``executor_factory`` builds it, for callers that need a
+    different executor. Jobs end ``"completed"`` when every card rendered,
+    otherwise ``"failed"`` with the per-student errors listed.
+    """
+
+    def __init__(
+        self,
+        storage_dir: Path | str,
+        max_workers: int | None = None,
+        executor_factory: Callable[..., Executor] = ProcessPoolExecutor,
+    ) -> None:
+        self.storage_dir = Path(storage_dir)
+        self._max_workers = max_workers
+        self._executor_factory = executor_factory
+        self._executor: Executor | None = None
+        self._jobs: "OrderedDict[str, ReportJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _pool(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._executor_factory(
+                    max_workers=self._max_workers, initializer=_warm_worker
+                )
+            return self._executor
+
+    def submit(self, section_id: int, cards: Sequence[Mapping[str, Any]], fmt: str) -> ReportJob:
+        """Start rendering ``cards``; raises ``RuntimeError`` if ``fmt`` cannot be produced."""
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"Unknown report format: {fmt}")
+        if fmt == "pdf":
+            _weasyprint()
+        job_id = uuid.uuid4().hex
+        directory = self.storage_dir / job_id
+        directory.mkdir(parents=True, exist_ok=True)
+        job = ReportJob(job_id, section_id, fmt, len(cards), directory)
+        with self._lock:
+            self._jobs[job_id] = job
+            self._forget_finished()
+            if not cards:
+                self._finish(job)
+                return job
+        pool = self._pool()
+        for card in cards:
+            student_id = card["student_id"]
+            path = directory / f"{student_id}.{fmt}"
+            future = pool.submit(render_report_card, dict(card), fmt, str(path))
+            future.add_done_callback(partial(self._rendered, job, student_id))
+        return job
+
+    def _rendered(self, job: ReportJob, student_id: int, future: Future) -> None:
+        error = future.exception()
+        with self._lock:
+            if error is None:
+                job.completed += 1
+                job.artifacts.append(Path(future.result()).name)
+            else:
+                job.failed += 1
+                job.errors.append({"student_id": student_id, "error": repr(error)})
+            if job.done:
+                self._finish(job)
+
+    def _finish(self, job: ReportJob) -> None:
+        job.status = "failed" if job.failed else "completed"
+        job.finished_at = datetime.now(timezone.utc)
+        job.finished.set()
+
+    def _forget_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished_at]
+        for job_id in finished[: max(len(self._jobs) - MAX_JOBS, 0)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Dict[str, Any] | None:
+        """A snapshot of the job's progress, or ``None`` if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.payload() if job is not None else None
+
+    def wait(self, job_id: str, timeout: float | None = None) -> Dict[str, Any] | None:
+        """Block until the job's cards are rendered (or ``timeout``), then snapshot it."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            job.finished.wait(timeout)
+        return self.get(job_id)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+REPORT_CARD_JOBS = ReportCardJobs(settings.REPORT_CARD_DIR, settings.REPORT_CARD_WORKERS or None)
+"""Report card jobs for the API, rendered under ``settings.REPORT_CARD_DIR``."""
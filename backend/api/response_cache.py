@@ -0,0 +1,85 @@
+"""Cache of pre-rendered JSON bodies for read-mostly mock payloads."""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+from .mock_data import DatasetVersion
+
+
+@dataclass(frozen=True)
+class RenderedPayload:
+    """A rendered JSON body plus the headers needed to serve it."""
+
+    body: bytes
+    etag: str
+    version: int
+
+    def to_response(self) -> HttpResponse:
+        return HttpResponse(
+            self.body,
+            content_type=JSONRenderer.media_type,
+            headers={
+                "ETag": self.etag,
+                "Content-Length": str(len(self.body)),
+            },
+        )
+
+
+class RenderedResponseCache:
+    """Keep one rendered body per dataset, reused until its version changes.
+
+    Entries are keyed by :attr:`DatasetVersion.key` and tagged with the ETag
+    they were rendered for, so bumping a dataset's version invalidates its
+    entry on the next read. A view whose stamp key varies over time (the
+    dashboard's includes the date) passes a fixed ``slot`` instead, so each
+    new representation replaces the last rather than piling up.
+    :meth:`invalidate` drops entries explicitly, e.g. when a fixture is
+    replaced wholesale.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, RenderedPayload] = {}
+        self._lock = threading.Lock()
+        self._renderer = JSONRenderer()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self, stamp: DatasetVersion, build: Callable[[], Any], slot: str | None = None
+    ) -> RenderedPayload:
+        key = slot or stamp.key
+        entry = self._entries.get(key)
+        if entry is not None and entry.etag == stamp.etag:
+            return entry
+        entry = RenderedPayload(
+            body=self._renderer.render(build()),
+            etag=stamp.etag,
+            version=stamp.version,
+        )
+        with self._lock:
+            current = self._entries.get(key)
+            if current is None or current.version <= stamp.version:
+                self._entries[key] = entry
+        return entry
+
+    def respond(
+        self, stamp: DatasetVersion, build: Callable[[], Any], slot: str | None = None
+    ) -> HttpResponse:
+        """Return an ``HttpResponse`` carrying the cached body for ``stamp``."""
+        return self.get(stamp, build, slot).to_response()
+
+    def invalidate(self, key: str | None = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+RENDERED_RESPONSES = RenderedResponseCache()
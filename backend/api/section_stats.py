@@ -0,0 +1,160 @@
+"""Incrementally maintained score statistics for a section gradebook.
+
+:class:`SectionStats` keeps one :class:`RunningStats` per assignment and one
+per student. Each holds a Welford running mean and variance, a sorted list of
+values for the median and quartiles, and a fixed-bin histogram, so a changed
+grade updates two summaries without rescanning the gradebook and reading a
+summary is constant time.
+
+Statistics are over *percentages* of points possible, which keeps a
+student's scores across assignments of different sizes comparable. Missing
+and exempt grades are left out, as they are from gradebook totals, and so are
+assignments worth zero points.
+"""
+from __future__ import annotations
+
+import bisect
+import math
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+HISTOGRAM_EDGES: Sequence[int] = tuple(range(0, 101, 10))
+"""Percentage bin edges; the last bin includes 100 and extra-credit scores above it."""
+
+_BINS = len(HISTOGRAM_EDGES) - 1
+_WIDTH = HISTOGRAM_EDGES[1] - HISTOGRAM_EDGES[0]
+
+
+def _percentage(score: float, points: float) -> float:
+    # The one place percentages are computed, so a value removed later is
+    # bit-for-bit the value that was added.
+    return score * 100.0 / points
+
+
+def _bin(value: float) -> int:
+    return min(max(int(value // _WIDTH), 0), _BINS - 1)
+
+
+def _rounded(value: float | None) -> float | None:
+    return None if value is None else round(value, 2)
+
+
+class RunningStats:
+    """Count, mean, variance, order statistics and histogram of a changing multiset."""
+
+    __slots__ = ("count", "mean", "_m2", "_values", "histogram")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._values: List[float] = []
+        self.histogram = [0] * _BINS
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        bisect.insort(self._values, value)
+        self.histogram[_bin(value)] += 1
+
+    def remove(self, value: float) -> None:
+        """Remove one occurrence of ``value``; raises ``ValueError`` if absent."""
+        index = bisect.bisect_left(self._values, value)
+        if index == len(self._values) or self._values[index] != value:
+            raise ValueError(value)
+        del self._values[index]
+        self.histogram[_bin(value)] -= 1
+        self.count -= 1
+        if not self.count:
+            self.mean = self._m2 = 0.0
+            return
+        # Welford's update run backwards.
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self._m2 = max(self._m2 - delta * (value - self.mean), 0.0)
+
+    @property
+    def stdev(self) -> float | None:
+        """Population standard deviation, or ``None`` when empty."""
+        return math.sqrt(self._m2 / self.count) if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """The ``q`` quantile with linear interpolation (NumPy's default method)."""
+        if not self.count:
+            return None
+        position = (self.count - 1) * q
+        lower = int(position)
+        upper = min(lower + 1, self.count - 1)
+        fraction = position - lower
+        return self._values[lower] + (self._values[upper] - self._values[lower]) * fraction
+
+    def summary(self) -> Dict[str, Any]:
+        empty = not self.count
+        return {
+            "count": self.count,
+            "mean": None if empty else round(self.mean, 2),
+            "stdev": _rounded(self.stdev),
+            "min": None if empty else round(self._values[0], 2),
+            "q1": _rounded(self.quantile(0.25)),
+            "median": _rounded(self.quantile(0.5)),
+            "q3": _rounded(self.quantile(0.75)),
+            "max": None if empty else round(self._values[-1], 2),
+            "histogram": list(self.histogram),
+        }
+
+
+class SectionStats:
+    """Per-assignment and per-student :class:`RunningStats` for one gradebook.
+
+    Built from a ``(students, assignments)`` score matrix, the mask of cells
+    that count and each assignment's points; afterwards the owner reports each
+    change through :meth:`add` and :meth:`remove` with the cell's score and
+    its assignment's points.
+    """
+
+    def __init__(
+        self, scores: np.ndarray, counted: np.ndarray, points_possible: np.ndarray
+    ) -> None:
+        students, assignments = scores.shape
+        self.assignments = [RunningStats() for _ in range(assignments)]
+        self.students = [RunningStats() for _ in range(students)]
+        rows, columns = np.nonzero(counted)
+        cells = zip(
+            rows.tolist(),
+            columns.tolist(),
+            scores[rows, columns].tolist(),
+            points_possible[columns].tolist(),
+        )
+        for row, column, score, points in cells:
+            self.add(row, column, score, points)
+
+    def add(self, row: int, column: int, score: float, points: float) -> None:
+        if points > 0:
+            value = _percentage(score, points)
+            self.assignments[column].add(value)
+            self.students[row].add(value)
+
+    def remove(self, row: int, column: int, score: float, points: float) -> None:
+        if points > 0:
+            value = _percentage(score, points)
+            self.assignments[column].remove(value)
+            self.students[row].remove(value)
+
+    def payload(
+        self, student_ids: Sequence[int], assignment_ids: Sequence[int]
+    ) -> Dict[str, Any]:
+        """Summaries keyed by id, plus the shared histogram bin edges."""
+        return {
+            "histogram_edges": list(HISTOGRAM_EDGES),
+            "assignments": [
+                {"assignment_id": assignment_id, **stats.summary()}
+                for assignment_id, stats in zip(assignment_ids, self.assignments)
+            ],
+            "students": [
+                {"student_id": student_id, **stats.summary()}
+                for student_id, stats in zip(student_ids, self.students)
+            ],
+        }
@@ -3,6 +3,10 @@ from __future__ import annotations
 
 from rest_framework import serializers
 
+from .gradebook_export import EXPORT_FORMATS
+from .mock_data import ASSIGNMENT_ORDERINGS
+from .report_cards import REPORT_FORMATS
+
 
 class AssignmentSerializer(serializers.Serializer):
     """Serializer defining the assignment contract."""
@@ -12,6 +16,91 @@ class AssignmentSerializer(serializers.Serializer):
     section_id = serializers.IntegerField()
     title = serializers.CharField(max_length=255)
     description = serializers.CharField(allow_blank=True)
-    due_date = serializers.DateField()
+    due_date = serializers.DateField(allow_null=True)
     points_possible = serializers.IntegerField(min_value=0)
     category = serializers.CharField(max_length=128)
+
+
+class AssignmentFilterSerializer(serializers.Serializer):
+    """Query parameters accepted by the assignment list endpoint."""
+
+    section_id = serializers.IntegerField(required=False)
+    course_id = serializers.IntegerField(required=False)
+    category = serializers.CharField(required=False, max_length=128)
+    due_after = serializers.DateField(required=False)
+    due_before = serializers.DateField(required=False)
+    ordering = serializers.ChoiceField(choices=ASSIGNMENT_ORDERINGS, default="id")
+
+
+class DashboardQuerySerializer(serializers.Serializer):
+    """Query parameters accepted by the dashboard endpoint."""
+
+    teacher_id = serializers.IntegerField(required=False)
+
+
+class StudentSearchQuerySerializer(serializers.Serializer):
+    """Query parameters accepted by the student search endpoint."""
+
+    q = serializers.CharField(max_length=128)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=20)
+    teacher_id = serializers.IntegerField(required=False)
+
+
+class GradebookExportQuerySerializer(serializers.Serializer):
+    """Query parameters accepted by the gradebook export endpoints."""
+
+    format = serializers.ChoiceField(choices=EXPORT_FORMATS, default="csv")
+
+
+class ReportCardRequestSerializer(serializers.Serializer):
+    """Body accepted when starting a section's report card job."""
+
+    format = serializers.ChoiceField(choices=REPORT_FORMATS, default="html")
+
+
+class AssignmentBulkOperationSerializer(serializers.Serializer):
+    """A single create, update or delete entry in a bulk request."""
+
+    op = serializers.ChoiceField(choices=("create", "update", "delete"))
+    id = serializers.IntegerField(required=False)
+    data = AssignmentSerializer(required=False)
+
+    def validate(self, attrs):
+        op = attrs["op"]
+        if op != "create" and "id" not in attrs:
+            raise serializers.ValidationError(
+                {"id": "This field is required for update and delete."}
+            )
+        if op != "delete" and "data" not in attrs:
+            raise serializers.ValidationError(
+                {"data": "This field is required for create and update."}
+            )
+        return attrs
+
+
+class GradeEntrySerializer(serializers.Serializer):
+    """A single gradebook cell; a ``null`` score clears the grade."""
+
+    student_id = serializers.IntegerField()
+    assignment_id = serializers.IntegerField()
+    score = serializers.FloatField(min_value=0, allow_null=True)
+    exempt = serializers.BooleanField(default=False)
+
+
+class TermGradeSerializer(serializers.Serializer):
+    """One term's category and overall percentages for a student."""
+
+    percentage = serializers.DecimalField(max_digits=7, decimal_places=2, allow_null=True)
+    categories = serializers.DictField(
+        child=serializers.DecimalField(max_digits=7, decimal_places=2)
+    )
+
+
+class StudentGradeSerializer(serializers.Serializer):
+    """A student's policy-evaluated term and course grades."""
+
+    student_id = serializers.IntegerField()
+    terms = serializers.DictField(child=TermGradeSerializer())
+    percentage = serializers.DecimalField(max_digits=7, decimal_places=2, allow_null=True)
+    letter = serializers.CharField(allow_null=True)
+    gpa = serializers.DecimalField(max_digits=4, decimal_places=2, allow_null=True)
@@ -0,0 +1,182 @@
+"""Prefix search over the students in section rosters.
+
+:class:`StudentSearchIndex` keeps a sorted array of ``(term, student_id)``
+pairs, one per word of each student's first and last name, folded with
+:func:`fold` so matching ignores case and accents, plus one such array per
+section. A query is answered by bisecting to its first word's prefix and
+walking forward only until enough matches are found; a query limited to
+some sections merges just those sections' arrays. Either way the cost grows
+with the result cap rather than the number of students. Roster changes are
+applied per section with :meth:`StudentSearchIndex.update_roster`.
+"""
+from __future__ import annotations
+
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Any, Collection, Dict, Iterator, List, Mapping, Sequence, Set, Tuple
+
+from . import mock_data
+
+_WORD_SEPARATORS = re.compile(r"[\s\-'’.]+")
+
+
+def fold(text: str) -> str:
+    """Return ``text`` lower-cased with accents removed ("Núñez" -> "nunez")."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def _words(text: str) -> List[str]:
+    return [word for word in _WORD_SEPARATORS.split(fold(text)) if word]
+
+
+def _prefixed(entries: List[Tuple[str, int]], prefix: str) -> Iterator[Tuple[str, int]]:
+    """Yield the ``entries`` whose term starts with ``prefix``, in order."""
+    index = bisect_left(entries, (prefix,))
+    while index < len(entries) and entries[index][0].startswith(prefix):
+        yield entries[index]
+        index += 1
+
+
+class StudentSearchIndex:
+    """Case- and accent-insensitive name-prefix index over ``SECTION_ROSTERS``-shaped data."""
+
+    def __init__(self, rosters: Mapping[int, Mapping[str, Any]]) -> None:
+        self._entries: List[Tuple[str, int]] = []
+        self._section_entries: Dict[int, List[Tuple[str, int]]] = {}
+        self._students: Dict[int, Dict[str, Any]] = {}
+        self._words: Dict[int, Tuple[str, ...]] = {}
+        self._sections: Dict[int, Set[int]] = {}
+        self._rosters: Dict[int, Dict[int, Mapping[str, Any]]] = {}
+        self._lock = threading.Lock()
+        for section_id, roster in rosters.items():
+            self.update_roster(section_id, roster)
+
+    def _index(self, student: Mapping[str, Any]) -> None:
+        student_id = student["id"]
+        words = tuple(
+            dict.fromkeys(_words(student["first_name"]) + _words(student["last_name"]))
+        )
+        self._students[student_id] = {
+            "id": student_id,
+            "first_name": student["first_name"],
+            "last_name": student["last_name"],
+        }
+        self._words[student_id] = words
+        self._add_terms(self._entries, student_id)
+
+    def _unindex(self, student_id: int) -> None:
+        self._remove_terms(self._entries, student_id)
+        del self._words[student_id]
+        del self._students[student_id]
+
+    def _add_terms(self, entries: List[Tuple[str, int]], student_id: int) -> None:
+        for word in self._words[student_id]:
+            insort(entries, (word, student_id))
+
+    def _remove_terms(self, entries: List[Tuple[str, int]], student_id: int) -> None:
+        for word in self._words[student_id]:
+            del entries[bisect_left(entries, (word, student_id))]
+
+    def update_roster(self, section_id: int, roster: Mapping[str, Any] | None) -> None:
+        """Replace the indexed roster of ``section_id`` (``None`` removes it).
+
+        Only students who joined, left or were renamed are re-indexed.
+        """
+        students = {student["id"]: student for student in (roster or {}).get("students", ())}
+        with self._lock:
+            previous = self._rosters.pop(section_id, {})
+            section_entries = self._section_entries.setdefault(section_id, [])
+            for student_id in previous.keys() - students.keys():
+                self._remove_terms(section_entries, student_id)
+                sections = self._sections[student_id]
+                sections.discard(section_id)
+                if not sections:
+                    del self._sections[student_id]
+                    self._unindex(student_id)
+            for student_id, student in students.items():
+                sections = self._sections.setdefault(student_id, set())
+                current = self._students.get(student_id)
+                if current is None:
+                    self._index(student)
+                elif (current["first_name"], current["last_name"]) != (
+                    student["first_name"],
+                    student["last_name"],
+                ):
+                    for other in sections:
+                        self._remove_terms(self._section_entries[other], student_id)
+                    self._unindex(student_id)
+                    self._index(student)
+                    for other in sections:
+                        self._add_terms(self._section_entries[other], student_id)
+                if section_id not in sections:
+                    sections.add(section_id)
+                    self._add_terms(section_entries, student_id)
+            if students:
+                self._rosters[section_id] = students
+            else:
+                del self._section_entries[section_id]
+
+    def roster_changed(
+        self,
+        section_id: int,
+        _before: Mapping[str, Any] | None,
+        after: Mapping[str, Any],
+    ) -> None:
+        """:class:`~api.mock_data.RosterFixtures` listener; see :meth:`update_roster`."""
+        self.update_roster(section_id, after)
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        section_ids: Collection[int] | None = None,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Students whose name words start with every word of ``query``.
+
+        Results are ordered by the name word matching the query's first word,
+        restricted to (and listing only) ``section_ids`` when given, and
+        capped at ``limit``. Returns the results and whether more matches
+        were left out.
+        """
+        words = _words(query)
+        if not words:
+            return [], False
+        first, rest = words[0], words[1:]
+        results: List[Dict[str, Any]] = []
+        seen: Set[int] = set()
+        with self._lock:
+            if section_ids is None:
+                candidates = _prefixed(self._entries, first)
+            else:
+                # A student in several of the sections shows up once per section.
+                candidates = heapq.merge(
+                    *(
+                        _prefixed(self._section_entries[section_id], first)
+                        for section_id in set(section_ids)
+                        if section_id in self._section_entries
+                    )
+                )
+            for _word, student_id in candidates:
+                if student_id in seen or not self._matches(student_id, rest):
+                    continue
+                if len(results) == limit:
+                    return results, True
+                seen.add(student_id)
+                sections = self._sections[student_id]
+                if section_ids is not None:
+                    sections = sections.intersection(section_ids)
+                results.append({**self._students[student_id], "section_ids": sorted(sections)})
+        return results, False
+
+    def _matches(self, student_id: int, words: Sequence[str]) -> bool:
+        names = self._words[student_id]
+        return all(any(name.startswith(word) for name in names) for word in words)
+
+
+STUDENT_INDEX = StudentSearchIndex(mock_data.SECTION_ROSTERS)
+"""Index over the mock rosters, kept in sync with ``SECTION_ROSTERS.replace``."""
+mock_data.SECTION_ROSTERS.subscribe(STUDENT_INDEX.roster_changed)
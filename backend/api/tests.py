@@ -1,11 +1,40 @@
 """API contract tests for mock-enabled endpoints."""
 from __future__ import annotations
 
-from django.test import TestCase, override_settings
+import csv
+import importlib.util
+import io
+import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import ROUND_DOWN, Decimal, localcontext
+from unittest import mock, skipIf, skipUnless
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
-from rest_framework.test import APIClient
+from django.utils.http import http_date
+from rest_framework.test import APIClient, APIRequestFactory
 
 from . import mock_data
+from .dashboard import DashboardAggregates
+from .fast_validation import compile_serializer
+from .gradebook import (
+    EXPORT_COLUMNS,
+    GRADEBOOKS,
+    GradebookMatrix,
+    LiveGradebook,
+    gradebook_payload,
+)
+from .grading import GradingPolicy, compile_policy, evaluate_sections
+from .report_cards import ReportCardJobs, report_cards
+from .response_cache import RENDERED_RESPONSES, RenderedResponseCache
+from .section_stats import RunningStats
+from .student_search import StudentSearchIndex
+from .serializers import AssignmentSerializer
+from .views import AssignmentsViewSet, CoursesView
 
 
 @override_settings(ENABLE_MOCK_DATA=True)
@@ -27,7 +56,7 @@ class APIMockContractTests(TestCase):
         response = self.client.get(reverse("api:dashboard-stats"))
         self.assertEqual(response.status_code, 200)
         payload = response.json()
-        for key in ("sections", "students", "assignments_due"):
+        for key in ("sections", "students", "assignments_due", "assignments_to_grade"):
             self.assertIn(key, payload)
 
     def test_courses_returns_course_catalog(self):
@@ -92,3 +121,1581 @@ class APIMockContractTests(TestCase):
 
         final = self.client.get(list_url)
         self.assertEqual(len(final.json()), starting_count)
+
+    def test_assignments_list_filters_by_query_params(self):
+        list_url = reverse("api:assignment-list")
+        mock_data.ASSIGNMENT_STORE.create(
+            {
+                "course_id": 102,
+                "section_id": 303,
+                "title": "Lab Report",
+                "description": "",
+                "due_date": "2024-10-02",
+                "points_possible": 30,
+                "category": "Lab",
+            }
+        )
+
+        by_section = self.client.get(list_url, {"section_id": 301})
+        self.assertEqual([item["id"] for item in by_section.json()], [1, 2])
+
+        by_course = self.client.get(list_url, {"course_id": 102})
+        self.assertEqual([item["title"] for item in by_course.json()], ["Lab Report"])
+
+        combined = self.client.get(
+            list_url,
+            {"section_id": 301, "category": "Homework", "due_after": "2024-09-21"},
+        )
+        self.assertEqual([item["id"] for item in combined.json()], [2])
+
+        window = self.client.get(
+            list_url, {"due_after": "2024-09-20", "due_before": "2024-09-25"}
+        )
+        self.assertEqual([item["id"] for item in window.json()], [1, 2])
+
+        invalid = self.client.get(list_url, {"due_before": "not-a-date"})
+        self.assertEqual(invalid.status_code, 400)
+
+    def _walk_pages(self, params):
+        url = reverse("api:assignment-list")
+        seen = []
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            seen.extend(item["id"] for item in body["results"])
+            url, params = body["next"], None
+        return seen
+
+    def test_assignments_list_keyset_pagination(self):
+        for due_date in ("2024-09-22", "2024-09-18"):
+            mock_data.ASSIGNMENT_STORE.create(
+                {
+                    "course_id": 101,
+                    "section_id": 301,
+                    "title": f"Warm-up {due_date}",
+                    "description": "",
+                    "due_date": due_date,
+                    "points_possible": 5,
+                    "category": "Quiz",
+                }
+            )
+
+        self.assertEqual(self._walk_pages({"page_size": 1}), [1, 2, 3, 4])
+        self.assertEqual(
+            self._walk_pages({"page_size": 3, "ordering": "due_date"}), [4, 1, 3, 2]
+        )
+
+        first = self.client.get(
+            reverse("api:assignment-list"), {"page_size": 2}
+        ).json()
+        mock_data.ASSIGNMENT_STORE.delete(1)
+        second = self.client.get(first["next"]).json()
+        self.assertEqual([item["id"] for item in second["results"]], [3, 4])
+        self.assertIsNone(second["next"])
+
+        invalid = self.client.get(reverse("api:assignment-list"), {"cursor": "bogus"})
+        self.assertEqual(invalid.status_code, 404)
+
+    def test_undated_assignments_sort_first_and_paginate_by_due_date(self):
+        created = self.client.post(
+            reverse("api:assignment-list"),
+            {
+                "course_id": 101,
+                "section_id": 301,
+                "title": "Reading log",
+                "description": "",
+                "due_date": None,
+                "points_possible": 5,
+                "category": "Homework",
+            },
+            format="json",
+        )
+        self.assertEqual(created.status_code, 201)
+        self.assertIsNone(created.json()["due_date"])
+        undated = created.json()["id"]
+        self.assertEqual(
+            self._walk_pages({"page_size": 1, "ordering": "due_date"}), [undated, 1, 2]
+        )
+        missing = self.client.post(
+            reverse("api:assignment-list"),
+            {key: value for key, value in created.json().items() if key != "due_date"},
+            format="json",
+        )
+        self.assertEqual(missing.status_code, 400)
+
+    def test_assignments_bulk_applies_operations_atomically(self):
+        bulk_url = reverse("api:assignment-bulk")
+        template = {
+            "course_id": 101,
+            "section_id": 302,
+            "description": "",
+            "due_date": "2024-11-01",
+            "points_possible": 10,
+            "category": "Homework",
+        }
+        operations = [
+            {"op": "create", "data": {**template, "title": f"Unit 4 #{n}"}}
+            for n in range(120)
+        ]
+        operations += [
+            {"op": "update", "id": 1, "data": {**template, "title": "Moved quiz"}},
+            {"op": "delete", "id": 2},
+        ]
+        response = self.client.post(bulk_url, operations, format="json")
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        self.assertEqual(len(results), len(operations))
+        self.assertEqual(results[0]["status"], 201)
+        self.assertEqual(
+            results[-2],
+            {"status": 200, "data": {**template, "title": "Moved quiz", "id": 1}},
+        )
+        self.assertEqual(results[-1], {"status": 204, "id": 2})
+        self.assertEqual(len(mock_data.ASSIGNMENT_STORE.filter(section_id=302)), 121)
+
+        version = mock_data.ASSIGNMENT_STORE.version
+        failing = [
+            {"op": "create", "data": {**template, "title": "Never stored"}},
+            {"op": "delete", "id": 2},
+        ]
+        rejected = self.client.post(bulk_url, failing, format="json")
+        self.assertEqual(rejected.status_code, 400)
+        self.assertEqual(rejected.json(), [{}, {"id": ["Assignment not found."]}])
+        self.assertEqual(mock_data.ASSIGNMENT_STORE.version, version)
+
+        invalid = self.client.post(
+            bulk_url,
+            [{"op": "update", "data": {**template, "title": "No id"}}],
+            format="json",
+        )
+        self.assertEqual(invalid.status_code, 400)
+        self.assertIn("id", invalid.json()[0])
+
+    def test_read_endpoints_answer_conditional_gets(self):
+        urls = [
+            reverse("api:me"),
+            reverse("api:dashboard-stats"),
+            reverse("api:courses"),
+            reverse("api:section-roster", kwargs={"section_id": 301}),
+            reverse("api:section-gradebook", kwargs={"section_id": 301}),
+            reverse("api:assignment-list"),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first.status_code, 200)
+                self.assertTrue(first["ETag"].startswith('"'))
+                self.assertNotIn("Last-Modified", first)
+                cached = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+                self.assertEqual(cached.status_code, 304)
+                self.assertEqual(cached.content, b"")
+
+    def test_if_modified_since_never_hides_a_same_second_write(self):
+        gradebook_url = reverse("api:section-gradebook", kwargs={"section_id": 301})
+        list_url = reverse("api:assignment-list")
+        self.addCleanup(GRADEBOOKS.reset)
+        since = http_date()
+        self.client.get(gradebook_url)
+        self.client.get(list_url)
+        self.client.put(
+            reverse("api:section-grades", kwargs={"section_id": 301}),
+            {"student_id": 501, "assignment_id": 1, "score": 11},
+            format="json",
+        )
+        self.client.patch(
+            reverse("api:assignment-detail", args=[1]), {"title": "Renamed"}, format="json"
+        )
+        refreshed = self.client.get(gradebook_url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(refreshed.status_code, 200)
+        listed = self.client.get(list_url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(listed.status_code, 200)
+        self.assertIn("Renamed", [item["title"] for item in listed.json()])
+
+    def test_etags_change_when_data_changes(self):
+        list_url = reverse("api:assignment-list")
+        etag = self.client.get(list_url)["ETag"]
+        self.client.delete(reverse("api:assignment-detail", args=[2]))
+        refreshed = self.client.get(list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertNotEqual(refreshed["ETag"], etag)
+
+        roster_url = reverse("api:section-roster", kwargs={"section_id": 302})
+        etag = self.client.get(roster_url)["ETag"]
+        mock_data.DATASET_VERSIONS.bump("roster:302")
+        refreshed = self.client.get(roster_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(refreshed.status_code, 200)
+
+
+class MockAssignmentStoreTests(SimpleTestCase):
+    """Validate the copy-on-write semantics of the assignment store."""
+
+    def setUp(self):
+        super().setUp()
+        self.store = mock_data.MockAssignmentStore()
+
+    def test_records_are_read_only(self):
+        record = self.store.get(1)
+        with self.assertRaises(TypeError):
+            record["title"] = "Changed"  # type: ignore[index]
+
+    def test_list_snapshot_is_shared_until_write(self):
+        first = self.store.all()
+        self.assertIs(first, self.store.all())
+        self.assertIs(first[0], self.store.get(1))
+
+        draft = mock_data.thaw(first[0])
+        draft["title"] = "Retitled"
+        self.store.update(1, draft)
+
+        self.assertIsNot(first, self.store.all())
+        self.assertEqual(first[0]["title"], "Quiz: Linear Functions")
+        self.assertEqual(self.store.get(1)["title"], "Retitled")
+
+    def test_indexes_follow_updates_and_deletes(self):
+        moved = {**self.store.get(2), "section_id": 302, "due_date": "2024-12-01"}
+        self.store.update(2, moved)
+
+        self.assertEqual([item["id"] for item in self.store.filter(section_id=301)], [1])
+        self.assertEqual([item["id"] for item in self.store.filter(section_id=302)], [2])
+        self.assertEqual(
+            [item["id"] for item in self.store.filter(due_after=date(2024, 11, 1))],
+            [2],
+        )
+
+        self.store.delete(2)
+        self.assertEqual(self.store.filter(section_id=302), ())
+        self.assertEqual(self.store.filter(due_after=date(2024, 11, 1)), ())
+
+    def test_due_date_bounds_exclude_undated_assignments(self):
+        undated = self.store.create({**mock_data.thaw(self.store.get(1)), "due_date": None})
+
+        def ids(**bounds):
+            return [item["id"] for item in self.store.filter(**bounds)]
+
+        self.assertEqual(ids(due_before=date(2030, 1, 1)), [1, 2])
+        self.assertEqual(ids(due_after=date(2000, 1, 1)), [1, 2])
+        self.assertIn(undated["id"], ids(section_id=301))
+
+
+@override_settings(ENABLE_MOCK_DATA=True)
+class AssignmentStoreConcurrencyTests(SimpleTestCase):
+    """Hammer the assignment endpoints from many threads at once."""
+
+    workers = 16
+    writes_per_worker = 50
+
+    def setUp(self):
+        super().setUp()
+        mock_data.reset_assignments()
+        self.factory = APIRequestFactory()
+        self.create_view = AssignmentsViewSet.as_view({"post": "create"})
+        self.patch_view = AssignmentsViewSet.as_view({"patch": "partial_update"})
+
+    def _create_many(self, worker: int) -> list[int]:
+        created = []
+        for index in range(self.writes_per_worker):
+            request = self.factory.post(
+                "/api/v1/assignments/",
+                {
+                    "course_id": 101,
+                    "section_id": 301,
+                    "title": f"Worker {worker} #{index}",
+                    "description": "",
+                    "due_date": "2024-10-01",
+                    "points_possible": 10,
+                    "category": "Homework",
+                },
+                format="json",
+            )
+            response = self.create_view(request)
+            self.assertEqual(response.status_code, 201)
+            created.append(response.data["id"])
+        return created
+
+    def test_concurrent_creates_allocate_unique_ids(self):
+        starting = len(mock_data.ASSIGNMENT_STORE.all())
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            batches = list(pool.map(self._create_many, range(self.workers)))
+
+        ids = [assignment_id for batch in batches for assignment_id in batch]
+        expected = self.workers * self.writes_per_worker
+        self.assertEqual(len(ids), expected)
+        self.assertEqual(len(set(ids)), expected)
+        snapshot = mock_data.ASSIGNMENT_STORE.all()
+        self.assertEqual(len(snapshot), starting + expected)
+        self.assertEqual([item["id"] for item in snapshot], sorted(ids + [1, 2]))
+
+    def test_concurrent_partial_updates_do_not_lose_fields(self):
+        fields = {
+            "title": lambda n: f"Title {n}",
+            "description": lambda n: f"Description {n}",
+            "points_possible": lambda n: n,
+            "category": lambda n: f"Category {n}",
+        }
+
+        def _patch(field_name: str) -> None:
+            for n in range(self.writes_per_worker):
+                request = self.factory.patch(
+                    "/api/v1/assignments/1/",
+                    {field_name: fields[field_name](n)},
+                    format="json",
+                )
+                response = self.patch_view(request, pk="1")
+                self.assertEqual(response.status_code, 200)
+
+        with ThreadPoolExecutor(max_workers=len(fields)) as pool:
+            list(pool.map(_patch, fields))
+
+        final = mock_data.ASSIGNMENT_STORE.get(1)
+        last = self.writes_per_worker - 1
+        for field_name, value in fields.items():
+            self.assertEqual(final[field_name], value(last))
+
+
+class GradebookMatrixTests(SimpleTestCase):
+    """Check the vectorized gradebook totals against hand-computed values."""
+
+    def _gradebook(self):
+        return {
+            "section_id": 1,
+            "grading_period": "Fall 2024",
+            "category_weights": {"Quiz": 75, "Homework": 25},
+            "assignments": [
+                {"id": 1, "title": "Quiz 1", "points_possible": 20, "category": "Quiz"},
+                {"id": 2, "title": "HW 1", "points_possible": 10, "category": "Homework"},
+                {"id": 3, "title": "HW 2", "points_possible": 10, "category": "Homework"},
+                {"id": 4, "title": "Ungraded", "points_possible": 50, "category": "Quiz"},
+            ],
+            "students": [
+                {"student_id": 1, "name": "A", "grades": {1: 10, 2: 10, 3: 5}},
+                # Missing HW 2 and exempt from HW 1: homework carries no weight.
+                {"student_id": 2, "name": "B", "grades": {"1": 20, "2": 0}, "exempt": [2]},
+                {"student_id": 3, "name": "C", "grades": {}},
+            ],
+        }
+
+    def test_student_totals_skip_missing_and_exempt_grades(self):
+        payload = gradebook_payload(self._gradebook())
+        first, second, third = payload["students"]
+        self.assertEqual((first["earned"], first["possible"]), (25.0, 40.0))
+        self.assertEqual(first["percentage"], 62.5)
+        self.assertEqual((second["earned"], second["possible"]), (20.0, 20.0))
+        self.assertEqual(second["percentage"], 100.0)
+        self.assertIsNone(third["percentage"])
+
+    def test_weighted_percentage_renormalises_empty_categories(self):
+        payload = gradebook_payload(self._gradebook())
+        first, second, third = payload["students"]
+        self.assertEqual(first["weighted_percentage"], 0.75 * 50 + 0.25 * 75)
+        self.assertEqual(second["weighted_percentage"], 100.0)
+        self.assertIsNone(third["weighted_percentage"])
+        self.assertEqual(payload["class_average"], round((56.25 + 100) / 2, 2))
+
+    def test_assignment_stats(self):
+        payload = gradebook_payload(self._gradebook())
+        stats = {row["assignment_id"]: row for row in payload["assignment_stats"]}
+        self.assertEqual(stats[1]["count"], 2)
+        self.assertEqual((stats[1]["mean"], stats[1]["median"]), (15.0, 15.0))
+        self.assertEqual((stats[1]["min"], stats[1]["max"], stats[1]["stdev"]), (10.0, 20.0, 5.0))
+        self.assertEqual(stats[1]["mean_percentage"], 75.0)
+        self.assertEqual(stats[2]["count"], 1)
+        self.assertEqual(stats[4]["count"], 0)
+        for key in ("mean", "median", "min", "max", "stdev", "mean_percentage"):
+            self.assertIsNone(stats[4][key])
+
+    def test_matrix_matches_python_reference_on_larger_section(self):
+        gradebook = {
+            "assignments": [
+                {"id": a, "title": str(a), "points_possible": 10 + a % 7, "category": "Quiz"}
+                for a in range(1, 41)
+            ],
+            "students": [
+                {
+                    "student_id": s,
+                    "name": str(s),
+                    "grades": {a: (s * a) % (10 + a % 7) for a in range(1, 41) if (s + a) % 5},
+                }
+                for s in range(60)
+            ],
+        }
+        totals = GradebookMatrix.from_gradebook(gradebook).student_totals()
+        points = {item["id"]: item["points_possible"] for item in gradebook["assignments"]}
+        for row, student in enumerate(gradebook["students"]):
+            earned = sum(student["grades"].values())
+            possible = sum(points[a] for a in student["grades"])
+            self.assertAlmostEqual(totals["earned"][row], earned)
+            self.assertAlmostEqual(totals["percentage"][row], earned / possible * 100)
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_gradebook_view_includes_computed_totals(self):
+        response = APIClient().get(reverse("api:section-gradebook", kwargs={"section_id": 301}))
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["students"][0]["weighted_percentage"], 94.0)
+        self.assertEqual(len(payload["assignment_stats"]), len(payload["assignments"]))
+        self.assertIsNotNone(payload["class_average"])
+
+
+class LiveGradebookTests(SimpleTestCase):
+    """Incremental gradebook updates must match a full recomputation."""
+
+    def setUp(self):
+        super().setUp()
+        mock_data.reset_assignments()
+        GRADEBOOKS.reset()
+        self.client = APIClient()
+
+    def tearDown(self):
+        mock_data.reset_assignments()
+        GRADEBOOKS.reset()
+        super().tearDown()
+
+    def _gradebook(self):
+        return {
+            "section_id": 1,
+            "grading_period": "Fall 2024",
+            "category_weights": {"Quiz": 2, "Homework": 1, "Project": 3},
+            "assignments": [
+                {"id": a, "title": f"A{a}", "points_possible": 5 + a, "category": category}
+                for a, category in enumerate(["Quiz", "Homework", "Quiz", "Homework", None], 1)
+            ],
+            "students": [
+                {
+                    "student_id": s,
+                    "name": f"S{s}",
+                    "grades": {a: (s + a) % (6 + a) for a in range(1, 6) if (s * a) % 4},
+                }
+                for s in range(1, 9)
+            ],
+        }
+
+    def test_incremental_changes_match_full_recomputation(self):
+        live = LiveGradebook(self._gradebook())
+        live.set_grade(1, 1, 6)
+        live.set_grade(2, 2, None)
+        live.set_grade(3, 3, 4, exempt=True)
+        live.set_grade(3, 3, 2)
+        live.set_grade(4, 5, 0)
+        live.update_assignment({"id": 2, "points_possible": 20, "category": "Homework"})
+        live.update_assignment({"id": 3, "points_possible": 8, "category": "Project"})
+        live.update_assignment({"id": 5, "points_possible": 10, "category": "Quiz"})
+        live.update_assignment({"id": 1, "points_possible": 6, "category": None})
+        live.set_grade(5, 3, 7.5)
+        self.assertEqual(live.payload(), gradebook_payload(live.to_dict()))
+
+    def test_added_assignments_and_batched_grades_match_full_recomputation(self):
+        live = LiveGradebook(self._gradebook())
+        live.section_stats()
+        records = [
+            {"id": 7, "title": "Lab", "points_possible": 12, "category": "Project"},
+            {"id": 6, "title": "Essay", "points_possible": 30, "category": "Essay"},
+            {"id": 2, "title": "A2", "points_possible": 7, "category": "Homework"},
+        ]
+        self.assertEqual(live.add_assignments(records), 2)
+        self.assertEqual(live.add_assignments(records[:1]), 0)
+        skipped = live.set_grades([(1, 7, 10), (2, 6, 25.5), (2, 7, None), (99, 7, 1), (1, 8, 1)])
+        self.assertEqual(skipped, [(99, 7), (1, 8)])
+        payload = live.to_dict()
+        self.assertEqual([assignment["id"] for assignment in payload["assignments"]][-2:], [7, 6])
+        self.assertEqual(live.payload(), gradebook_payload(payload))
+        fresh = LiveGradebook(payload).section_stats()
+        self.assertEqual(live.section_stats(), fresh)
+
+    def test_columnar_storage_round_trips_the_gradebook(self):
+        gradebook = self._gradebook()
+        gradebook["students"][0]["exempt"] = [3]
+        gradebook["students"][1]["grades"][2] = 4.25
+        gradebook["students"][2]["advisor"] = "Ms. Ortiz"
+        live = LiveGradebook(json.loads(json.dumps(gradebook)))
+        self.assertEqual(live.to_dict(), gradebook)
+
+        scores = live.matrix.scores
+        self.assertEqual(scores.dtype, "float32")
+        self.assertTrue(scores.flags.f_contiguous)
+        names = [student["name"] for student in live.to_dict()["students"]]
+        self.assertIs(names[0], LiveGradebook(gradebook).to_dict()["students"][0]["name"])
+
+        live.set_grade(1, 3, None)
+        live.set_grade(2, 1, 3.5, exempt=True)
+        student = live.to_dict()["students"][1]
+        self.assertEqual(student["grades"][1], 3.5)
+        self.assertEqual(student["exempt"], [1])
+        self.assertNotIn("exempt", live.to_dict()["students"][0])
+
+    def test_unknown_cells_raise_key_error(self):
+        live = LiveGradebook(self._gradebook())
+        with self.assertRaises(KeyError):
+            live.set_grade(999, 1, 3)
+        with self.assertRaises(KeyError):
+            live.set_grade(1, 999, 3)
+        self.assertFalse(live.update_assignment({"id": 999, "points_possible": 1}))
+        self.assertFalse(live.remove_assignment(999))
+
+    def test_removed_assignments_match_full_recomputation(self):
+        gradebook = self._gradebook()
+        gradebook["students"][0]["exempt"] = [2, 4]
+        gradebook["assignments"][3]["rubric"] = "R4"
+        live = LiveGradebook(gradebook)
+        live.section_stats()
+        live.set_grade(2, 4, 3)
+        self.assertTrue(live.remove_assignment(2))
+        self.assertFalse(live.remove_assignment(2))
+        self.assertTrue(live.remove_assignment(5))
+        live.set_grade(3, 4, 1)
+
+        payload = live.to_dict()
+        self.assertEqual([assignment["id"] for assignment in payload["assignments"]], [1, 3, 4])
+        self.assertEqual(payload["assignments"][2]["rubric"], "R4")
+        self.assertEqual(payload["students"][0]["exempt"], [4])
+        self.assertNotIn(2, payload["students"][1]["grades"])
+        expected_payload = gradebook_payload(payload)
+        live_payload = live.payload()
+        for name, expected in expected_payload.items():
+            if name != "students":
+                self.assertEqual(live_payload[name], expected)
+        for student, expected in zip(live_payload["students"], expected_payload["students"]):
+            for field in ("earned", "possible", "percentage", "weighted_percentage"):
+                self.assertAlmostEqual(student[field], expected[field])
+        self.assertEqual(live.section_stats(), LiveGradebook(payload).section_stats())
+
+    def test_grades_set_while_a_column_is_removed_keep_their_assignment(self):
+        live = LiveGradebook(self._gradebook())
+        lock = live._lock
+
+        class RemoveFirst:
+            """Lets ``remove_assignment`` win the lock ``set_grade`` is waiting on."""
+
+            def __enter__(self):
+                live._lock = lock
+                live.remove_assignment(1)
+                return lock.__enter__()
+
+            def __exit__(self, *exc_info):
+                return lock.__exit__(*exc_info)
+
+        before = live.to_dict()["students"][0]["grades"]
+        live._lock = RemoveFirst()
+        with self.assertRaises(KeyError):
+            live.set_grade(1, 1, 0)
+        after = live.to_dict()["students"][0]["grades"]
+        self.assertEqual(after, {a: g for a, g in before.items() if a != 1})
+
+        # Threads grading every column while columns are dropped under them.
+        live = LiveGradebook(self._gradebook())
+        grades = [(s, a, a) for s in range(1, 9) for a in range(1, 6)] * 20
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            batches = [pool.submit(live.set_grades, grades) for _ in range(4)]
+            for assignment_id in (2, 4):
+                live.remove_assignment(assignment_id)
+            for batch in batches:
+                batch.result()
+        payload = live.to_dict()
+        for student in payload["students"]:
+            self.assertEqual(student["grades"], {a: a for a in (1, 3, 5)})
+        self.assertEqual(live.payload(), gradebook_payload(payload))
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_assignment_edit_updates_served_gradebook(self):
+        url = reverse("api:section-gradebook", kwargs={"section_id": 301})
+        before = self.client.get(url)
+        response = self.client.patch(
+            reverse("api:assignment-detail", kwargs={"pk": 2}),
+            {"points_possible": 30},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        after = self.client.get(url, HTTP_IF_NONE_MATCH=before["ETag"])
+        self.assertEqual(after.status_code, 200)
+        payload = after.json()
+        self.assertEqual(payload["assignments"][1]["points_possible"], 30)
+        self.assertEqual(payload["students"][0]["possible"], 50.0)
+        self.assertEqual(payload["students"][0]["weighted_percentage"], 0.6 * 90 + 0.4 * 50)
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_deleted_assignment_leaves_served_gradebook(self):
+        url = reverse("api:section-gradebook", kwargs={"section_id": 301})
+        before = self.client.get(url)
+        response = self.client.delete(reverse("api:assignment-detail", kwargs={"pk": 2}))
+        self.assertEqual(response.status_code, 204)
+
+        after = self.client.get(url, HTTP_IF_NONE_MATCH=before["ETag"])
+        self.assertEqual(after.status_code, 200)
+        payload = after.json()
+        self.assertEqual([assignment["id"] for assignment in payload["assignments"]], [1])
+        self.assertEqual(payload["students"][0]["grades"], {"1": 18})
+        self.assertEqual(payload["students"][0]["possible"], 20.0)
+        self.assertEqual(payload["students"][0]["weighted_percentage"], 90.0)
+
+        GRADEBOOKS.reset()
+        rebuilt = self.client.get(url).json()
+        self.assertEqual([assignment["id"] for assignment in rebuilt["assignments"]], [1])
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_moved_assignment_leaves_its_old_section(self):
+        url = reverse("api:section-gradebook", kwargs={"section_id": 301})
+        before = self.client.get(url)
+        response = self.client.patch(
+            reverse("api:assignment-detail", kwargs={"pk": 1}),
+            {"section_id": 302},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        after = self.client.get(url, HTTP_IF_NONE_MATCH=before["ETag"])
+        self.assertEqual(after.status_code, 200)
+        payload = after.json()
+        self.assertEqual([assignment["id"] for assignment in payload["assignments"]], [2])
+        self.assertEqual(payload["students"][0]["possible"], 15.0)
+        self.assertEqual(payload["assignment_stats"][0]["assignment_id"], 2)
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_grade_endpoint_updates_gradebook(self):
+        grades_url = reverse("api:section-grades", kwargs={"section_id": 301})
+        response = self.client.put(
+            grades_url,
+            {"student_id": 502, "assignment_id": 1, "score": 20},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["score"], 20)
+
+        payload = self.client.get(
+            reverse("api:section-gradebook", kwargs={"section_id": 301})
+        ).json()
+        student = payload["students"][1]
+        self.assertEqual(student["grades"]["1"], 20)
+        self.assertEqual(student["earned"], 32.0)
+        self.assertEqual(payload["assignment_stats"][0]["max"], 20.0)
+
+        exempt = self.client.put(
+            grades_url,
+            {"student_id": 502, "assignment_id": 2, "score": None, "exempt": True},
+            format="json",
+        )
+        self.assertEqual(exempt.status_code, 200)
+        student = self.client.get(
+            reverse("api:section-gradebook", kwargs={"section_id": 301})
+        ).json()["students"][1]
+        self.assertEqual(student["exempt"], [2])
+        self.assertEqual((student["earned"], student["possible"]), (20.0, 20.0))
+
+    def test_stream_encodes_students_in_chunks(self):
+        live = LiveGradebook(self._gradebook())
+        chunks = list(live.stream(lambda data: (json.dumps(data) + "\n").encode(), chunk_size=3))
+        self.assertEqual(len(chunks), 1 + 3)
+        lines = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+        header, students = lines[0], lines[1:]
+        expected = json.loads(json.dumps(live.payload()))
+        self.assertEqual(header["student_count"], 8)
+        self.assertEqual(header["class_average"], expected["class_average"])
+        self.assertEqual(header["assignment_stats"], expected["assignment_stats"])
+        self.assertNotIn("students", header)
+        self.assertEqual(students, expected["students"])
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_gradebook_streams_ndjson(self):
+        url = reverse("api:section-gradebook", kwargs={"section_id": 301})
+        document = self.client.get(url)
+        for response in (
+            self.client.get(url, {"format": "ndjson"}),
+            self.client.get(url, HTTP_ACCEPT="application/x-ndjson"),
+        ):
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.streaming)
+            self.assertEqual(response["Content-Type"], "application/x-ndjson")
+            self.assertIn("Accept", response["Vary"])
+            self.assertNotEqual(response["ETag"], document["ETag"])
+            lines = [
+                json.loads(line)
+                for line in b"".join(response.streaming_content).splitlines()
+            ]
+            self.assertEqual(lines[0]["section_id"], 301)
+            self.assertEqual(lines[0]["class_average"], document.json()["class_average"])
+            self.assertEqual(lines[1:], document.json()["students"])
+
+        etag = self.client.get(url, {"format": "ndjson"})["ETag"]
+        cached = self.client.get(url, {"format": "ndjson"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        missing = self.client.get(
+            reverse("api:section-gradebook", kwargs={"section_id": 999}), {"format": "ndjson"}
+        )
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(json.loads(missing.content)["detail"], "Section not found")
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_grade_endpoint_rejects_unknown_cells_and_bad_scores(self):
+        grades_url = reverse("api:section-grades", kwargs={"section_id": 301})
+        missing = self.client.put(
+            grades_url, {"student_id": 1, "assignment_id": 1, "score": 3}, format="json"
+        )
+        self.assertEqual(missing.status_code, 404)
+        negative = self.client.put(
+            grades_url, {"student_id": 501, "assignment_id": 1, "score": -1}, format="json"
+        )
+        self.assertEqual(negative.status_code, 400)
+        self.assertIn("score", negative.json())
+
+
+class GradebookExportTests(SimpleTestCase):
+    """Exports must stream every recorded cell and keep errors as JSON."""
+
+    def setUp(self):
+        super().setUp()
+        GRADEBOOKS.reset()
+        self.client = APIClient()
+
+    def tearDown(self):
+        GRADEBOOKS.reset()
+        super().tearDown()
+
+    def _rows(self, response):
+        self.assertTrue(response.streaming)
+        text = b"".join(response.streaming_content).decode("utf-8")
+        return list(csv.DictReader(io.StringIO(text)))
+
+    def test_batches_cover_graded_and_exempt_cells_in_chunks(self):
+        live = LiveGradebook(
+            {
+                "section_id": 7,
+                "assignments": [
+                    {"id": 1, "title": "Quiz", "points_possible": 10, "category": "Quiz"},
+                    {"id": 2, "title": "Lab", "points_possible": 4.5},
+                ],
+                "students": [
+                    {"student_id": s, "name": f"S{s}", "grades": {1: s + 0.25}}
+                    for s in range(1, 6)
+                ]
+                + [{"student_id": 6, "name": "S6", "grades": {2: 4}, "exempt": [1]}],
+            }
+        )
+        batches = list(live.export_batches(chunk_size=4))
+        self.assertEqual(len(batches), 2)
+        cells = [
+            dict(zip(EXPORT_COLUMNS, row))
+            for batch in batches
+            for row in zip(*(batch[column] for column in EXPORT_COLUMNS))
+        ]
+        self.assertEqual(len(cells), 7)
+        self.assertEqual(
+            cells[0],
+            {
+                "section_id": 7,
+                "student_id": 1,
+                "student_name": "S1",
+                "assignment_id": 1,
+                "assignment_title": "Quiz",
+                "category": "Quiz",
+                "points_possible": 10,
+                "score": 1.25,
+                "exempt": False,
+            },
+        )
+        self.assertEqual(
+            [(cell["assignment_id"], cell["score"], cell["exempt"]) for cell in cells[5:]],
+            [(1, None, True), (2, 4, False)],
+        )
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_section_export_streams_csv(self):
+        url = reverse("api:section-gradebook-export", kwargs={"section_id": 301})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="gradebook-301.csv"', response["Content-Disposition"])
+        rows = self._rows(response)
+        self.assertEqual(list(rows[0]), list(EXPORT_COLUMNS))
+        fixture = mock_data.SECTION_GRADEBOOKS[301]
+        self.assertEqual(
+            [(int(row["student_id"]), int(row["assignment_id"]), row["score"]) for row in rows],
+            [
+                (student["student_id"], assignment_id, str(score))
+                for student in fixture["students"]
+                for assignment_id, score in student["grades"].items()
+            ],
+        )
+
+        etag = self.client.get(url, {"format": "csv"})["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        invalid = self.client.get(url, {"format": "xml"})
+        self.assertEqual(invalid.status_code, 400)
+        self.assertIn("format", invalid.json())
+        missing = self.client.get(
+            reverse("api:section-gradebook-export", kwargs={"section_id": 999})
+        )
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(missing.json()["detail"], "Section not found")
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_district_export_concatenates_sections(self):
+        response = self.client.get(reverse("api:gradebook-export"))
+        self.assertEqual(response.status_code, 200)
+        rows = self._rows(response)
+        expected = sum(
+            len(student["grades"])
+            for gradebook in mock_data.SECTION_GRADEBOOKS.values()
+            for student in gradebook["students"]
+        )
+        self.assertEqual(len(rows), expected)
+
+    @skipIf(importlib.util.find_spec("pyarrow"), "pyarrow is installed")
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_arrow_export_needs_pyarrow(self):
+        url = reverse("api:section-gradebook-export", kwargs={"section_id": 301})
+        for fmt in ("arrow", "parquet"):
+            response = self.client.get(url, {"format": fmt})
+            self.assertEqual(response.status_code, 501)
+            self.assertIn("pyarrow", response.json()["detail"])
+
+    @skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_arrow_export_round_trips(self):  # pragma: no cover - needs pyarrow
+        import pyarrow as pa
+
+        url = reverse("api:section-gradebook-export", kwargs={"section_id": 301})
+        response = self.client.get(url, {"format": "arrow"})
+        table = pa.ipc.open_stream(b"".join(response.streaming_content)).read_all()
+        self.assertEqual(table.column_names, list(EXPORT_COLUMNS))
+        self.assertEqual(table.num_rows, 6)
+
+
+class ReportCardJobsTests(SimpleTestCase):
+    """Report card jobs must render every student in the pool and report progress."""
+
+    def setUp(self):
+        super().setUp()
+        self.storage = tempfile.TemporaryDirectory()
+        self.jobs = ReportCardJobs(self.storage.name, max_workers=2)
+        self.plan = compile_policy(GradingPolicy.from_dict(mock_data.GRADING_POLICY))
+
+    def tearDown(self):
+        self.jobs.shutdown()
+        self.storage.cleanup()
+        super().tearDown()
+
+    def _cards(self):
+        return report_cards(
+            mock_data.SECTION_GRADEBOOKS[301],
+            self.plan,
+            mock_data.COURSES[0],
+            issued_on=date(2024, 12, 20),
+        )
+
+    def test_cards_are_preformatted_from_policy_grades(self):
+        card = self._cards()[0]
+        self.assertEqual(card["student_name"], "Alice Nguyen")
+        self.assertEqual(card["section_name"], "Period 1")
+        self.assertEqual((card["percentage"], card["letter"], card["gpa"]), ("94.00%", "A", "4.0"))
+        self.assertEqual(
+            card["assignments"][0],
+            {
+                "title": "Quiz: Linear Functions",
+                "category": "Quiz",
+                "score": "18",
+                "points_possible": "20",
+            },
+        )
+
+    def test_job_renders_one_artifact_per_student(self):
+        job = self.jobs.submit(301, self._cards(), "html")
+        status = self.jobs.wait(job.id, timeout=30)
+        self.assertEqual(status["status"], "completed")
+        self.assertEqual((status["completed"], status["total"], status["progress"]), (3, 3, 1.0))
+        self.assertEqual(status["artifacts"], ["501.html", "502.html", "503.html"])
+        html = (job.directory / "502.html").read_text(encoding="utf-8")
+        self.assertIn("Miguel Lopez", html)
+        self.assertIn("Issued 2024-12-20", html)
+
+    def test_failed_cards_are_reported_per_student(self):
+        cards = self._cards()
+        cards[1] = {**cards[1], "student_id": "missing/502"}
+        status = self.jobs.wait(self.jobs.submit(301, cards, "html").id, timeout=30)
+        self.assertEqual(status["status"], "failed")
+        self.assertEqual((status["completed"], status["failed"]), (2, 1))
+        self.assertEqual(status["errors"][0]["student_id"], "missing/502")
+
+    def test_empty_and_unsupported_jobs(self):
+        self.assertEqual(self.jobs.submit(301, [], "html").status, "completed")
+        with self.assertRaises(ValueError):
+            self.jobs.submit(301, self._cards(), "docx")
+        self.assertIsNone(self.jobs.get("unknown"))
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_endpoints_start_and_report_jobs(self):
+        client = APIClient()
+        url = reverse("api:section-report-cards", kwargs={"section_id": 301})
+        with mock.patch("api.views.REPORT_CARD_JOBS", self.jobs):
+            response = client.post(url, {"format": "html"}, format="json")
+            self.assertEqual(response.status_code, 202)
+            self.jobs.wait(response.json()["id"], timeout=30)
+            status = client.get(response["Location"])
+            self.assertEqual(status.status_code, 200)
+            self.assertEqual(status.json()["status"], "completed")
+            self.assertEqual(client.get(reverse("api:report-job", args=["x"])).status_code, 404)
+            missing = reverse("api:section-report-cards", kwargs={"section_id": 999})
+            self.assertEqual(client.post(missing, {}, format="json").status_code, 404)
+            invalid = client.post(url, {"format": "docx"}, format="json")
+            self.assertEqual(invalid.status_code, 400)
+            default = client.post(url, {}, format="json")
+            self.assertEqual(default.status_code, 202)
+            self.assertEqual(self.jobs.wait(default.json()["id"], timeout=30)["format"], "html")
+            if importlib.util.find_spec("weasyprint") is None:
+                pdf = client.post(url, {"format": "pdf"}, format="json")
+                self.assertEqual(pdf.status_code, 501)
+
+
+class GradingPolicyEngineTests(SimpleTestCase):
+    """Check the policy engine against hand-computed term and course grades."""
+
+    def _policy(self, **overrides):
+        data = {
+            "categories": [
+                {"name": "Quiz", "weight": "3", "drop_lowest": 1},
+                {"name": "Homework", "weight": "1"},
+            ],
+            **overrides,
+        }
+        return GradingPolicy.from_dict(data)
+
+    def _gradebook(self, students, assignments=None):
+        return {
+            "section_id": 1,
+            "grading_period": "Fall",
+            "assignments": assignments
+            or [
+                {"id": 1, "points_possible": 10, "category": "Quiz"},
+                {"id": 2, "points_possible": 20, "category": "Quiz"},
+                {"id": 3, "points_possible": 10, "category": "Quiz"},
+                {"id": 4, "points_possible": 10, "category": "Homework"},
+                {"id": 5, "points_possible": 5, "category": "Homework", "extra_credit": True},
+                {"id": 6, "points_possible": 10, "category": "Elective"},
+            ],
+            "students": students,
+        }
+
+    def _evaluate(self, policy, gradebook):
+        return compile_policy(policy).evaluate(gradebook)
+
+    def test_drops_lowest_ties_by_assignment_id_and_adds_extra_credit(self):
+        # Quizzes 1 and 3 tie at 50%; quiz 1 is dropped, leaving (10 + 5) / 30.
+        students = [
+            {"student_id": 1, "grades": {1: 5, 2: 10, 3: 5, 4: 8, 5: 2, 6: 0}},
+        ]
+        (result,) = self._evaluate(self._policy(), self._gradebook(students))
+        term = result["terms"]["Fall"]
+        self.assertEqual(
+            term["categories"], {"Quiz": Decimal("50.00"), "Homework": Decimal("100.00")}
+        )
+        self.assertEqual(term["percentage"], Decimal("62.50"))
+        self.assertEqual((result["letter"], result["gpa"]), ("D", Decimal("1.0")))
+
+    def test_missing_scores_count_as_zero_unless_disabled_and_exempt_skips(self):
+        students = [{"student_id": 1, "grades": {2: 20, 3: 10}, "exempt": [4]}]
+        gradebook = self._gradebook(students)
+        (strict,) = self._evaluate(self._policy(), gradebook)
+        # Quiz 1 is missing (0%) and dropped; homework is exempt so only quizzes count.
+        self.assertEqual(strict["terms"]["Fall"]["categories"], {"Quiz": Decimal("100.00")})
+        self.assertEqual(strict["percentage"], Decimal("100.00"))
+
+        lenient = self._policy(
+            categories=[{"name": "Quiz", "weight": "1"}, {"name": "Homework", "weight": "1"}],
+            missing_as_zero=False,
+        )
+        (result,) = self._evaluate(lenient, gradebook)
+        self.assertEqual(result["percentage"], Decimal("100.00"))
+        (zeroed,) = self._evaluate(
+            self._policy(categories=[{"name": "Quiz", "weight": "1"}]), gradebook
+        )
+        self.assertEqual(zeroed["percentage"], Decimal("75.00"))
+
+    def test_rounds_half_up_at_the_end(self):
+        assignments = [{"id": 1, "points_possible": 32, "category": "Quiz"}]
+        students = [{"student_id": 1, "grades": {"1": 1}}]
+        (result,) = self._evaluate(
+            self._policy(categories=[{"name": "Quiz", "weight": "1"}]),
+            self._gradebook(students, assignments),
+        )
+        self.assertEqual(result["percentage"], Decimal("3.13"))
+        self.assertEqual(result["letter"], "F")
+
+    def test_arithmetic_ignores_the_callers_decimal_context(self):
+        assignments = [
+            {"id": 1, "points_possible": 3, "category": "Quiz", "term": "T1"},
+            {"id": 2, "points_possible": 7, "category": "Homework", "term": "T1"},
+            {"id": 3, "points_possible": 9, "category": "Quiz", "term": "T2"},
+        ]
+        students = [{"student_id": 1, "grades": {1: 1, 2: 5, 3: 7}}]
+        policy = self._policy(
+            categories=[{"name": "Quiz", "weight": "0.7"}, {"name": "Homework", "weight": "0.3"}],
+            term_weights={"T1": "1", "T2": "2"},
+        )
+        gradebook = self._gradebook(students, assignments)
+        expected = self._evaluate(policy, gradebook)
+        with localcontext(prec=3, rounding=ROUND_DOWN):
+            self.assertEqual(self._evaluate(policy, gradebook), expected)
+        self.assertEqual(expected[0]["terms"]["T1"]["percentage"], Decimal("44.76"))
+
+    def test_terms_combine_by_term_weight(self):
+        assignments = [
+            {"id": 1, "points_possible": 10, "category": "Quiz", "term": "T1"},
+            {"id": 2, "points_possible": 10, "category": "Quiz", "term": "T2"},
+            {"id": 3, "points_possible": 10, "category": "Quiz", "term": "T3"},
+        ]
+        students = [{"student_id": 1, "grades": {1: 10, 2: 7}}]
+        policy = self._policy(
+            categories=[{"name": "Quiz", "weight": "1"}],
+            term_weights={"T1": "1", "T2": "3"},
+        )
+        (result,) = self._evaluate(policy, self._gradebook(students, assignments))
+        self.assertEqual(result["terms"]["T1"]["percentage"], Decimal("100.00"))
+        self.assertEqual(result["terms"]["T3"]["percentage"], Decimal("0.00"))
+        self.assertEqual(result["percentage"], Decimal("77.50"))
+        self.assertEqual(result["letter"], "C")
+
+    def test_students_without_gradable_work_have_no_grade(self):
+        assignments = [{"id": 6, "points_possible": 10, "category": "Elective"}]
+        (result,) = self._evaluate(
+            self._policy(), self._gradebook([{"student_id": 1, "grades": {6: 9}}], assignments)
+        )
+        self.assertEqual(result["terms"], {})
+        self.assertIsNone(result["percentage"])
+        self.assertIsNone(result["letter"])
+
+    def test_policy_validation_and_plan_reuse(self):
+        with self.assertRaises(ValueError):
+            GradingPolicy.from_dict({"categories": []})
+        with self.assertRaises(ValueError):
+            GradingPolicy.from_dict(
+                {"categories": [{"name": "Quiz", "weight": 1}, {"name": "Quiz", "weight": 2}]}
+            )
+        self.assertIs(compile_policy(self._policy()), compile_policy(self._policy()))
+        graded = evaluate_sections(
+            [self._gradebook([{"student_id": 1, "grades": {4: 10}}])],
+            lambda _gradebook: self._policy(),
+        )
+        self.assertEqual(graded[1][0]["terms"]["Fall"]["categories"]["Homework"], Decimal("100.00"))
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_section_grades_endpoint_follows_grade_changes(self):
+        GRADEBOOKS.reset()
+        self.addCleanup(GRADEBOOKS.reset)
+        client = APIClient()
+        url = reverse("api:section-grades", kwargs={"section_id": 301})
+        first = client.get(url)
+        self.assertEqual(first.status_code, 200)
+        students = first.json()["students"]
+        self.assertEqual(students[0]["percentage"], "94.00")
+        self.assertEqual((students[1]["letter"], students[1]["gpa"]), ("C", "2.00"))
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        client.put(url, {"student_id": 502, "assignment_id": 1, "score": 20}, format="json")
+        second = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json()["students"][1]["percentage"], "92.00")
+        missing = client.get(reverse("api:section-grades", kwargs={"section_id": 999}))
+        self.assertEqual(missing.status_code, 404)
+
+
+class SectionStatsTests(SimpleTestCase):
+    """Incrementally maintained statistics must match a fresh computation."""
+
+    def setUp(self):
+        super().setUp()
+        GRADEBOOKS.reset()
+        self.addCleanup(GRADEBOOKS.reset)
+
+    def _gradebook(self):
+        return {
+            "section_id": 7,
+            "assignments": [
+                {"id": a, "title": f"A{a}", "points_possible": 4 + 3 * a, "category": "Quiz"}
+                for a in range(1, 6)
+            ],
+            "students": [
+                {
+                    "student_id": s,
+                    "name": f"S{s}",
+                    "grades": {a: (s * 5 + a) % (5 + 3 * a) for a in range(1, 6) if (s + a) % 3},
+                }
+                for s in range(1, 12)
+            ],
+        }
+
+    def _expected(self, live, axis, index):
+        """Summary of one assignment (``axis=0``) or student (``axis=1``) via NumPy."""
+        matrix = live.matrix
+        percentages = matrix.scores.astype(np.float64) * 100.0 / matrix.points_possible
+        percentages = np.where(matrix.counted, percentages, np.nan)
+        values = percentages[:, index] if axis == 0 else percentages[index]
+        values = values[~np.isnan(values)]
+        return {
+            "count": len(values),
+            "mean": round(float(values.mean()), 2),
+            "stdev": round(float(values.std()), 2),
+            "min": round(float(values.min()), 2),
+            "q1": round(float(np.percentile(values, 25)), 2),
+            "median": round(float(np.median(values)), 2),
+            "q3": round(float(np.percentile(values, 75)), 2),
+            "max": round(float(values.max()), 2),
+            "histogram": np.histogram(np.clip(values, 0, 100), bins=range(0, 101, 10))[0].tolist(),
+        }
+
+    def _assert_matches(self, live):
+        stats = live.section_stats()
+        summaries = [(0, index, summary) for index, summary in enumerate(stats["assignments"])]
+        summaries += [(1, index, summary) for index, summary in enumerate(stats["students"])]
+        for axis, index, summary in summaries:
+            expected = self._expected(live, axis, index)
+            for key, value in expected.items():
+                with self.subTest(axis=axis, index=index, key=key):
+                    if key in ("count", "histogram"):
+                        self.assertEqual(summary[key], value)
+                    else:
+                        # Running sums may land on the other side of a rounding tie.
+                        self.assertAlmostEqual(summary[key], value, delta=0.011)
+                        self.assertIs(type(summary[key]), float)
+
+    def test_running_stats_follow_grade_and_assignment_changes(self):
+        live = LiveGradebook(self._gradebook())
+        self._assert_matches(live)
+        live.set_grade(1, 1, 7)
+        live.set_grade(2, 2, None)
+        live.set_grade(3, 3, 12.5)
+        live.set_grade(4, 4, 9, exempt=True)
+        live.set_grade(3, 3, 1)
+        live.update_assignment({"id": 5, "points_possible": 40})
+        live.update_assignment({"id": 2, "title": "Renamed"})
+        self._assert_matches(live)
+
+    def test_removing_every_value_empties_the_summary(self):
+        stats = RunningStats()
+        for value in (50.0, 75.0, 100.0):
+            stats.add(value)
+        self.assertEqual((stats.quantile(0.25), stats.quantile(0.5)), (62.5, 75.0))
+        self.assertEqual(stats.histogram[-1], 1)
+        for value in (75.0, 100.0, 50.0):
+            stats.remove(value)
+        summary = stats.summary()
+        self.assertEqual(summary["count"], 0)
+        self.assertIsNone(summary["median"])
+        self.assertEqual(sum(summary["histogram"]), 0)
+        with self.assertRaises(ValueError):
+            stats.remove(50.0)
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_stats_endpoint_follows_grade_changes(self):
+        client = APIClient()
+        url = reverse("api:section-stats", kwargs={"section_id": 301})
+        first = client.get(url)
+        self.assertEqual(first.status_code, 200)
+        payload = first.json()
+        self.assertEqual(payload["section_id"], 301)
+        self.assertEqual(payload["histogram_edges"], list(range(0, 101, 10)))
+        quiz = payload["assignments"][0]
+        self.assertEqual((quiz["assignment_id"], quiz["count"], quiz["median"]), (1, 3, 90.0))
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        grades_url = reverse("api:section-grades", kwargs={"section_id": 301})
+        client.put(grades_url, {"student_id": 502, "assignment_id": 1, "score": 5}, format="json")
+        second = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 200)
+        quiz = second.json()["assignments"][0]
+        self.assertEqual((quiz["min"], quiz["q1"], quiz["histogram"][2]), (25.0, 57.5, 1))
+        missing = client.get(reverse("api:section-stats", kwargs={"section_id": 999}))
+        self.assertEqual(missing.status_code, 404)
+
+
+class DashboardAggregatesTests(SimpleTestCase):
+    """Dashboard counters must follow store writes without rescanning."""
+
+    TODAY = date(2024, 9, 22)
+
+    def setUp(self):
+        super().setUp()
+        self.store = mock_data.MockAssignmentStore()
+        self.versions = mock_data.DatasetVersions()
+        rosters = {
+            301: {"students": [{"id": 1}, {"id": 2}]},
+            302: {"students": [{"id": 2}, {"id": 3}]},
+            303: {"students": [{"id": 4}]},
+        }
+        self.dashboards = DashboardAggregates(
+            {301: 1, 302: 1, 303: 2}, rosters, self.store, self.versions, extra={"x": 1}
+        )
+
+    def _create(self, section_id, due_date):
+        return self.store.create(
+            {"section_id": section_id, "title": "T", "points_possible": 5, "due_date": due_date}
+        )
+
+    def test_counts_follow_assignment_writes(self):
+        first = self.dashboards.payload(1, self.TODAY)
+        self.assertEqual(
+            first,
+            {
+                "sections": 2,
+                "students": 3,
+                "assignments": 2,
+                "assignments_due": 1,
+                "assignments_past_due": 1,
+                "x": 1,
+            },
+        )
+        record = self._create(303, date(2024, 9, 29))
+        self.assertEqual(self.dashboards.payload(2, self.TODAY)["assignments_due"], 1)
+        self.assertEqual(self.versions.current("dashboard").version, 1)
+
+        moved = self.store.update(record["id"], {**mock_data.thaw(record), "section_id": 302})
+        self.assertEqual(self.dashboards.payload(2, self.TODAY)["assignments"], 0)
+        self.assertEqual(self.dashboards.payload(1, self.TODAY)["assignments"], 3)
+        self.store.delete(moved["id"])
+        self.store.delete(1)
+        self.assertEqual(self.dashboards.payload(1, self.TODAY)["assignments_past_due"], 0)
+        self._create(999, date(2024, 9, 23))
+        self.assertEqual(self.versions.current("dashboard").version, 4)
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_endpoint_serves_each_teacher(self):
+        mock_data.reset_assignments()
+        self.addCleanup(mock_data.reset_assignments)
+        client = APIClient()
+        url = reverse("api:dashboard-stats")
+        mine = client.get(url)
+        self.assertEqual(mine.status_code, 200)
+        self.assertEqual((mine.json()["sections"], mine.json()["students"]), (2, 5))
+        other = client.get(url, {"teacher_id": 2})
+        self.assertEqual(other.json()["sections"], 1)
+        self.assertNotEqual(other["ETag"], mine["ETag"])
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=mine["ETag"]).status_code, 304)
+
+        mock_data.ASSIGNMENT_STORE.create(
+            {"section_id": 302, "title": "New", "points_possible": 5, "due_date": None}
+        )
+        refreshed = client.get(url, HTTP_IF_NONE_MATCH=mine["ETag"])
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertEqual(refreshed.json()["assignments"], mine.json()["assignments"] + 1)
+        self.assertEqual(client.get(url, {"teacher_id": 99}).status_code, 404)
+        self.assertEqual(client.get(url, {"teacher_id": "abc"}).status_code, 400)
+
+
+class StudentSearchIndexTests(SimpleTestCase):
+    """Prefix search must fold case and accents and follow roster changes."""
+
+    def setUp(self):
+        super().setUp()
+        self.index = StudentSearchIndex(
+            {
+                1: {
+                    "students": [
+                        {"id": 1, "first_name": "José", "last_name": "Núñez"},
+                        {"id": 2, "first_name": "Josephine", "last_name": "Baker"},
+                        {"id": 3, "first_name": "Ana", "last_name": "de la Cruz"},
+                    ]
+                },
+                2: {"students": [{"id": 1, "first_name": "José", "last_name": "Núñez"}]},
+            }
+        )
+
+    def _ids(self, query, limit=10, sections=None):
+        results, _truncated = self.index.search(query, limit, sections)
+        return [student["id"] for student in results]
+
+    def test_matching_ignores_case_and_accents(self):
+        self.assertEqual(self._ids("jos"), [1, 2])
+        self.assertEqual(self._ids("NUÑ"), [1])
+        self.assertEqual(self._ids("cruz"), [3])
+        self.assertEqual(self._ids("jo ba"), [2])
+        self.assertEqual(self._ids("  "), [])
+        results, _ = self.index.search("nunez", 10)
+        self.assertEqual(results[0]["section_ids"], [1, 2])
+
+    def test_results_are_capped_and_scoped(self):
+        results, truncated = self.index.search("jo", 1)
+        self.assertEqual(([student["id"] for student in results], truncated), ([1], True))
+        results, _ = self.index.search("jose", 10, {2})
+        self.assertEqual(
+            [(student["id"], student["section_ids"]) for student in results], [(1, [2])]
+        )
+        self.assertEqual(self._ids("baker", sections={2}), [])
+
+    def test_roster_changes_update_the_index(self):
+        self.index.update_roster(
+            1,
+            {
+                "students": [
+                    {"id": 2, "first_name": "Jo", "last_name": "Baker-Smith"},
+                    {"id": 4, "first_name": "Zoë", "last_name": "Ito"},
+                ]
+            },
+        )
+        self.assertEqual(self._ids("smi"), [2])
+        self.assertEqual(self._ids("zoe"), [4])
+        self.assertEqual(self._ids("ana"), [])
+        self.assertEqual(self._ids("jose"), [1])
+        self.assertEqual(self._ids("jo", sections={1}), [2])
+        self.assertEqual(self._ids("jo", sections={1, 2, 9}), [2, 1])
+        self.index.update_roster(
+            2,
+            {
+                "students": [
+                    {"id": 1, "first_name": "Josefa", "last_name": "Núñez"},
+                    {"id": 2, "first_name": "Jo", "last_name": "Baker-Smith"},
+                ]
+            },
+        )
+        self.assertEqual(self._ids("josef", sections={1, 2}), [1])
+        self.assertEqual(self._ids("jo", sections={1, 2}, limit=1), [2])
+        self.assertEqual(self._ids("ba", sections={1}), [2])
+        self.index.update_roster(2, None)
+        self.assertEqual(self._ids("jose"), [])
+        self.assertEqual(self._ids("jose", sections={2}), [])
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_search_endpoint(self):
+        client = APIClient()
+        url = reverse("api:student-search")
+        response = client.get(url, {"q": "pri"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "query": "pri",
+                "results": [
+                    {"id": 503, "first_name": "Priya", "last_name": "Singh", "section_ids": [301]}
+                ],
+                "truncated": False,
+            },
+        )
+        # Section 303 belongs to teacher 2.
+        self.assertEqual(client.get(url, {"q": "noah"}).json()["results"], [])
+        self.assertEqual(len(client.get(url, {"q": "noah", "teacher_id": 2}).json()["results"]), 1)
+        self.assertEqual(client.get(url, {"q": "a", "limit": 0}).status_code, 400)
+        self.assertEqual(client.get(url).status_code, 400)
+        self.assertEqual(client.get(url, {"q": "a", "teacher_id": 99}).status_code, 404)
+
+
+class StudentTableTests(SimpleTestCase):
+    """Compact student records must serialize to the existing roster contract."""
+
+    def setUp(self):
+        super().setUp()
+        self.students = mock_data.StudentTable(
+            [
+                mock_data.StudentRecord(1, "Ana", "Diaz"),
+                mock_data.StudentRecord(2, "Ben", "Diaz"),
+            ]
+        )
+        self.rosters = mock_data.RosterFixtures(self.students, {10: [2, 1], 11: [1]})
+
+    def test_rosters_serialize_to_the_dict_contract(self):
+        self.assertEqual(
+            self.rosters[10],
+            {
+                "section_id": 10,
+                "students": [
+                    {"id": 2, "first_name": "Ben", "last_name": "Diaz"},
+                    {"id": 1, "first_name": "Ana", "last_name": "Diaz"},
+                ],
+            },
+        )
+        self.assertEqual(sorted(self.rosters), [10, 11])
+        self.assertIn(11, self.rosters)
+        self.assertIsNone(self.rosters.get(12))
+
+    def test_students_are_stored_once_and_share_strings(self):
+        first, second = self.rosters[10]["students"][1], self.rosters[11]["students"][0]
+        self.assertIs(first["last_name"], second["last_name"])
+        self.assertIs(self.students[2].last_name, self.students[1].last_name)
+        self.assertIs(self.students.name(1), self.students.name(1))
+
+    def test_replace_rejects_unknown_students(self):
+        self.rosters.replace(11, [1, 2])
+        self.assertEqual(list(self.rosters.student_ids(11)), [1, 2])
+        with self.assertRaises(KeyError):
+            self.rosters.replace(11, [3])
+        self.assertEqual(list(self.rosters.student_ids(11)), [1, 2])
+
+    def test_replace_bumps_the_version_and_notifies_listeners(self):
+        versions = mock_data.DatasetVersions()
+        rosters = mock_data.RosterFixtures(self.students, {10: [2, 1]}, versions)
+        self.assertEqual(versions.current("roster:10").version, 0)
+        changes = []
+        rosters.subscribe(lambda *change: changes.append(change))
+        rosters.replace(10, [1])
+        rosters.replace(12, [2])
+        self.assertEqual(versions.current("roster:10").version, 1)
+        self.assertEqual(versions.current("roster:12").version, 1)
+        (section_id, before, after), (new_id, new_before, _new_after) = changes
+        self.assertEqual(section_id, 10)
+        self.assertEqual([student["id"] for student in before["students"]], [2, 1])
+        self.assertEqual([student["id"] for student in after["students"]], [1])
+        self.assertEqual((new_id, new_before), (12, None))
+
+    @override_settings(ENABLE_MOCK_DATA=True)
+    def test_replacing_a_mock_roster_refreshes_search_and_dashboards(self):
+        original = list(mock_data.SECTION_ROSTERS.student_ids(301))
+        self.addCleanup(mock_data.SECTION_ROSTERS.replace, 301, original)
+        client = APIClient()
+        roster_url = reverse("api:section-roster", kwargs={"section_id": 301})
+        search_url = reverse("api:student-search")
+        roster = client.get(roster_url)
+        dashboard = client.get(reverse("api:dashboard-stats"))
+        self.assertEqual(len(client.get(search_url, {"q": "pri"}).json()["results"]), 1)
+
+        mock_data.SECTION_ROSTERS.replace(301, [501, 502])
+        refreshed = client.get(roster_url, HTTP_IF_NONE_MATCH=roster["ETag"])
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertEqual([student["id"] for student in refreshed.json()["students"]], [501, 502])
+        self.assertEqual(client.get(search_url, {"q": "pri"}).json()["results"], [])
+        students = client.get(
+            reverse("api:dashboard-stats"), HTTP_IF_NONE_MATCH=dashboard["ETag"]
+        ).json()["students"]
+        self.assertEqual(students, dashboard.json()["students"] - 1)
+
+    def test_mock_gradebook_names_come_from_the_student_table(self):
+        rows = mock_data.SECTION_GRADEBOOKS[301]["students"]
+        self.assertEqual(
+            [row["name"] for row in rows], ["Alice Nguyen", "Miguel Lopez", "Priya Singh"]
+        )
+        self.assertIs(rows[0]["name"], mock_data.STUDENTS.name(501))
+
+
+class RenderedResponseCacheTests(SimpleTestCase):
+    """Validate reuse and invalidation of pre-rendered payloads."""
+
+    def test_body_is_reused_until_version_changes(self):
+        cache = RenderedResponseCache()
+        versions = mock_data.DatasetVersions()
+        payload = {"sections": 3}
+        calls = []
+
+        def build():
+            calls.append(1)
+            return payload
+
+        first = cache.get(versions.current("dashboard"), build)
+        self.assertIs(cache.get(versions.current("dashboard"), build), first)
+        self.assertEqual(len(calls), 1)
+
+        response = first.to_response()
+        self.assertEqual(response.content, b'{"sections":3}')
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(response["ETag"], versions.current("dashboard").etag)
+
+        payload["sections"] = 4
+        versions.bump("dashboard")
+        refreshed = cache.get(versions.current("dashboard"), build)
+        self.assertEqual(refreshed.body, b'{"sections":4}')
+        self.assertEqual(len(calls), 2)
+
+        cache.invalidate("dashboard")
+        cache.get(versions.current("dashboard"), build)
+        self.assertEqual(len(calls), 3)
+
+    def test_slot_keeps_one_entry_as_the_stamp_key_rolls_over(self):
+        cache = RenderedResponseCache()
+        stamp = mock_data.DatasetVersions().current("dashboard")
+        days = [stamp._replace(key=f"dashboard.1.2024-09-{day}") for day in (20, 21, 22)]
+        bodies = [cache.get(day, lambda: {"day": day.key}, slot="dashboard.1") for day in days]
+        self.assertEqual(len(cache), 1)
+        self.assertEqual([body.etag for body in bodies], [day.etag for day in days])
+        self.assertIs(cache.get(days[-1], dict, slot="dashboard.1"), bodies[-1])
+        self.assertEqual(cache.get(days[0], dict, slot="dashboard.1").body, b"{}")
+
+
+class CompiledAssignmentValidatorParityTests(SimpleTestCase):
+    """The compiled validator must agree with AssignmentSerializer."""
+
+    valid = {
+        "course_id": 101,
+        "section_id": 301,
+        "title": "Quiz: Linear Functions",
+        "description": "Assess understanding of slope-intercept form.",
+        "due_date": "2024-09-20",
+        "points_possible": 20,
+        "category": "Quiz",
+    }
+
+    variants = [
+        {},
+        {"id": 99},
+        {"extra": "ignored"},
+        {"course_id": "101"},
+        {"course_id": "101.0"},
+        {"course_id": " 101"},
+        {"course_id": 101.0},
+        {"course_id": 101.5},
+        {"course_id": True},
+        {"course_id": None},
+        {"course_id": "abc"},
+        {"points_possible": 0},
+        {"points_possible": -1},
+        {"points_possible": "-1"},
+        {"title": "  padded  "},
+        {"title": ""},
+        {"title": "   "},
+        {"title": "x" * 255},
+        {"title": "x" * 256},
+        {"title": " " + "x" * 255 + " "},
+        {"title": 42},
+        {"title": ["list"]},
+        {"title": "nul\x00char"},
+        {"title": "surrogate\ud800"},
+        {"description": ""},
+        {"description": "   "},
+        {"due_date": "2024-02-30"},
+        {"due_date": "2024-9-5"},
+        {"due_date": "20240920"},
+        {"due_date": "2024-09-20T10:00:00"},
+        {"due_date": 20240920},
+        {"due_date": None},
+        {"due_date": ""},
+        {"points_possible": None},
+        {"category": "c" * 129},
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.compiled = compile_serializer(AssignmentSerializer)
+        self.assertIsNotNone(self.compiled)
+
+    def _assert_parity(self, data, partial):
+        serializer = AssignmentSerializer(data=data, partial=partial)
+        drf_valid = serializer.is_valid()
+        fast = self.compiled(data, partial=partial)
+        if fast is None:
+            return
+        self.assertTrue(drf_valid, f"fast path accepted invalid data {data!r}")
+        self.assertEqual(dict(serializer.validated_data), fast)
+        self.assertEqual(list(serializer.validated_data), list(fast))
+
+    def test_full_payload_parity(self):
+        for variant in self.variants:
+            with self.subTest(variant=variant):
+                self._assert_parity({**self.valid, **variant}, partial=False)
+
+    def test_partial_payload_parity(self):
+        for variant in self.variants:
+            with self.subTest(variant=variant):
+                self._assert_parity(variant, partial=True)
+
+    def test_missing_fields_and_non_dicts_fall_back(self):
+        incomplete = {key: value for key, value in self.valid.items() if key != "title"}
+        self.assertIsNone(self.compiled(incomplete))
+        self.assertEqual(self.compiled(incomplete, partial=True)["course_id"], 101)
+        self.assertIsNone(self.compiled([self.valid]))
+        self.assertIsNone(self.compiled(None))
+
+    def test_well_formed_payload_uses_fast_path(self):
+        self.assertEqual(
+            self.compiled(self.valid),
+            {**self.valid, "due_date": date(2024, 9, 20)},
+        )
+
+    def test_serializers_with_hooks_are_not_compiled(self):
+        class HookedSerializer(AssignmentSerializer):
+            def validate_title(self, value):
+                return value
+
+        self.assertIsNone(compile_serializer(HookedSerializer))
@@ -8,9 +8,16 @@ from .views import (
     AssignmentsViewSet,
     CoursesView,
     DashboardStatsView,
+    GradebookExportView,
     MeView,
+    ReportJobView,
+    SectionGradebookExportView,
     SectionGradebookView,
+    SectionGradeView,
+    SectionReportCardsView,
     SectionRosterView,
+    SectionStatsView,
+    StudentSearchView,
 )
 
 app_name = "api"
@@ -32,6 +39,29 @@ urlpatterns = [
         SectionGradebookView.as_view(),
         name="section-gradebook",
     ),
+    path(
+        "sections/<int:section_id>/gradebook/export",
+        SectionGradebookExportView.as_view(),
+        name="section-gradebook-export",
+    ),
+    path("gradebooks/export", GradebookExportView.as_view(), name="gradebook-export"),
+    path(
+        "sections/<int:section_id>/grades",
+        SectionGradeView.as_view(),
+        name="section-grades",
+    ),
+    path(
+        "sections/<int:section_id>/stats",
+        SectionStatsView.as_view(),
+        name="section-stats",
+    ),
+    path(
+        "sections/<int:section_id>/report-cards",
+        SectionReportCardsView.as_view(),
+        name="section-report-cards",
+    ),
+    path("reports/jobs/<str:job_id>", ReportJobView.as_view(), name="report-job"),
+    path("students/search", StudentSearchView.as_view(), name="student-search"),
 ]
 
 urlpatterns += router.urls
@@ -1,14 +1,44 @@
 """API views for the SchoolOS backend."""
 from __future__ import annotations
 
+from datetime import date
+from typing import Any, Callable, Iterable, Mapping
+
 from django.conf import settings
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
 from . import mock_data
-from .serializers import AssignmentSerializer
+from .dashboard import DASHBOARDS
+from .fast_validation import compile_serializer, validate_with_fallback
+from .gradebook import GRADEBOOKS, LiveGradebook
+from .gradebook_export import CONTENT_TYPES, FILE_EXTENSIONS, export_stream
+from .grading import GradingPolicy, compile_policy
+from .pagination import AssignmentKeysetPagination
+from .renderers import FirstRendererNegotiation, NDJSONRenderer, ndjson_line
+from .report_cards import REPORT_CARD_JOBS, report_cards
+from .response_cache import RENDERED_RESPONSES
+from .serializers import (
+    AssignmentBulkOperationSerializer,
+    AssignmentFilterSerializer,
+    AssignmentSerializer,
+    DashboardQuerySerializer,
+    GradebookExportQuerySerializer,
+    GradeEntrySerializer,
+    ReportCardRequestSerializer,
+    StudentGradeSerializer,
+    StudentSearchQuerySerializer,
+)
+from .student_search import STUDENT_INDEX
 
 
 def _mock_enabled() -> bool:
@@ -22,61 +52,385 @@ def _mock_disabled_response() -> Response:
     )
 
 
+def _conditional(
+    resolve: Callable[..., mock_data.DatasetVersion | None],
+    variant: Callable[..., str | None] | None = None,
+):
+    """Answer conditional GETs from a dataset version stamp.
+
+    ``resolve`` receives the view's URL kwargs and returns the stamp of the
+    data backing the response, or ``None`` when there is nothing to validate
+    against. Matching ``If-None-Match`` requests get a 304 before the handler
+    runs, so nothing is serialized. Views serving more than one
+    representation pass ``variant``, which maps the request to a suffix that
+    keeps each representation's ETag distinct.
+
+    Only ETags are used: ``Last-Modified`` has one-second resolution, so two
+    writes within a second would validate a stale ``If-Modified-Since``.
+    """
+
+    def _stamp(request, kwargs) -> mock_data.DatasetVersion | None:
+        if not _mock_enabled():
+            return None
+        stamp = resolve(**kwargs)
+        suffix = variant(request) if stamp is not None and variant is not None else None
+        return stamp._replace(key=f"{stamp.key}.{suffix}") if suffix else stamp
+
+    def _etag(request, *args, **kwargs) -> str | None:
+        stamp = _stamp(request, kwargs)
+        return stamp.etag if stamp is not None else None
+
+    return method_decorator(condition(etag_func=_etag))
+
+
+def _dataset_version(key: str):
+    return lambda: mock_data.DATASET_VERSIONS.current(key)
+
+
+def _section_version(prefix: str, fixtures: Mapping[int, Any]):
+    def _resolve(section_id: int) -> mock_data.DatasetVersion | None:
+        if section_id not in fixtures:
+            return None
+        return mock_data.DATASET_VERSIONS.current(f"{prefix}:{section_id}")
+
+    return _resolve
+
+
 class MeView(APIView):
     """Return the authenticated user's profile."""
 
+    @_conditional(_dataset_version("me"))
     def get(self, _request):
         if not _mock_enabled():
             return _mock_disabled_response()
-        return Response(mock_data.ME_PAYLOAD)
+        return RENDERED_RESPONSES.respond(
+            mock_data.DATASET_VERSIONS.current("me"), lambda: mock_data.ME_PAYLOAD
+        )
+
+
+def _dashboard_version() -> mock_data.DatasetVersion:
+    return mock_data.DATASET_VERSIONS.current("dashboard")
+
+
+def _dashboard_variant(request) -> str:
+    # Due-date counters roll over at midnight without a data change.
+    teacher_id = request.GET.get("teacher_id", mock_data.ME_PAYLOAD["id"])
+    return f"{teacher_id}.{date.today().isoformat()}"
 
 
 class DashboardStatsView(APIView):
-    """Return aggregated dashboard statistics for the teacher."""
+    """Return aggregated dashboard statistics for a teacher (default: the current user).
 
-    def get(self, _request):
+    Counters come from the materialized :data:`~api.dashboard.DASHBOARDS`
+    aggregates, so a request does no scanning.
+    """
+
+    @_conditional(_dashboard_version, _dashboard_variant)
+    def get(self, request):
         if not _mock_enabled():
             return _mock_disabled_response()
-        return Response(mock_data.DASHBOARD_STATS)
+        query = DashboardQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        teacher_id = query.validated_data.get("teacher_id", mock_data.ME_PAYLOAD["id"])
+        if teacher_id not in DASHBOARDS:
+            raise Http404("Teacher not found")
+        today = date.today()
+        # Same key as the ``_conditional`` variant, so ETags agree; one cache
+        # slot per teacher, so yesterday's body is replaced, not kept.
+        stamp = _dashboard_version()._replace(key=f"dashboard.{teacher_id}.{today.isoformat()}")
+        return RENDERED_RESPONSES.respond(
+            stamp, lambda: DASHBOARDS.payload(teacher_id, today), slot=f"dashboard.{teacher_id}"
+        )
 
 
 class CoursesView(APIView):
     """Return the course catalog for the current user."""
 
+    @_conditional(_dataset_version("courses"))
     def get(self, _request):
         if not _mock_enabled():
             return _mock_disabled_response()
-        return Response(mock_data.COURSES)
+        return RENDERED_RESPONSES.respond(
+            mock_data.DATASET_VERSIONS.current("courses"), lambda: mock_data.COURSES
+        )
 
 
 class SectionRosterView(APIView):
     """Return roster details for the requested section."""
 
+    @_conditional(_section_version("roster", mock_data.SECTION_ROSTERS))
     def get(self, _request, section_id: int):
         if not _mock_enabled():
             return _mock_disabled_response()
-        roster = mock_data.SECTION_ROSTERS.get(section_id)
-        if not roster:
+        if section_id not in mock_data.SECTION_ROSTERS:
             raise Http404("Section not found")
-        return Response(roster)
+        return RENDERED_RESPONSES.respond(
+            mock_data.DATASET_VERSIONS.current(f"roster:{section_id}"),
+            lambda: mock_data.SECTION_ROSTERS[section_id],
+        )
+
+
+class StudentSearchView(APIView):
+    """Find students by name prefix across a teacher's sections (default: the current user).
+
+    Matching ignores case and accents; every word of ``q`` must start a word
+    of the student's first or last name. ``truncated`` is true when more than
+    ``limit`` students matched.
+    """
+
+    def get(self, request):
+        if not _mock_enabled():
+            return _mock_disabled_response()
+        query = StudentSearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        teacher_id = params.get("teacher_id", mock_data.ME_PAYLOAD["id"])
+        if teacher_id not in DASHBOARDS:
+            raise Http404("Teacher not found")
+        sections = {
+            section_id
+            for section_id, owner in mock_data.SECTION_TEACHERS.items()
+            if owner == teacher_id
+        }
+        results, truncated = STUDENT_INDEX.search(params["q"], params["limit"], sections)
+        return Response({"query": params["q"], "results": results, "truncated": truncated})
+
+
+def _streaming_format(request) -> str | None:
+    renderer = getattr(request, "accepted_renderer", None)
+    return NDJSONRenderer.format if isinstance(renderer, NDJSONRenderer) else None
 
 
 class SectionGradebookView(APIView):
-    """Return gradebook details for the requested section."""
+    """Return gradebook details, with computed totals, for the requested section.
+
+    ``?format=ndjson`` or ``Accept: application/x-ndjson`` streams a header
+    line followed by one line per student instead of a single JSON document.
+    """
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+
+    @_conditional(
+        _section_version("gradebook", mock_data.SECTION_GRADEBOOKS), _streaming_format
+    )
+    def get(self, request, section_id: int):
+        if not _mock_enabled():
+            return _mock_disabled_response()
+        gradebook = GRADEBOOKS.get(section_id)
+        if gradebook is None:
+            raise Http404("Section not found")
+        if _streaming_format(request):
+            response = StreamingHttpResponse(
+                gradebook.stream(ndjson_line), content_type=NDJSONRenderer.media_type
+            )
+        else:
+            response = RENDERED_RESPONSES.respond(
+                mock_data.DATASET_VERSIONS.current(f"gradebook:{section_id}"),
+                gradebook.payload,
+            )
+        patch_vary_headers(response, ["Accept"])
+        return response
+
+
+def _grading_policy(section_id: int) -> GradingPolicy:
+    data = mock_data.SECTION_GRADING_POLICIES.get(section_id, mock_data.GRADING_POLICY)
+    return GradingPolicy.from_dict(data)
+
+
+def _gradebook_derived_version(prefix: str):
+    """Stamp for data computed from a section's gradebook alone, under its own key."""
+
+    def _resolve(section_id: int, **_kwargs) -> mock_data.DatasetVersion | None:
+        if section_id not in mock_data.SECTION_GRADEBOOKS:
+            return None
+        stamp = mock_data.DATASET_VERSIONS.current(f"gradebook:{section_id}")
+        return stamp._replace(key=f"{prefix}:{section_id}")
 
+    return _resolve
+
+
+# Policies are static fixtures, so grades change exactly when the gradebook does.
+_grades_version = _gradebook_derived_version("grades")
+_stats_version = _gradebook_derived_version("stats")
+_export_version = _gradebook_derived_version("export")
+
+
+class SectionGradeView(APIView):
+    """Policy-evaluated grades for a section, and single-grade writes."""
+
+    @_conditional(_grades_version)
+    def get(self, _request, section_id: int):
+        if not _mock_enabled():
+            return _mock_disabled_response()
+        gradebook = GRADEBOOKS.get(section_id)
+        if gradebook is None:
+            raise Http404("Section not found")
+        stamp = _grades_version(section_id)
+        plan = compile_policy(_grading_policy(section_id))
+
+        def build():
+            results = gradebook.read(plan.evaluate)
+            return {
+                "section_id": section_id,
+                "students": StudentGradeSerializer(results, many=True).data,
+            }
+
+        return RENDERED_RESPONSES.respond(stamp, build)
+
+    def put(self, request, section_id: int):
+        if not _mock_enabled():
+            return _mock_disabled_response()
+        serializer = GradeEntrySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        entry = serializer.validated_data
+        score = entry["score"]
+        if score is not None and score.is_integer():
+            score = int(score)
+        try:
+            GRADEBOOKS.set_grade(
+                section_id,
+                entry["student_id"],
+                entry["assignment_id"],
+                score,
+                exempt=entry["exempt"],
+            )
+        except KeyError:
+            raise Http404("Section, student or assignment not found")
+        return Response({**entry, "score": score})
+
+
+class SectionStatsView(APIView):
+    """Per-assignment and per-student score statistics for a section."""
+
+    @_conditional(_stats_version)
     def get(self, _request, section_id: int):
         if not _mock_enabled():
             return _mock_disabled_response()
-        gradebook = mock_data.SECTION_GRADEBOOKS.get(section_id)
-        if not gradebook:
+        gradebook = GRADEBOOKS.get(section_id)
+        if gradebook is None:
+            raise Http404("Section not found")
+        return RENDERED_RESPONSES.respond(_stats_version(section_id), gradebook.section_stats)
+
+
+def _export_format(request) -> str:
+    return request.GET.get("format", "csv")
+
+
+def _export_response(request, gradebooks: Iterable[LiveGradebook], filename: str):
+    query = GradebookExportQuerySerializer(data=request.query_params)
+    query.is_valid(raise_exception=True)
+    fmt = query.validated_data["format"]
+    try:
+        body = export_stream(gradebooks, fmt)
+    except RuntimeError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+    response = StreamingHttpResponse(body, content_type=CONTENT_TYPES[fmt])
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{FILE_EXTENSIONS[fmt]}"'
+    )
+    return response
+
+
+class SectionGradebookExportView(APIView):
+    """Stream a section's grade cells, one row each, for spreadsheets and SIS imports.
+
+    ``?format=`` is ``csv`` (the default), ``arrow`` (an Arrow IPC stream) or
+    ``parquet``; the latter two answer 501 unless ``pyarrow`` is installed.
+    """
+
+    content_negotiation_class = FirstRendererNegotiation
+
+    @_conditional(_export_version, _export_format)
+    def get(self, request, section_id: int):
+        if not _mock_enabled():
+            return _mock_disabled_response()
+        gradebook = GRADEBOOKS.get(section_id)
+        if gradebook is None:
             raise Http404("Section not found")
-        return Response(gradebook)
+        return _export_response(request, [gradebook], f"gradebook-{section_id}")
+
+
+class GradebookExportView(APIView):
+    """Stream every section's grade cells as one district-wide export.
+
+    Takes the same ``?format=`` as the per-section export. Sections are
+    loaded one after another as the response is consumed.
+    """
+
+    content_negotiation_class = FirstRendererNegotiation
+
+    def get(self, request):
+        if not _mock_enabled():
+            return _mock_disabled_response()
+        gradebooks = (
+            gradebook
+            for gradebook in map(GRADEBOOKS.get, sorted(mock_data.SECTION_GRADEBOOKS))
+            if gradebook is not None
+        )
+        return _export_response(request, gradebooks, "gradebooks")
+
+
+def _section_course(section_id: int) -> dict | None:
+    return next(
+        (
+            course
+            for course in mock_data.COURSES
+            if any(section["id"] == section_id for section in course["sections"])
+        ),
+        None,
+    )
+
+
+class SectionReportCardsView(APIView):
+    """Start rendering report cards for every student in a section.
+
+    Rendering runs in a process pool; the 202 response carries the job and a
+    ``Location`` to poll. ``html`` is the default; ``pdf`` is optional and
+    answers 501 unless WeasyPrint is installed.
+    """
+
+    def post(self, request, section_id: int):
+        if not _mock_enabled():
+            return _mock_disabled_response()
+        serializer = ReportCardRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        gradebook = GRADEBOOKS.get(section_id)
+        if gradebook is None:
+            raise Http404("Section not found")
+        plan = compile_policy(_grading_policy(section_id))
+        course = _section_course(section_id)
+        cards = gradebook.read(lambda data: report_cards(data, plan, course))
+        try:
+            job = REPORT_CARD_JOBS.submit(section_id, cards, serializer.validated_data["format"])
+        except RuntimeError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        return Response(
+            REPORT_CARD_JOBS.get(job.id),
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": reverse("api:report-job", kwargs={"job_id": job.id})},
+        )
+
+
+class ReportJobView(APIView):
+    """Progress of a report card job."""
+
+    def get(self, _request, job_id: str):
+        if not _mock_enabled():
+            return _mock_disabled_response()
+        job = REPORT_CARD_JOBS.get(job_id)
+        if job is None:
+            raise Http404("Job not found")
+        return Response(job)
+
+
+_ASSIGNMENT_VALIDATOR = compile_serializer(AssignmentSerializer)
 
 
 class AssignmentsViewSet(viewsets.ViewSet):
     """CRUD operations for assignments using the mock fixture store."""
 
     serializer_class = AssignmentSerializer
+    pagination_class = AssignmentKeysetPagination
 
     @staticmethod
     def _resolve_pk(pk: str | None) -> int | None:
@@ -85,6 +439,17 @@ class AssignmentsViewSet(viewsets.ViewSet):
         except (TypeError, ValueError):  # pragma: no cover - defensive
             raise Http404("Assignment not found")
 
+    def _validate(self, data, *, partial: bool = False):
+        """Validate an assignment payload, preferring the compiled fast path."""
+        compiled = (
+            _ASSIGNMENT_VALIDATOR
+            if getattr(settings, "ASSIGNMENTS_FAST_VALIDATION", True)
+            else None
+        )
+        return validate_with_fallback(
+            self.serializer_class, compiled, data, partial=partial
+        )
+
     def _get_assignment(self, pk: str | None):
         assignment_id = self._resolve_pk(pk)
         if assignment_id is None:
@@ -94,10 +459,22 @@ class AssignmentsViewSet(viewsets.ViewSet):
             raise Http404("Assignment not found")
         return assignment
 
-    def list(self, _request):
+    @_conditional(lambda: mock_data.ASSIGNMENT_STORE.dataset_version)
+    def list(self, request):
         if not _mock_enabled():
             return _mock_disabled_response()
-        assignments = mock_data.ASSIGNMENT_STORE.all()
+        filters = AssignmentFilterSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+        criteria = dict(filters.validated_data)
+        ordering = criteria.pop("ordering")
+        paginator = self.pagination_class()
+        if paginator.is_requested(request):
+            page = paginator.paginate_store(
+                mock_data.ASSIGNMENT_STORE, request, ordering, criteria
+            )
+            serializer = self.serializer_class(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+        assignments = mock_data.ASSIGNMENT_STORE.page(ordering=ordering, **criteria)
         serializer = self.serializer_class(assignments, many=True)
         return Response(serializer.data)
 
@@ -111,18 +488,18 @@ class AssignmentsViewSet(viewsets.ViewSet):
     def create(self, request):
         if not _mock_enabled():
             return _mock_disabled_response()
-        serializer = self.serializer_class(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        created = mock_data.ASSIGNMENT_STORE.create(serializer.validated_data)
+        validated = self._validate(request.data)
+        created = mock_data.ASSIGNMENT_STORE.create(validated)
         return Response(created, status=status.HTTP_201_CREATED)
 
     def update(self, request, pk: str | None = None):
         if not _mock_enabled():
             return _mock_disabled_response()
         existing = self._get_assignment(pk)
-        serializer = self.serializer_class(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        updated = mock_data.ASSIGNMENT_STORE.update(existing["id"], serializer.validated_data)
+        validated = self._validate(request.data)
+        updated = mock_data.ASSIGNMENT_STORE.update(existing["id"], validated)
+        if updated is None:
+            raise Http404("Assignment not found")
         return Response(updated)
 
     def destroy(self, _request, pk: str | None = None):
@@ -140,10 +517,58 @@ class AssignmentsViewSet(viewsets.ViewSet):
         if not _mock_enabled():
             return _mock_disabled_response()
         existing = self._get_assignment(pk)
-        serializer = self.serializer_class(
-            data=request.data, partial=True
+        validated = self._validate(request.data, partial=True)
+        while True:
+            merged_payload = {**existing, **validated}
+            try:
+                updated = mock_data.ASSIGNMENT_STORE.update(
+                    existing["id"], merged_payload, expected=existing
+                )
+            except mock_data.StaleAssignmentError:
+                # Another writer replaced the record; merge onto the new one.
+                existing = self._get_assignment(pk)
+                continue
+            if updated is None:
+                raise Http404("Assignment not found")
+            return Response(updated)
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """Apply a list of create/update/delete operations atomically."""
+        if not _mock_enabled():
+            return _mock_disabled_response()
+        serializer = AssignmentBulkOperationSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=getattr(settings, "ASSIGNMENTS_BULK_MAX_OPERATIONS", 500),
         )
-        serializer.is_valid(raise_exception=True)
-        merged_payload = {**existing, **serializer.validated_data}
-        updated = mock_data.ASSIGNMENT_STORE.update(existing["id"], merged_payload)
-        return Response(updated)
+        if not serializer.is_valid():
+            errors = serializer.errors
+            if isinstance(errors, dict) and all(isinstance(key, int) for key in errors):
+                # Newer DRF releases key list errors by index; keep them aligned
+                # with the submitted operations like older releases do.
+                errors = [errors.get(index, {}) for index in range(len(request.data))]
+            raise ValidationError(errors)
+        operations = serializer.validated_data
+        try:
+            written = mock_data.ASSIGNMENT_STORE.apply(operations)
+        except mock_data.BulkOperationError as exc:
+            errors = [{} for _ in operations]
+            errors[exc.index] = {"id": ["Assignment not found."]}
+            raise ValidationError(errors)
+
+        results = []
+        for operation, record in zip(operations, written):
+            if operation["op"] == "delete":
+                results.append(
+                    {"status": status.HTTP_204_NO_CONTENT, "id": operation["id"]}
+                )
+            else:
+                code = (
+                    status.HTTP_201_CREATED
+                    if operation["op"] == "create"
+                    else status.HTTP_200_OK
+                )
+                results.append({"status": code, "data": record})
+        return Response(results)
@@ -0,0 +1,4 @@
+"""Micro-benchmarks for SchoolOS backend hot paths.
+
+Run from the ``backend`` directory, e.g. ``python -m benchmarks.assignment_store``.
+"""
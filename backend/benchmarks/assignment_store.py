@@ -0,0 +1,53 @@
+"""Benchmark list/retrieve throughput of the mock assignment store."""
+from __future__ import annotations
+
+import argparse
+import timeit
+from copy import deepcopy
+
+from api.mock_data import MockAssignmentStore
+
+
+def _populate(store: MockAssignmentStore, count: int) -> None:
+    for index in range(count):
+        store.create(
+            {
+                "course_id": 100 + index % 40,
+                "section_id": 300 + index % 120,
+                "title": f"Assignment {index}",
+                "description": "Generated benchmark assignment.",
+                "due_date": f"2024-{index % 12 + 1:02d}-{index % 28 + 1:02d}",
+                "points_possible": 10 + index % 90,
+                "category": ("Quiz", "Homework", "Project")[index % 3],
+            }
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    store = MockAssignmentStore()
+    _populate(store, args.count)
+    ids = [record["id"] for record in store.all()]
+
+    cases = {
+        "list (deepcopy per item)": lambda: [deepcopy(dict(item)) for item in store.all()],
+        "list (shared snapshot)": store.all,
+        "retrieve x all (deepcopy)": lambda: [deepcopy(dict(store.get(pk))) for pk in ids],
+        "retrieve x all (shared)": lambda: [store.get(pk) for pk in ids],
+        "section filter (scan)": lambda: [
+            item for item in store.all() if item["section_id"] == 301
+        ],
+        "section filter (index)": lambda: store.filter(section_id=301),
+    }
+    print(f"{len(ids)} assignments, best of {args.repeat} runs")
+    for label, func in cases.items():
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f"  {label:<28} {best * 1000:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Compare DRF serializer validation with the compiled fast path."""
+from __future__ import annotations
+
+import argparse
+import os
+import timeit
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from api.fast_validation import compile_serializer  # noqa: E402
+from api.serializers import AssignmentSerializer  # noqa: E402
+
+PAYLOAD = {
+    "course_id": 101,
+    "section_id": 301,
+    "title": "Project: Quadratic Models",
+    "description": "Group project exploring quadratic equations.",
+    "due_date": "2024-10-10",
+    "points_possible": 50,
+    "category": "Project",
+}
+
+
+def _drf(partial: bool = False):
+    serializer = AssignmentSerializer(data=PAYLOAD, partial=partial)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=5_000)
+    args = parser.parse_args()
+
+    compiled = compile_serializer(AssignmentSerializer)
+    cases = {
+        "DRF serializer": _drf,
+        "compiled validator": lambda: compiled(PAYLOAD),
+        "DRF serializer (partial)": lambda: _drf(partial=True),
+        "compiled validator (partial)": lambda: compiled(PAYLOAD, partial=True),
+    }
+    print(f"{args.number} validations per case, best of 5")
+    for label, func in cases.items():
+        best = min(timeit.repeat(func, number=args.number, repeat=5))
+        print(f"  {label:<30} {best / args.number * 1e6:8.2f} us/op")
+
+
+if __name__ == "__main__":
+    main()
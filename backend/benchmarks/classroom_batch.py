@@ -0,0 +1,103 @@
+"""Estimate submission sync time: one request per coursework vs batched requests.
+
+A fake Classroom API charges ``--latency`` ms per HTTP round trip and
+``--server`` ms of server time per listed page, whether the page is sent
+alone or inside a batch. That matches what batching saves in practice:
+round trips, not server work.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from integrations import google_classroom  # noqa: E402
+
+
+def _fake_service(latency: float, server: float):
+    class Request:
+        def __init__(self, params):
+            self.params = params
+
+        def page(self):
+            time.sleep(server)
+            prefix = self.params["courseWorkId"]
+            return {"studentSubmissions": [{"id": f"{prefix}-{n}"} for n in range(30)]}
+
+        def execute(self):
+            time.sleep(latency)
+            return self.page()
+
+    class Batch:
+        def __init__(self, callback):
+            self._callback = callback
+            self._requests = []
+
+        def add(self, request, request_id):
+            self._requests.append((request_id, request))
+
+        def execute(self):
+            time.sleep(latency)
+            for request_id, request in self._requests:
+                self._callback(request_id, request.page(), None)
+
+    class Submissions:
+        def list(self, **params):
+            return Request(params)
+
+    class CourseWork:
+        def studentSubmissions(self):
+            return Submissions()
+
+    class Courses:
+        def courseWork(self):
+            return CourseWork()
+
+    class Service:
+        def courses(self):
+            return Courses()
+
+        def new_batch_http_request(self, callback):
+            return Batch(callback)
+
+    return Service()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--courses", type=int, default=40)
+    parser.add_argument("--coursework", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=20.0, help="ms per round trip")
+    parser.add_argument("--server", type=float, default=0.5, help="ms of server time per page")
+    args = parser.parse_args()
+
+    fake = _fake_service(args.latency / 1000, args.server / 1000)
+    google_classroom._build_classroom_service = lambda credentials: fake
+    service = google_classroom.GoogleClassroomService(credentials=object())
+    pairs = [
+        (f"course-{course}", f"work-{course}-{work}")
+        for course in range(args.courses)
+        for work in range(args.coursework)
+    ]
+    print(f"{len(pairs)} coursework items, {args.latency:g} ms per round trip")
+
+    started = time.perf_counter()
+    for course_id, coursework_id in pairs:
+        service.get_student_submissions(course_id, coursework_id)
+    sequential = time.perf_counter() - started
+
+    started = time.perf_counter()
+    service.batch_get_student_submissions(pairs)
+    batched = time.perf_counter() - started
+
+    print(f"  one request each  {sequential * 1000:9.1f} ms")
+    print(f"  batched           {batched * 1000:9.1f} ms  ({sequential / batched:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Tune ClassroomSyncEngine pool sizes against a fake Classroom district.
+
+Every teacher gets its own fake Classroom API that charges ``--latency`` ms
+per HTTP round trip and ``--server`` ms of server time per listed page
+(pages in a batch share one round trip). Each teacher has ``--courses``
+courses of ``--coursework`` items with one submission per student. The
+sync runs once for every ``--workers`` x ``--per-teacher`` combination into
+a sink that only counts, so the numbers show fetch scheduling alone.
+
+Then a nightly incremental run is timed: after a full sync records
+watermarks, ``--changed`` percent of coursework items get a new
+``updateTime`` and a regraded submission, and the sync runs again with the
+watermarks.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from integrations import google_classroom  # noqa: E402
+from integrations.classroom_sync import ClassroomSyncEngine, SyncWatermarks  # noqa: E402
+
+_LAST_MONTH = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+
+
+class _District:
+    """Shared fake server state: coursework edits and a round-trip counter."""
+
+    def __init__(self) -> None:
+        self.changed: dict = {}
+        self.round_trips = 0
+        self._lock = threading.Lock()
+
+    def count(self) -> None:
+        with self._lock:
+            self.round_trips += 1
+
+
+def _fake_service(args, district: _District):
+    latency, server = args.latency / 1000, args.server / 1000
+    submissions = [
+        {"userId": f"student-{n}", "assignedGrade": n % 10, "updateTime": _LAST_MONTH}
+        for n in range(args.students)
+    ]
+
+    class Request:
+        def __init__(self, key, items):
+            self.key, self.items = key, items
+
+        def page(self):
+            return {self.key: self.items()}
+
+        def execute(self):
+            district.count()
+            time.sleep(latency + server)
+            return self.page()
+
+    class Batch:
+        def __init__(self, callback):
+            self._callback = callback
+            self._requests = []
+
+        def add(self, request, request_id):
+            self._requests.append((request_id, request))
+
+        def execute(self):
+            district.count()
+            time.sleep(latency + server * len(self._requests))
+            for request_id, request in self._requests:
+                self._callback(request_id, request.page(), None)
+
+    class Submissions:
+        def list(self, courseId, courseWorkId, **params):
+            changed = district.changed.get(courseWorkId)
+            if changed is None:
+                return Request("studentSubmissions", lambda: submissions)
+            regraded = [{**submissions[0], "assignedGrade": 10, "updateTime": changed}]
+            return Request("studentSubmissions", lambda: regraded + submissions[1:])
+
+    class CourseWork:
+        def list(self, courseId, orderBy=None, **params):
+            def items():
+                coursework = [
+                    {
+                        "id": f"{courseId}-{n}",
+                        "title": f"Work {n}",
+                        "maxPoints": 10,
+                        "updateTime": district.changed.get(f"{courseId}-{n}", _LAST_MONTH),
+                    }
+                    for n in range(args.coursework)
+                ]
+                if orderBy == "updateTime desc":
+                    coursework.sort(key=lambda item: item["updateTime"], reverse=True)
+                return coursework
+
+            return Request("courseWork", items)
+
+        def studentSubmissions(self):
+            return Submissions()
+
+    class Courses:
+        def list(self, teacherId, **params):
+            return Request(
+                "courses", lambda: [{"id": f"{teacherId}-{n}"} for n in range(args.courses)]
+            )
+
+        def courseWork(self):
+            return CourseWork()
+
+    class Service:
+        def courses(self):
+            return Courses()
+
+        def new_batch_http_request(self, callback):
+            return Batch(callback)
+
+    return Service()
+
+
+class _CountingSink:
+    def __init__(self) -> None:
+        self.grades = 0
+        self._lock = threading.Lock()
+
+    def coursework(self, teacher_id, course, items) -> None:
+        pass
+
+    def submissions(self, teacher_id, course, results) -> None:
+        with self._lock:
+            self.grades += sum(len(items) for items in results.values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teachers", type=int, default=500)
+    parser.add_argument("--courses", type=int, default=5)
+    parser.add_argument("--coursework", type=int, default=30)
+    parser.add_argument("--students", type=int, default=25)
+    parser.add_argument("--latency", type=float, default=20.0, help="ms per round trip")
+    parser.add_argument("--server", type=float, default=0.5, help="ms of server time per page")
+    parser.add_argument("--workers", type=int, nargs="+", default=[16, 64, 128])
+    parser.add_argument("--per-teacher", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--changed", type=float, default=1.0, help="%% of coursework edited")
+    args = parser.parse_args()
+
+    district = _District()
+    google_classroom._build_classroom_service = lambda credentials: _fake_service(args, district)
+    teachers = [f"teacher-{n}" for n in range(args.teachers)]
+    batches = -(-args.coursework // google_classroom.BATCH_LIMIT)
+    round_trips = args.teachers * (1 + args.courses * (1 + batches))
+    pages = args.teachers * (1 + args.courses * (1 + args.coursework))
+    print(
+        f"{args.teachers} teachers x {args.courses} courses x {args.coursework} coursework, "
+        f"{round_trips} round trips at {args.latency:g} ms"
+    )
+    sequential = round_trips * args.latency + pages * args.server
+    print(f"  sequential estimate            {sequential:9.1f} ms")
+
+    def sync(workers, per_teacher, watermarks=None):
+        sink = _CountingSink()
+        engine = ClassroomSyncEngine(
+            lambda teacher_id: google_classroom.GoogleClassroomService(credentials=teacher_id),
+            sink,
+            max_workers=workers,
+            per_teacher=per_teacher,
+        )
+        district.round_trips = 0
+        report = engine.run(teachers, watermarks)
+        assert not report.errors, report.errors[:3]
+        return report, sink
+
+    for workers in args.workers:
+        for per_teacher in args.per_teacher:
+            report, sink = sync(workers, per_teacher)
+            print(
+                f"  workers={workers:<4} per_teacher={per_teacher:<2}"
+                f"  {report.elapsed * 1000:9.1f} ms  ({sink.grades} grades)"
+            )
+
+    workers, per_teacher = max(args.workers), max(args.per_teacher)
+    watermarks = SyncWatermarks()
+    full, _sink = sync(workers, per_teacher, watermarks)
+    full_trips = district.round_trips
+    now = datetime.now(timezone.utc).isoformat()
+    coursework = [
+        f"{teacher}-{course}-{n}"
+        for teacher in teachers
+        for course in range(args.courses)
+        for n in range(args.coursework)
+    ]
+    changed = random.Random(0).sample(coursework, int(len(coursework) * args.changed / 100))
+    district.changed = dict.fromkeys(changed, now)
+    nightly, sink = sync(workers, per_teacher, watermarks)
+    print(f"incremental, {len(changed)} coursework items changed (workers={workers})")
+    print(f"  full       {full.elapsed * 1000:9.1f} ms  {full_trips:6d} round trips")
+    print(
+        f"  nightly    {nightly.elapsed * 1000:9.1f} ms  {district.round_trips:6d} round trips"
+        f"  ({nightly.coursework} coursework, {sink.grades} grades passed on)"
+    )
+
+if __name__ == "__main__":
+    main()
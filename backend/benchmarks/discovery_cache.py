@@ -0,0 +1,68 @@
+"""Compare Google API client construction with and without the discovery cache.
+
+"uncached" is ``googleapiclient.discovery.build(..., cache_discovery=False)``,
+as every Classroom/Gmail/OAuth service used to do per client. It reads and
+parses the bundled discovery document each time. "cached" goes through
+:data:`integrations.google_discovery.DISCOVERY_CACHE`, which parses each
+document once and hands each client its own copy of it. Needs
+google-api-python-client; no network is used.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from integrations.google_discovery import DISCOVERY_CACHE, build_client  # noqa: E402
+
+APIS = (("classroom", "v1"), ("gmail", "v1"), ("oauth2", "v2"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=200, help="clients built per API")
+    args = parser.parse_args()
+    if importlib.util.find_spec("googleapiclient") is None:
+        parser.error("google-api-python-client is not installed")
+
+    from google.oauth2.credentials import Credentials
+    from googleapiclient.discovery import build
+
+    credentials = [Credentials(token=f"token-{n}") for n in range(args.clients)]
+    print(f"{args.clients} clients per API")
+    for api, version in APIS:
+        started = time.perf_counter()
+        for credential in credentials:
+            build(api, version, credentials=credential, cache_discovery=False)
+        uncached = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for credential in credentials:
+            build_client(api, version, credential, "the benchmark")
+        cached = time.perf_counter() - started
+        name = f"{api}.{version}"
+        print(
+            f"  {name:<13} uncached {uncached * 1000 / args.clients:7.2f} ms/client"
+            f"  cached {cached * 1000 / args.clients:7.2f} ms/client"
+            f"  ({uncached / cached:.1f}x faster)"
+        )
+
+    metrics = DISCOVERY_CACHE.metrics()
+    for name, timings in metrics["documents"].items():
+        print(f"  loaded {name:<13} once in {timings['total_ms']:7.2f} ms")
+    for name, timings in metrics["clients"].items():
+        mean = timings["total_ms"] / timings["count"]
+        print(
+            f"  built  {name:<13} {timings['count']:5d} x {mean:5.2f} ms"
+            f" (max {timings['max_ms']:.2f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Time the vectorized gradebook engine against per-student Python loops.
+
+Also compares incremental updates on a :class:`LiveGradebook` with rebuilding
+the whole payload after a change.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from api.gradebook import GradebookMatrix, LiveGradebook, gradebook_payload  # noqa: E402
+
+CATEGORIES = ("Homework", "Quiz", "Test")
+WEIGHTS = {"Homework": 20, "Quiz": 30, "Test": 50}
+
+
+def _synthetic_gradebook(students: int, assignments: int) -> dict:
+    return {
+        "section_id": 1,
+        "grading_period": "Fall 2024",
+        "category_weights": WEIGHTS,
+        "assignments": [
+            {
+                "id": a,
+                "title": f"Assignment {a}",
+                "points_possible": 10 + a % 11,
+                "category": CATEGORIES[a % len(CATEGORIES)],
+            }
+            for a in range(1, assignments + 1)
+        ],
+        "students": [
+            {
+                "student_id": s,
+                "name": f"Student {s}",
+                "grades": {
+                    a: (s * 7 + a * 3) % (11 + a % 11)
+                    for a in range(1, assignments + 1)
+                    if (s + a) % 13
+                },
+                "exempt": [a for a in range(1, assignments + 1) if (s * a) % 97 == 0],
+            }
+            for s in range(students)
+        ],
+    }
+
+
+def _python_loops(gradebook: dict) -> list:
+    """Per-student weighted percentages computed with plain loops."""
+    assignments = {item["id"]: item for item in gradebook["assignments"]}
+    weights = gradebook["category_weights"]
+    results = []
+    for student in gradebook["students"]:
+        exempt = set(student["exempt"])
+        earned: dict = {}
+        possible: dict = {}
+        for assignment_id, score in student["grades"].items():
+            if assignment_id in exempt:
+                continue
+            assignment = assignments[assignment_id]
+            category = assignment["category"]
+            earned[category] = earned.get(category, 0) + score
+            possible[category] = possible.get(category, 0) + assignment["points_possible"]
+        total_weight = sum(weights[category] for category in possible if possible[category])
+        results.append(
+            sum(
+                weights[category] * earned[category] / possible[category] * 100
+                for category in possible
+                if possible[category]
+            )
+            / total_weight
+            if total_weight
+            else None
+        )
+    return results
+
+
+def _best_of(repeat: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=2_000)
+    parser.add_argument("--assignments", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    gradebook = _synthetic_gradebook(args.students, args.assignments)
+    matrix = GradebookMatrix.from_gradebook(gradebook)
+
+    def vectorized(matrix: GradebookMatrix) -> None:
+        matrix.student_totals()
+        matrix.weighted_percentages(WEIGHTS)
+        matrix.assignment_stats()
+
+    print(f"{args.students} students x {args.assignments} assignments (best of {args.repeat})")
+    timings = [
+        ("python loops (weighted only)", _best_of(args.repeat, _python_loops, gradebook)),
+        ("load matrix", _best_of(args.repeat, GradebookMatrix.from_gradebook, gradebook)),
+        ("vectorized totals+weights+stats", _best_of(args.repeat, vectorized, matrix)),
+        ("full response payload", _best_of(args.repeat, gradebook_payload, gradebook)),
+    ]
+    for label, millis in timings:
+        print(f"  {label:<32} {millis:8.2f} ms")
+
+    live = LiveGradebook(gradebook)
+    points = iter(range(10**9))
+    print("after one change")
+    timings = [
+        ("set_grade", _best_of(args.repeat, live.set_grade, 0, 1, 7)),
+        (
+            "update_assignment",
+            _best_of(
+                args.repeat,
+                lambda: live.update_assignment({"id": 1, "points_possible": 20 + next(points)}),
+            ),
+        ),
+        (
+            "set_grade + payload",
+            _best_of(args.repeat, lambda: (live.set_grade(0, 1, 7), live.payload())),
+        ),
+        ("full recompute payload", _best_of(args.repeat, gradebook_payload, live.to_dict())),
+    ]
+    for label, millis in timings:
+        print(f"  {label:<32} {millis:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
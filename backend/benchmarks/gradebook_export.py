@@ -0,0 +1,90 @@
+"""Compare peak memory and time of a CSV gradebook export: materialized vs streamed.
+
+The materialized export builds the list of every row from the gradebook
+dict and writes it to one string; the streamed export is what the export
+endpoints serve, column batches encoded through a buffered writer.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import os
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from api.gradebook import EXPORT_COLUMNS, LiveGradebook  # noqa: E402
+from api.gradebook_export import export_stream  # noqa: E402
+from benchmarks.gradebook_engine import _synthetic_gradebook  # noqa: E402
+
+
+def _materialized(live: LiveGradebook) -> int:
+    gradebook = live.to_dict()
+    assignments = {assignment["id"]: assignment for assignment in gradebook["assignments"]}
+    rows = []
+    for student in gradebook["students"]:
+        exempt_ids = set(student.get("exempt", ()))
+        for assignment_id, score in student["grades"].items():
+            assignment = assignments[assignment_id]
+            rows.append(
+                [
+                    gradebook["section_id"],
+                    student["student_id"],
+                    student["name"],
+                    assignment_id,
+                    assignment["title"],
+                    assignment.get("category"),
+                    assignment["points_possible"],
+                    score,
+                    assignment_id in exempt_ids,
+                ]
+            )
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_COLUMNS)
+    writer.writerows(rows)
+    return len(out.getvalue().encode("utf-8"))
+
+
+def _streamed(live: LiveGradebook) -> int:
+    return sum(len(chunk) for chunk in export_stream([live], "csv"))
+
+
+def _measure(func, live: LiveGradebook) -> tuple[float, int, int]:
+    # Time first, untraced: tracemalloc slows allocation-heavy code a lot.
+    started = time.perf_counter()
+    size = func(live)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    try:
+        func(live)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, size, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--assignments", type=int, default=100)
+    args = parser.parse_args()
+
+    for students in args.students:
+        live = LiveGradebook(_synthetic_gradebook(students, args.assignments))
+        print(f"{students} students x {args.assignments} assignments")
+        for label, func in (("materialized", _materialized), ("streamed", _streamed)):
+            elapsed, size, peak = _measure(func, live)
+            print(
+                f"  {label:<13} {elapsed * 1000:8.1f} ms  {size / 1e6:7.1f} MB body"
+                f"  peak {peak / 1e6:7.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
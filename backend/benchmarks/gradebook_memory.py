@@ -0,0 +1,84 @@
+"""Compare the memory a whole school's gradebooks take as dicts and as live gradebooks.
+
+The dict form is the ``SECTION_GRADEBOOKS`` shape the API uses, decoded from
+JSON the way a worker would load it. The live form is :class:`LiveGradebook`'s
+columnar storage plus its cached totals and statistics.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from api.gradebook import LiveGradebook  # noqa: E402
+from benchmarks.gradebook_engine import _synthetic_gradebook  # noqa: E402
+
+
+def _school(sections: int, students: int, assignments: int) -> list:
+    school = []
+    for section in range(sections):
+        gradebook = _synthetic_gradebook(students, assignments)
+        gradebook["section_id"] = section
+        school.append(json.loads(json.dumps(gradebook)))
+    return school
+
+
+def _retained(build) -> tuple[object, int]:
+    """Return what ``build()`` returns and the bytes it keeps alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = build()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def _timed(func) -> float:
+    # Untraced: tracemalloc slows allocation-heavy code a lot.
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sections", type=int, default=300)
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--assignments", type=int, default=80)
+    args = parser.parse_args()
+
+    cells = args.sections * args.students * args.assignments
+    print(
+        f"{args.sections} sections x {args.students} students x "
+        f"{args.assignments} assignments ({cells:,} grade cells)"
+    )
+    school, dict_bytes = _retained(
+        lambda: _school(args.sections, args.students, args.assignments)
+    )
+    live, live_bytes = _retained(lambda: [LiveGradebook(item) for item in school])
+    build = _timed(lambda: [LiveGradebook(item) for item in school])
+    rebuild = _timed(lambda: [gradebook.to_dict() for gradebook in live])
+
+    print(f"  dict gradebooks   {dict_bytes / 1e6:8.1f} MB  {dict_bytes / cells:6.1f} B/cell")
+    print(
+        f"  live gradebooks   {live_bytes / 1e6:8.1f} MB  {live_bytes / cells:6.1f} B/cell"
+        f"  ({dict_bytes / live_bytes:.1f}x smaller)"
+    )
+    print(f"  build live        {build * 1000:8.1f} ms")
+    print(f"  to_dict for all   {rebuild * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
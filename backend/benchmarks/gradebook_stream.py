@@ -0,0 +1,68 @@
+"""Compare peak memory and time to first byte: whole-document vs NDJSON gradebook."""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.gradebook import LiveGradebook  # noqa: E402
+from api.renderers import ndjson_line  # noqa: E402
+from benchmarks.gradebook_engine import _synthetic_gradebook  # noqa: E402
+
+
+def _document(live: LiveGradebook) -> tuple[float, int]:
+    started = time.perf_counter()
+    body = JSONRenderer().render(live.payload())
+    return time.perf_counter() - started, len(body)
+
+
+def _stream(live: LiveGradebook) -> tuple[float, int]:
+    started = time.perf_counter()
+    first_byte = None
+    size = 0
+    for chunk in live.stream(ndjson_line):
+        if first_byte is None:
+            first_byte = time.perf_counter() - started
+        size += len(chunk)
+    return first_byte or 0.0, size
+
+
+def _measure(func, live: LiveGradebook) -> tuple[float, int, int]:
+    # Time first, untraced: tracemalloc slows allocation-heavy code a lot.
+    first_byte, size = func(live)
+    tracemalloc.start()
+    try:
+        func(live)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return first_byte, size, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, nargs="+", default=[1_000, 5_000, 20_000])
+    parser.add_argument("--assignments", type=int, default=100)
+    args = parser.parse_args()
+
+    for students in args.students:
+        live = LiveGradebook(_synthetic_gradebook(students, args.assignments))
+        print(f"{students} students x {args.assignments} assignments")
+        for label, func in (("json document", _document), ("ndjson stream", _stream)):
+            first_byte, size, peak = _measure(func, live)
+            print(
+                f"  {label:<14} first byte {first_byte * 1000:8.1f} ms"
+                f"  body {size / 1e6:6.1f} MB  peak alloc {peak / 1e6:7.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Compare requests/sec for static payloads with and without the render cache."""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.test import RequestFactory, override_settings  # noqa: E402
+from rest_framework.response import Response  # noqa: E402
+from rest_framework.views import APIView  # noqa: E402
+
+from api import mock_data  # noqa: E402
+from api.views import (  # noqa: E402
+    CoursesView,
+    MeView,
+    SectionGradebookView,
+    _conditional,
+)
+
+BENCH_SECTION_ID = 999
+
+
+def _baseline(payload, dataset: str):
+    """The same conditional handling, but rendering through ``Response``."""
+
+    class RenderEveryTime(APIView):
+        @_conditional(lambda **_kwargs: mock_data.DATASET_VERSIONS.current(dataset))
+        def get(self, _request, **_kwargs):
+            return Response(payload)
+
+    return RenderEveryTime.as_view()
+
+
+def _synthetic_gradebook(students: int, assignments: int) -> dict:
+    return {
+        "section_id": BENCH_SECTION_ID,
+        "grading_period": "Fall 2024",
+        "assignments": [
+            {"id": a, "title": f"Assignment {a}", "points_possible": 20}
+            for a in range(1, assignments + 1)
+        ],
+        "students": [
+            {
+                "student_id": 10_000 + s,
+                "name": f"Student {s}",
+                "grades": {a: (s + a) % 21 for a in range(1, assignments + 1)},
+            }
+            for s in range(students)
+        ],
+    }
+
+
+def _requests_per_second(view, count: int, **kwargs) -> float:
+    requests = [RequestFactory().get("/bench") for _ in range(count)]
+    started = time.perf_counter()
+    for request in requests:
+        response = view(request, **kwargs)
+        if hasattr(response, "render"):
+            response.render()
+    return count / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2_000)
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--assignments", type=int, default=20)
+    args = parser.parse_args()
+
+    mock_data.SECTION_GRADEBOOKS[BENCH_SECTION_ID] = _synthetic_gradebook(
+        args.students, args.assignments
+    )
+    mock_data.DATASET_VERSIONS.bump(f"gradebook:{BENCH_SECTION_ID}")
+
+    cases = [
+        ("me", "me", MeView, {}),
+        ("courses", "courses", CoursesView, {}),
+        (
+            "gradebook",
+            f"gradebook:{BENCH_SECTION_ID}",
+            SectionGradebookView,
+            {"section_id": BENCH_SECTION_ID},
+        ),
+    ]
+    payloads = {
+        "me": mock_data.ME_PAYLOAD,
+        "courses": mock_data.COURSES,
+        "gradebook": mock_data.SECTION_GRADEBOOKS[BENCH_SECTION_ID],
+    }
+    with override_settings(ENABLE_MOCK_DATA=True):
+        print(
+            f"{args.count} requests per case; gradebook is "
+            f"{args.students} students x {args.assignments} assignments"
+        )
+        for label, dataset, view_class, kwargs in cases:
+            baseline = _baseline(payloads[label], dataset)
+            before = _requests_per_second(baseline, args.count, **kwargs)
+            after = _requests_per_second(view_class.as_view(), args.count, **kwargs)
+            print(
+                f"  {label:<10} render per request {before:9.0f} req/s"
+                f"  cached bytes {after:9.0f} req/s  ({after / before:.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
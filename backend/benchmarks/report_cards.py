@@ -0,0 +1,72 @@
+"""Measure report card throughput as the process pool grows.
+
+Renders one card per student of a synthetic section with 1, 2, 4, ...
+workers up to the core count. PDFs need WeasyPrint; without it the
+benchmark renders the HTML stage alone (``--format html``), which measures
+the pool's fan-out but not the PDF layout cost that dominates in production.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import tempfile
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from api.grading import GradingPolicy, compile_policy  # noqa: E402
+from api.report_cards import ReportCardJobs, report_cards  # noqa: E402
+from benchmarks.gradebook_engine import _synthetic_gradebook  # noqa: E402
+
+
+def _worker_counts(limit: int) -> list:
+    counts = [1]
+    while counts[-1] * 2 <= limit:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != limit:
+        counts.append(limit)
+    return counts
+
+
+def main() -> None:
+    default_format = "pdf" if importlib.util.find_spec("weasyprint") else "html"
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=400)
+    parser.add_argument("--assignments", type=int, default=40)
+    parser.add_argument("--format", choices=("pdf", "html"), default=default_format)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    gradebook = _synthetic_gradebook(args.students, args.assignments)
+    categories = sorted({assignment["category"] for assignment in gradebook["assignments"]})
+    policy = GradingPolicy.from_dict(
+        {"categories": [{"name": name, "weight": 1} for name in categories]}
+    )
+    cards = report_cards(gradebook, compile_policy(policy))
+    print(f"{len(cards)} {args.format} report cards, {args.assignments} assignments each")
+    baseline = None
+    for workers in _worker_counts(args.max_workers):
+        with tempfile.TemporaryDirectory() as storage:
+            jobs = ReportCardJobs(storage, max_workers=workers)
+            try:
+                # Start the workers first so pool start-up is not timed.
+                jobs.wait(jobs.submit(0, cards[:workers], args.format).id)
+                started = time.perf_counter()
+                status = jobs.wait(jobs.submit(0, cards, args.format).id)
+                elapsed = time.perf_counter() - started
+            finally:
+                jobs.shutdown()
+        rate = status["completed"] / elapsed
+        baseline = baseline or rate
+        print(
+            f"  {workers:>3} workers  {elapsed * 1000:8.1f} ms  {rate:8.1f} cards/s"
+            f"  ({rate / baseline:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Time section statistics after a grade change: incremental vs recomputed.
+
+Recomputing rebuilds every per-assignment and per-student summary from the
+score matrix; the incremental path updates the two summaries a grade touches
+and then reads them all.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from api.gradebook import LiveGradebook  # noqa: E402
+from api.section_stats import SectionStats  # noqa: E402
+from benchmarks.gradebook_engine import _synthetic_gradebook  # noqa: E402
+
+
+def _best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--assignments", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    live = LiveGradebook(_synthetic_gradebook(args.students, args.assignments))
+    live.section_stats()
+    matrix = live.matrix
+    scores = iter(range(10**9))
+
+    def recompute() -> None:
+        live.set_grade(1, 1, next(scores) % 10)
+        SectionStats(matrix.scores, matrix.counted, matrix.points_possible).payload(
+            matrix.student_ids.tolist(), matrix.assignment_ids.tolist()
+        )
+
+    def incremental() -> None:
+        live.set_grade(1, 1, next(scores) % 10)
+        live.section_stats()
+
+    print(f"{args.students} students x {args.assignments} assignments (best of {args.repeat})")
+    timings = [
+        ("recompute", recompute),
+        ("incremental", incremental),
+        ("set_grade only", lambda: live.set_grade(1, 2, next(scores) % 10)),
+    ]
+    for label, func in timings:
+        print(f"  {label:<16} {_best_of(args.repeat, func):8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Compare the memory of student rows as dicts and as shared compact records.
+
+The dict form is today's fixture shape decoded from JSON the way a worker
+would load it: every section roster repeats each student's
+``{"id", "first_name", "last_name"}`` dict and every gradebook repeats a
+``{"student_id", "name"}`` row. The compact form is one :class:`StudentTable`
+plus an id array per roster and per gradebook.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import random
+import time
+import tracemalloc
+from array import array
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from api.mock_data import RosterFixtures, StudentRecord, StudentTable  # noqa: E402
+
+_FIRST_NAMES = 2000
+_LAST_NAMES = 5000
+
+
+def _students(count: int) -> list:
+    rng = random.Random(count)
+    return [
+        StudentRecord(
+            student_id,
+            f"First{rng.randrange(_FIRST_NAMES)}",
+            f"Last{rng.randrange(_LAST_NAMES)}",
+        )
+        for student_id in range(1, count + 1)
+    ]
+
+
+def _sections(students: int, per_student: int, section_size: int) -> dict:
+    rng = random.Random(students)
+    ids = list(range(1, students + 1))
+    sections = {}
+    for _ in range(per_student):
+        rng.shuffle(ids)
+        for start in range(0, students, section_size):
+            sections[len(sections) + 1] = sorted(ids[start : start + section_size])
+    return sections
+
+
+def _dict_layout(students: list, sections: dict) -> tuple:
+    by_id = {student.id: student for student in students}
+    rosters = {
+        section_id: {
+            "section_id": section_id,
+            "students": [by_id[student_id].to_json() for student_id in student_ids],
+        }
+        for section_id, student_ids in sections.items()
+    }
+    gradebooks = {
+        section_id: [
+            {
+                "student_id": student_id,
+                "name": f"{by_id[student_id].first_name} {by_id[student_id].last_name}",
+            }
+            for student_id in student_ids
+        ]
+        for section_id, student_ids in sections.items()
+    }
+    return json.loads(json.dumps(rosters)), json.loads(json.dumps(gradebooks))
+
+
+def _compact_layout(students: list, sections: dict) -> tuple:
+    table = StudentTable(_decoded(students))
+    rosters = RosterFixtures(table, sections)
+    gradebooks = {
+        section_id: array("q", student_ids) for section_id, student_ids in sections.items()
+    }
+    return rosters, gradebooks
+
+
+def _decoded(students: list) -> list:
+    # Start from freshly decoded strings, as the dict layout does.
+    rows = json.loads(json.dumps([student.to_json() for student in students]))
+    return [StudentRecord(row["id"], row["first_name"], row["last_name"]) for row in rows]
+
+
+def _retained(build) -> tuple[object, int]:
+    """Return what ``build()`` returns and the bytes it keeps alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = build()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def _timed(func) -> float:
+    # Untraced: tracemalloc slows allocation-heavy code a lot.
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=50_000)
+    parser.add_argument("--sections-per-student", type=int, default=6)
+    parser.add_argument("--section-size", type=int, default=30)
+    args = parser.parse_args()
+
+    students = _students(args.students)
+    sections = _sections(args.students, args.sections_per_student, args.section_size)
+    rows = sum(len(student_ids) for student_ids in sections.values())
+    print(
+        f"{args.students:,} students in {len(sections):,} sections "
+        f"({rows:,} roster rows, as many gradebook rows)"
+    )
+    (dict_rosters, _), dict_bytes = _retained(lambda: _dict_layout(students, sections))
+    (compact_rosters, _), compact_bytes = _retained(lambda: _compact_layout(students, sections))
+    dict_dump = _timed(lambda: [json.dumps(roster) for roster in dict_rosters.values()])
+    compact_dump = _timed(
+        lambda: [json.dumps(compact_rosters[section_id]) for section_id in compact_rosters]
+    )
+
+    count = args.students
+    print(f"  dict rows         {dict_bytes / 1e6:8.1f} MB  {dict_bytes / count:6.0f} B/student")
+    print(
+        f"  compact records   {compact_bytes / 1e6:8.1f} MB  "
+        f"{compact_bytes / count:6.0f} B/student  "
+        f"({dict_bytes / compact_bytes:.1f}x smaller)"
+    )
+    print(f"  serialize dicts   {dict_dump * 1000:8.1f} ms")
+    print(f"  serialize compact {compact_dump * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Time term-end grade recomputation for every section in a synthetic school.
+
+Compares the compiled, batched policy engine with a straightforward
+per-student evaluation that re-reads the policy and re-scans the assignment
+list for every student and category.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from api import mock_data  # noqa: E402
+from api.grading import GradingPolicy, evaluate_sections  # noqa: E402
+
+CATEGORIES = ("Test", "Quiz", "Homework", "Project")
+TERMS = ("Q1", "Q2")
+
+
+def _synthetic_school(sections: int, students: int, assignments: int) -> list:
+    gradebooks = []
+    for section in range(sections):
+        columns = [
+            {
+                "id": a,
+                "points_possible": 10 + a % 11,
+                "category": CATEGORIES[a % len(CATEGORIES)],
+                "term": TERMS[a % len(TERMS)],
+                "extra_credit": a % 37 == 0,
+            }
+            for a in range(1, assignments + 1)
+        ]
+        gradebooks.append(
+            {
+                "section_id": section,
+                "grading_period": TERMS[0],
+                "assignments": columns,
+                "students": [
+                    {
+                        "student_id": section * 1_000 + s,
+                        "grades": {
+                            a: (s * 7 + a * 3 + section) % (11 + a % 11)
+                            for a in range(1, assignments + 1)
+                            if (s + a) % 17
+                        },
+                        "exempt": [a for a in range(1, assignments + 1) if (s * a) % 89 == 0],
+                    }
+                    for s in range(students)
+                ],
+            }
+        )
+    return gradebooks
+
+
+def _naive(policy_data: dict, gradebook: dict) -> list:
+    """Evaluate one student at a time, re-deriving everything per student."""
+    results = []
+    for student in gradebook["students"]:
+        policy = GradingPolicy.from_dict(policy_data)
+        terms = {}
+        for term in TERMS:
+            weighted = applied = Decimal(0)
+            for rule in policy.categories:
+                items = []
+                bonus = Decimal(0)
+                for assignment in gradebook["assignments"]:
+                    if assignment["category"] != rule.name or assignment["term"] != term:
+                        continue
+                    if assignment["id"] in student["exempt"]:
+                        continue
+                    score = student["grades"].get(assignment["id"])
+                    if score is None and assignment["extra_credit"]:
+                        continue
+                    score = Decimal(str(score or 0))
+                    if assignment["extra_credit"]:
+                        bonus += score
+                        continue
+                    points = Decimal(str(assignment["points_possible"]))
+                    items.append((score / points, assignment["id"], score, points))
+                items.sort()
+                if rule.drop_lowest and len(items) > 1:
+                    items = items[min(rule.drop_lowest, len(items) - 1) :]
+                possible = sum(item[3] for item in items)
+                if possible:
+                    percentage = (sum(item[2] for item in items) + bonus) * 100 / possible
+                    weighted += percentage * rule.weight
+                    applied += rule.weight
+            if applied:
+                terms[term] = weighted / applied
+        course = sum(terms.values()) / len(terms) if terms else None
+        results.append(
+            course.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) if course else None
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sections", type=int, default=120)
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--assignments", type=int, default=60)
+    args = parser.parse_args()
+
+    school = _synthetic_school(args.sections, args.students, args.assignments)
+    policy_data = mock_data.GRADING_POLICY
+    cells = args.sections * args.students * args.assignments
+    print(
+        f"{args.sections} sections x {args.students} students x "
+        f"{args.assignments} assignments ({cells:,} grade cells)"
+    )
+
+    started = time.perf_counter()
+    for gradebook in school:
+        _naive(policy_data, gradebook)
+    naive = time.perf_counter() - started
+
+    started = time.perf_counter()
+    graded = evaluate_sections(school, lambda _gradebook: GradingPolicy.from_dict(policy_data))
+    compiled = time.perf_counter() - started
+
+    for gradebook in school[:3]:
+        expected = _naive(policy_data, gradebook)
+        actual = [result["percentage"] for result in graded[gradebook["section_id"]]]
+        assert actual == expected, (gradebook["section_id"], actual[:3], expected[:3])
+
+    print(f"  per-student evaluation   {naive * 1000:9.1f} ms")
+    print(f"  compiled batched plan    {compiled * 1000:9.1f} ms  ({naive / compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -219,6 +219,17 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Assignment list keyset pagination (opt-in via ?page_size= or ?cursor=)
+ASSIGNMENTS_PAGE_SIZE = int(_getenv(["ASSIGNMENTS_PAGE_SIZE"], "50"))
+ASSIGNMENTS_MAX_PAGE_SIZE = int(_getenv(["ASSIGNMENTS_MAX_PAGE_SIZE"], "500"))
+ASSIGNMENTS_BULK_MAX_OPERATIONS = int(_getenv(["ASSIGNMENTS_BULK_MAX_OPERATIONS"], "500"))
+# Validate assignment writes with the compiled fast path before falling back to DRF
+ASSIGNMENTS_FAST_VALIDATION = _getenv(["ASSIGNMENTS_FAST_VALIDATION"], "1") == "1"
+
+# Report card rendering: artifact directory and process pool size (0 = one per core)
+REPORT_CARD_DIR = Path(_getenv(["REPORT_CARD_DIR"], str(BASE_DIR / "var" / "report_cards")))
+REPORT_CARD_WORKERS = int(_getenv(["REPORT_CARD_WORKERS"], "0"))
+
 # Mock data toggle (define only once)
 ENABLE_MOCK_DATA = _getenv(
     ["ENABLE_MOCK_DATA", "DJANGO_ENABLE_MOCK_DATA"],
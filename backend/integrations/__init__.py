@@ -4,4 +4,6 @@ __all__ = [
     "google_oauth",
     "google_classroom",
     "gmail_service",
+    "classroom_sync",
+    "google_discovery",
 ]
@@ -0,0 +1,561 @@
+"""Google Classroom -> SchoolOS import.
+
+:class:`ClassroomSyncEngine` walks every course of a set of teachers with
+:class:`~integrations.google_classroom.GoogleClassroomService` and hands the
+results to a :class:`SyncSink`. Work is split into tasks: list a teacher's
+courses, list one course's coursework, and fetch submissions for up to
+:data:`~integrations.google_classroom.BATCH_LIMIT` coursework items in one
+batch request. All tasks share one bounded thread pool. Each teacher also
+has a cap on tasks in flight, since Classroom quotas are per user. Tasks
+over the cap wait in that teacher's queue rather than holding a pool
+thread.
+
+:class:`StoreSink` maps coursework onto assignment-store records and
+submissions onto gradebook grades, one course or batch at a time.
+
+Given :class:`SyncWatermarks` from an earlier run, a sync is incremental:
+coursework is listed newest ``updateTime`` first and only items changed
+since the course's watermark are read, and sinks receive only coursework
+and submissions changed since they were last seen.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from itertools import takewhile
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+
+from .google_classroom import (
+    BATCH_LIMIT,
+    ClassroomBatchError,
+    CourseworkKey,
+    GoogleClassroomService,
+)
+
+Course = Mapping[str, Any]
+Submissions = Mapping[CourseworkKey, Sequence[Mapping[str, Any]]]
+
+
+class SyncSink(Protocol):
+    """Receives fetched Classroom data; called from pool threads, so must be thread-safe.
+
+    :meth:`submissions` may return the keys of results it could not apply
+    (``None`` means it applied them all). Their watermarks are held back so
+    the next incremental run passes those submissions on again.
+    """
+
+    def coursework(
+        self, teacher_id: str, course: Course, items: Sequence[Mapping[str, Any]]
+    ) -> None: ...
+
+    def submissions(
+        self, teacher_id: str, course: Course, results: Submissions
+    ) -> Optional[Collection[CourseworkKey]]: ...
+
+
+_FRACTION = re.compile(r"(\.\d{6})\d+")
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an RFC 3339 ``updateTime``; Classroom may send nanoseconds."""
+    if not value:
+        return None
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    if len(value) > len("2000-01-01T00:00:00.000000+00:00"):
+        value = _FRACTION.sub(r"\1", value)
+    return datetime.fromisoformat(value)
+
+
+def _changed(item: Mapping[str, Any], since: Optional[datetime]) -> bool:
+    if since is None:
+        return True
+    updated = _timestamp(item.get("updateTime"))
+    return updated is None or updated > since
+
+
+def _latest(current: Optional[str], items: Iterable[Mapping[str, Any]]) -> Optional[str]:
+    latest, latest_time = current, _timestamp(current)
+    for item in items:
+        updated = _timestamp(item.get("updateTime"))
+        if updated is not None and (latest_time is None or updated > latest_time):
+            latest, latest_time = item["updateTime"], updated
+    return latest
+
+
+class SyncWatermarks:
+    """``updateTime`` high-water marks from earlier syncs, per course and coursework.
+
+    For each course this records the newest ``updateTime`` seen on any of its
+    coursework, and for each coursework item the newest submission
+    ``updateTime`` plus when it last changed. Submissions cannot be listed by
+    modification time, so only coursework that changed within
+    ``active_days`` is polled for them; a full run (no watermarks) catches
+    anything older. Marks only advance once the sink has applied the data,
+    so failed or held-back work is retried by the next run.
+
+    The marks can also carry the coursework -> assignment id links of a
+    :class:`StoreSink` (see :meth:`links` and :meth:`update_links`), so one
+    file restores everything an incremental run in a new process needs.
+    """
+
+    def __init__(
+        self, courses: Optional[Mapping[str, Any]] = None, *, active_days: int = 14
+    ) -> None:
+        self._courses: Dict[str, Dict[str, Any]] = json.loads(json.dumps(courses or {}))
+        self.active_days = active_days
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path | str, **kwargs: Any) -> "SyncWatermarks":
+        """Read marks saved by :meth:`save`; a missing file means a first, full sync."""
+        try:
+            with open(path, encoding="utf-8") as handle:
+                return cls(json.load(handle), **kwargs)
+        except FileNotFoundError:
+            return cls(**kwargs)
+
+    def save(self, path: Path | str) -> None:
+        """Write the marks atomically, so a crash never leaves a partial file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.tmp")
+        temporary.write_text(json.dumps(self.to_dict(), sort_keys=True), encoding="utf-8")
+        os.replace(temporary, path)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return json.loads(json.dumps(self._courses))
+
+    def _course(self, course_id: str) -> Dict[str, Any]:
+        return self._courses.setdefault(course_id, {"updateTime": None, "coursework": {}})
+
+    def coursework_since(self, course_id: str) -> Optional[datetime]:
+        with self._lock:
+            return _timestamp(self._courses.get(course_id, {}).get("updateTime"))
+
+    def submissions_since(self, course_id: str, coursework_id: str) -> Optional[datetime]:
+        with self._lock:
+            coursework = self._courses.get(course_id, {}).get("coursework", {})
+            return _timestamp(coursework.get(coursework_id, {}).get("submissions"))
+
+    def active_coursework(self, course_id: str, now: datetime) -> List[str]:
+        """Coursework of ``course_id`` that changed within ``active_days`` of ``now``."""
+        cutoff = now - timedelta(days=self.active_days)
+        with self._lock:
+            coursework = self._courses.get(course_id, {}).get("coursework", {})
+            return [
+                coursework_id
+                for coursework_id, marks in coursework.items()
+                if (_timestamp(marks.get("active")) or cutoff) > cutoff
+            ]
+
+    def links(self) -> Dict[CourseworkKey, int]:
+        """The saved ``(course id, coursework id) -> assignment id`` links."""
+        with self._lock:
+            return {
+                (course_id, coursework_id): marks["assignment_id"]
+                for course_id, course in self._courses.items()
+                for coursework_id, marks in course["coursework"].items()
+                if marks.get("assignment_id") is not None
+            }
+
+    def update_links(self, links: Mapping[CourseworkKey, int]) -> None:
+        """Record coursework -> assignment id links, e.g. ``StoreSink.links()``."""
+        with self._lock:
+            for (course_id, coursework_id), assignment_id in links.items():
+                marks = self._course(course_id)["coursework"].setdefault(
+                    coursework_id, {"submissions": None, "active": None}
+                )
+                marks["assignment_id"] = assignment_id
+
+    def saw_coursework(self, course_id: str, items: Sequence[Mapping[str, Any]]) -> None:
+        with self._lock:
+            course = self._course(course_id)
+            course["updateTime"] = _latest(course["updateTime"], items)
+            for item in items:
+                marks = course["coursework"].setdefault(item["id"], {"submissions": None})
+                marks["active"] = _latest(marks.get("active"), [item])
+
+    def saw_submissions(
+        self, course_id: str, coursework_id: str, items: Sequence[Mapping[str, Any]]
+    ) -> None:
+        with self._lock:
+            marks = self._course(course_id)["coursework"].setdefault(
+                coursework_id, {"submissions": None, "active": None}
+            )
+            marks["submissions"] = _latest(marks["submissions"], items)
+            marks["active"] = _latest(marks.get("active"), items)
+
+
+@dataclass
+class SyncReport:
+    """Counts and per-task errors from one :meth:`ClassroomSyncEngine.run`."""
+
+    teachers: int = 0
+    courses: int = 0
+    coursework: int = 0
+    submissions: int = 0
+    errors: List[Dict[str, str]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+@dataclass
+class _TeacherQueue:
+    service: GoogleClassroomService
+    pending: Deque[Tuple[Callable[..., None], Tuple[Any, ...]]] = field(default_factory=deque)
+    running: int = 0
+
+
+class ClassroomSyncEngine:
+    """Fan Classroom fetches for many teachers across a bounded thread pool.
+
+    ``service_for`` returns the :class:`GoogleClassroomService` for a teacher
+    id (normally one built from that teacher's credentials). At most
+    ``max_workers`` requests run at once overall and at most ``per_teacher``
+    for any single teacher. Coursework is synced per course; submissions per
+    batch of ``batch_size`` coursework items.
+    """
+
+    def __init__(
+        self,
+        service_for: Callable[[str], GoogleClassroomService],
+        sink: SyncSink,
+        *,
+        max_workers: int = 32,
+        per_teacher: int = 4,
+        batch_size: int = BATCH_LIMIT,
+        course_states: Sequence[str] = ("ACTIVE",),
+    ) -> None:
+        if max_workers < 1 or per_teacher < 1 or not 1 <= batch_size <= BATCH_LIMIT:
+            raise ValueError("Worker counts must be positive and batch_size within 1..BATCH_LIMIT")
+        self._service_for = service_for
+        self._sink = sink
+        self.max_workers = max_workers
+        self.per_teacher = per_teacher
+        self.batch_size = batch_size
+        self.course_states = tuple(course_states)
+        self._lock = threading.Lock()
+
+    def run(
+        self, teacher_ids: Iterable[str], watermarks: Optional[SyncWatermarks] = None
+    ) -> SyncReport:
+        """Sync every course of ``teacher_ids``; returns once all tasks finished.
+
+        With ``watermarks`` only changes since the marks are fetched and
+        passed on, and the marks are advanced in place; save them afterwards.
+        """
+        report = SyncReport()
+        now = datetime.now(timezone.utc)
+        queues: Dict[str, _TeacherQueue] = {}
+        outstanding = [0]
+        finished = threading.Event()
+        started = time.perf_counter()
+        executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="classroom-sync")
+
+        def submit(teacher_id: str, task: Callable[..., None], *args: Any) -> None:
+            with self._lock:
+                outstanding[0] += 1
+                queue = queues[teacher_id]
+                if queue.running >= self.per_teacher:
+                    queue.pending.append((task, args))
+                    return
+                queue.running += 1
+            executor.submit(execute, teacher_id, task, args)
+
+        def execute(teacher_id: str, task: Callable[..., None], args: Tuple[Any, ...]) -> None:
+            try:
+                task(teacher_id, *args)
+            except Exception as exc:  # noqa: BLE001 - reported per task, the run goes on
+                with self._lock:
+                    report.errors.append(
+                        {"teacher_id": teacher_id, "task": task.__name__, "error": repr(exc)}
+                    )
+            with self._lock:
+                outstanding[0] -= 1
+                queue = queues[teacher_id]
+                follow_up = queue.pending.popleft() if queue.pending else None
+                if follow_up is None:
+                    queue.running -= 1
+                done = outstanding[0] == 0
+            if follow_up is not None:
+                executor.submit(execute, teacher_id, *follow_up)
+            elif done:
+                finished.set()
+
+        def courses(teacher_id: str) -> None:
+            service = queues[teacher_id].service
+            count = 0
+            for course in service.iter_courses(
+                teacher_id=teacher_id, course_states=self.course_states, prefetch=False
+            ):
+                count += 1
+                submit(teacher_id, coursework, course)
+            self._count(report, courses=count)
+
+        def coursework(teacher_id: str, course: Course) -> None:
+            service = queues[teacher_id].service
+            if watermarks is None:
+                items = list(service.iter_coursework(course["id"], prefetch=False))
+            else:
+                since = watermarks.coursework_since(course["id"])
+                newest_first = service.iter_coursework(
+                    course["id"], order_by="updateTime desc", prefetch=False
+                )
+                items = list(takewhile(lambda item: _changed(item, since), newest_first))
+            if items or watermarks is None:
+                self._sink.coursework(teacher_id, course, items)
+            self._count(report, coursework=len(items))
+            ids = [item["id"] for item in items]
+            if watermarks is not None:
+                watermarks.saw_coursework(course["id"], items)
+                ids = list(dict.fromkeys(ids + watermarks.active_coursework(course["id"], now)))
+            for start in range(0, len(ids), self.batch_size):
+                submit(teacher_id, submissions, course, ids[start : start + self.batch_size])
+
+        def submissions(teacher_id: str, course: Course, coursework_ids: List[str]) -> None:
+            service = queues[teacher_id].service
+            pairs = [(course["id"], coursework_id) for coursework_id in coursework_ids]
+            error: Optional[ClassroomBatchError] = None
+            try:
+                results = service.batch_get_student_submissions(pairs)
+            except ClassroomBatchError as exc:
+                error, results = exc, exc.results
+            if watermarks is not None:
+                changed = {}
+                for key, items in results.items():
+                    since = watermarks.submissions_since(*key)
+                    changed[key] = [item for item in items if _changed(item, since)]
+                results = changed
+            unapplied = self._sink.submissions(teacher_id, course, results) or ()
+            fetched = sum(len(items) for items in results.values())
+            self._count(report, submissions=fetched)
+            if watermarks is not None:
+                failed = error.errors if error is not None else {}
+                for key, items in results.items():
+                    if key not in failed and key not in unapplied:
+                        watermarks.saw_submissions(*key, items)
+            if error is not None:
+                raise error
+
+        try:
+            for teacher_id in dict.fromkeys(teacher_ids):
+                queues[teacher_id] = _TeacherQueue(self._service_for(teacher_id))
+                report.teachers += 1
+            if not queues:
+                finished.set()
+            for teacher_id in queues:
+                submit(teacher_id, courses)
+            finished.wait()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            for queue in queues.values():
+                queue.service.close()
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def _count(self, report: SyncReport, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(report, name, getattr(report, name) + value)
+
+
+def _due_date(coursework: Mapping[str, Any]) -> Optional[str]:
+    due = coursework.get("dueDate") or {}
+    try:
+        return date(due["year"], due["month"], due["day"]).isoformat()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _max_points(coursework: Mapping[str, Any]) -> int | float:
+    # Whole numbers stay ints, as hand-entered assignments have them.
+    points = coursework.get("maxPoints") or 0
+    return int(points) if float(points).is_integer() else float(points)
+
+
+class StoreSink:
+    """Write synced coursework to an assignment store and grades to gradebooks.
+
+    ``sections`` maps a Classroom course id to its SchoolOS
+    ``(course_id, section_id)``, and ``students`` maps Classroom user ids to
+    SchoolOS student ids. Courses and students without a mapping are
+    skipped and counted. Coursework becomes one atomic ``store.apply``
+    batch per course, updating records created by earlier syncs. Each
+    submission batch becomes one ``gradebooks.set_grades`` call.
+    ``gradebooks`` is a :class:`~api.gradebook.GradebookRegistry`.
+
+    ``assignments`` seeds the coursework -> assignment id links; for
+    incremental syncs across processes, store :meth:`links` in the
+    watermarks with :meth:`SyncWatermarks.update_links` before saving them,
+    and pass ``watermarks.links()`` back in, so changed coursework updates
+    its record instead of adding one; a link to a record since deleted
+    locally is dropped and the record created again. Grades for coursework
+    with no link yet, or that the gradebook could not take, are skipped,
+    counted and reported back to the engine, which then holds their
+    watermarks back.
+
+    ``categories`` lists each section's grading-policy category names. A
+    coursework item's Classroom grade category is kept when it names one of
+    them (ignoring case); otherwise the item is filed under
+    :attr:`DEFAULT_CATEGORY`, which the school-wide policy and every section
+    policy weight, so imported grades always count toward the grade.
+    """
+
+    DEFAULT_CATEGORY = "Homework"
+
+    def __init__(
+        self,
+        store: Any,
+        gradebooks: Any,
+        sections: Mapping[str, Tuple[int, int]],
+        students: Mapping[str, int],
+        assignments: Optional[Mapping[CourseworkKey, int]] = None,
+        categories: Optional[Mapping[int, Collection[str]]] = None,
+    ) -> None:
+        self._store = store
+        self._categories = {
+            section_id: {name.casefold(): name for name in names}
+            for section_id, names in (categories or {}).items()
+        }
+        self._gradebooks = gradebooks
+        self._sections = sections
+        self._students = students
+        self._assignments: Dict[CourseworkKey, int] = dict(assignments or {})
+        self._lock = threading.Lock()
+        self.skipped: Dict[str, int] = {"courses": 0, "students": 0, "grades": 0}
+
+    def assignment_id(self, course_id: str, coursework_id: str) -> Optional[int]:
+        """The store id created for a Classroom coursework item, if synced."""
+        with self._lock:
+            return self._assignments.get((course_id, coursework_id))
+
+    def links(self) -> Dict[CourseworkKey, int]:
+        """A snapshot of the coursework -> assignment id links made so far."""
+        with self._lock:
+            return dict(self._assignments)
+
+    def _skip(self, kind: str, count: int = 1) -> None:
+        with self._lock:
+            self.skipped[kind] += count
+
+    def _payload(
+        self, course_id: int, section_id: int, item: Mapping[str, Any]
+    ) -> Dict[str, Any]:
+        name = (item.get("gradeCategory") or {}).get("name") or ""
+        category = self._categories.get(section_id, {}).get(name.casefold(), self.DEFAULT_CATEGORY)
+        return {
+            "course_id": course_id,
+            "section_id": section_id,
+            "title": item.get("title") or "",
+            "description": item.get("description") or "",
+            "due_date": _due_date(item),
+            "points_possible": _max_points(item),
+            "category": category,
+        }
+
+    def coursework(
+        self, teacher_id: str, course: Course, items: Sequence[Mapping[str, Any]]
+    ) -> None:
+        target = self._sections.get(course["id"])
+        if target is None:
+            self._skip("courses")
+            return
+        course_id, section_id = target
+        keys = [(course["id"], item["id"]) for item in items]
+        with self._lock:
+            known = [self._assignments.get(key) for key in keys]
+        # An update to a record deleted locally would fail the whole batch;
+        # recreate it instead.
+        gone = {
+            key
+            for key, assignment_id in zip(keys, known)
+            if assignment_id is not None and self._store.get(assignment_id) is None
+        }
+        if gone:
+            with self._lock:
+                for key in gone:
+                    self._assignments.pop(key, None)
+            known = [None if key in gone else found for key, found in zip(keys, known)]
+        operations = []
+        for item, assignment_id in zip(items, known):
+            data = self._payload(course_id, section_id, item)
+            if assignment_id is None:
+                operations.append({"op": "create", "data": data})
+            else:
+                operations.append({"op": "update", "id": assignment_id, "data": data})
+        records = self._store.apply(operations) if operations else []
+        with self._lock:
+            for key, record in zip(keys, records):
+                self._assignments[key] = record["id"]
+        try:
+            self._gradebooks.add_assignments(section_id, records)
+        except KeyError:
+            pass  # The section has no gradebook; assignments are still stored.
+
+    def submissions(
+        self, teacher_id: str, course: Course, results: Submissions
+    ) -> Optional[Collection[CourseworkKey]]:
+        target = self._sections.get(course["id"])
+        if target is None:
+            return None
+        section_id = target[1]
+        grades = []
+        keys: Dict[int, CourseworkKey] = {}
+        unapplied = set()
+        with self._lock:
+            for key, items in results.items():
+                assignment_id = self._assignments.get(key)
+                if assignment_id is None:
+                    graded = [item for item in items if item.get("assignedGrade") is not None]
+                    if graded:
+                        unapplied.add(key)
+                        self.skipped["grades"] += len(graded)
+                    continue
+                keys[assignment_id] = key
+                for submission in items:
+                    student_id = self._students.get(submission.get("userId"))
+                    if student_id is None:
+                        self.skipped["students"] += 1
+                    elif submission.get("assignedGrade") is not None:
+                        grades.append((student_id, assignment_id, submission["assignedGrade"]))
+        if not grades:
+            return unapplied
+        try:
+            skipped = self._gradebooks.set_grades(section_id, grades)
+        except KeyError:
+            skipped = [(student_id, assignment_id) for student_id, assignment_id, _ in grades]
+        self._skip("grades", len(skipped))
+        unapplied.update(keys[assignment_id] for _student_id, assignment_id in skipped)
+        return unapplied
+
+
+__all__ = [
+    "ClassroomSyncEngine",
+    "StoreSink",
+    "SyncReport",
+    "SyncSink",
+    "SyncWatermarks",
+]
@@ -8,6 +8,8 @@ from dataclasses import dataclass
 from email.message import EmailMessage
 from typing import Any, Iterable, List, Mapping, Optional
 
+from .google_discovery import build_client
+
 
 @dataclass
 class GmailConfig:
@@ -36,13 +38,7 @@ class GmailConfig:
 
 
 def _build_gmail_service(credentials):
-    try:
-        from googleapiclient.discovery import build
-    except ImportError as exc:  # pragma: no cover
-        raise RuntimeError(
-            "google-api-python-client is required for Gmail integration"
-        ) from exc
-    return build("gmail", "v1", credentials=credentials, cache_discovery=False)
+    return build_client("gmail", "v1", credentials, "Gmail integration")
 
 
 class GmailService:
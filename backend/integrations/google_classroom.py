@@ -3,8 +3,50 @@
 from __future__ import annotations
 
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Mapping, Optional, cast
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    cast,
+)
+
+from .google_discovery import build_client
+
+MAX_PAGE_SIZE = 1000
+"""Page size the ``iter_*`` methods request; the API lowers it to its own limit."""
+
+BATCH_LIMIT = 50
+"""Most calls the Classroom API accepts in one batch request."""
+
+Page = Mapping[str, Any]
+CourseworkKey = Tuple[str, str]
+
+
+class ClassroomBatchError(Exception):
+    """Some sub-requests of a batch failed.
+
+    ``errors`` maps each failed key to its exception; ``results`` holds what
+    was fetched, including any pages a failed key returned before failing.
+    """
+
+    def __init__(
+        self,
+        errors: Mapping[CourseworkKey, Exception],
+        results: Mapping[CourseworkKey, List[Mapping[str, Any]]],
+    ) -> None:
+        super().__init__(f"{len(errors)} batched request(s) failed")
+        self.errors = dict(errors)
+        self.results = dict(results)
 
 
 @dataclass
@@ -36,17 +78,44 @@ class GoogleClassroomConfig:
 
 
 def _build_classroom_service(credentials):
-    try:
-        from googleapiclient.discovery import build
-    except ImportError as exc:  # pragma: no cover
-        raise RuntimeError(
-            "google-api-python-client is required for Google Classroom integration"
-        ) from exc
-    return build("classroom", "v1", credentials=credentials, cache_discovery=False)
+    return build_client("classroom", "v1", credentials, "Google Classroom integration")
+
+
+def _pages(
+    fetch: Callable[[Optional[str]], Page],
+    prefetch: Optional[Callable[[Callable[[], Page]], Future]] = None,
+) -> Iterator[Page]:
+    """Yield pages from ``fetch(page_token)`` until one has no ``nextPageToken``.
+
+    With ``prefetch``, the next page is requested through it (in the
+    background) as soon as the current page is handed out, so the network
+    wait overlaps the caller's processing. At most two pages are held.
+    """
+    page = fetch(None)
+    while True:
+        token = page.get("nextPageToken")
+        pending = prefetch(partial(fetch, token)) if token and prefetch else None
+        try:
+            yield page
+        except BaseException:
+            # Abandoned early: don't leave the next request queued.
+            if pending is not None:
+                pending.cancel()
+            raise
+        if not token:
+            return
+        page = pending.result() if pending is not None else fetch(token)
 
 
 class GoogleClassroomService:
-    """High-level helper around the Google Classroom API."""
+    """High-level helper around the Google Classroom API.
+
+    The ``list_*`` methods return a single page. The ``iter_*`` methods walk
+    every page at :data:`MAX_PAGE_SIZE`, fetching the next page on a
+    background thread while the caller processes the current one.
+
+    API clients are not thread-safe, so each thread gets its own.
+    """
 
     def __init__(
         self,
@@ -56,24 +125,48 @@ class GoogleClassroomService:
     ) -> None:
         self._credentials = credentials
         self.config = config or GoogleClassroomConfig.from_env()
-        self._service_client = None
+        self._local = threading.local()
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
 
     def _get_service(self):
-        if self._service_client is None:
-            self._service_client = _build_classroom_service(self._credentials)
-        return self._service_client
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = self._local.service = _build_classroom_service(self._credentials)
+        return service
 
-    def list_courses(
+    def _prefetch(self, fetch: Callable[[], Page]) -> Future:
+        with self._lock:
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="classroom-prefetch"
+                )
+            return self._prefetch_executor.submit(fetch)
+
+    def _iter_items(
         self,
-        *,
-        teacher_id: Optional[str] = None,
-        student_id: Optional[str] = None,
-        course_states: Optional[Iterable[str]] = None,
-        page_size: int = 100,
-        page_token: Optional[str] = None,
-    ) -> List[Mapping[str, Any]]:
-        """List available Google Classroom courses for the authenticated user."""
+        fetch: Callable[[Optional[str]], Page],
+        key: str,
+        prefetch: bool,
+    ) -> Iterator[Mapping[str, Any]]:
+        for page in _pages(fetch, self._prefetch if prefetch else None):
+            yield from page.get(key, ())
+
+    def close(self) -> None:
+        """Stop the background prefetch thread, if one was started."""
+        with self._lock:
+            executor, self._prefetch_executor = self._prefetch_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
 
+    @staticmethod
+    def _course_params(
+        teacher_id: Optional[str],
+        student_id: Optional[str],
+        course_states: Optional[Iterable[str]],
+        page_size: int,
+        page_token: Optional[str],
+    ) -> Dict[str, Any]:
         params: Dict[str, Any] = {"pageSize": page_size}
         if teacher_id:
             params["teacherId"] = teacher_id
@@ -83,10 +176,79 @@ class GoogleClassroomService:
             params["courseStates"] = list(course_states)
         if page_token:
             params["pageToken"] = page_token
+        return params
+
+    def _courses_page(self, params: Mapping[str, Any]) -> Page:
+        return self._get_service().courses().list(**params).execute()
+
+    def _coursework_page(self, course_id: str, params: Mapping[str, Any]) -> Page:
+        return (
+            self._get_service()
+            .courses()
+            .courseWork()
+            .list(courseId=course_id, **params)
+            .execute()
+        )
+
+    @staticmethod
+    def _submissions_request(
+        service, course_id: str, coursework_id: str, params: Mapping[str, Any]
+    ):
+        return (
+            service.courses()
+            .courseWork()
+            .studentSubmissions()
+            .list(courseId=course_id, courseWorkId=coursework_id, **params)
+        )
+
+    def _submissions_page(
+        self, course_id: str, coursework_id: str, params: Mapping[str, Any]
+    ) -> Page:
+        request = self._submissions_request(
+            self._get_service(), course_id, coursework_id, params
+        )
+        return request.execute()
+
+    @staticmethod
+    def _page_params(page_size: int, page_token: Optional[str]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"pageSize": page_size}
+        if page_token:
+            params["pageToken"] = page_token
+        return params
+
+    def list_courses(
+        self,
+        *,
+        teacher_id: Optional[str] = None,
+        student_id: Optional[str] = None,
+        course_states: Optional[Iterable[str]] = None,
+        page_size: int = 100,
+        page_token: Optional[str] = None,
+    ) -> List[Mapping[str, Any]]:
+        """List available Google Classroom courses for the authenticated user."""
 
-        response = self._get_service().courses().list(**params).execute()
+        params = self._course_params(teacher_id, student_id, course_states, page_size, page_token)
+        response = self._courses_page(params)
         return list(response.get("courses", []))
 
+    def iter_courses(
+        self,
+        *,
+        teacher_id: Optional[str] = None,
+        student_id: Optional[str] = None,
+        course_states: Optional[Iterable[str]] = None,
+        prefetch: bool = True,
+    ) -> Iterator[Mapping[str, Any]]:
+        """Yield every course matching the filters, one page in memory at a time."""
+
+        states = list(course_states) if course_states else None
+
+        def fetch(token: Optional[str]) -> Page:
+            params = self._course_params(teacher_id, student_id, states, MAX_PAGE_SIZE, token)
+            return self._courses_page(params)
+
+        return self._iter_items(fetch, "courses", prefetch)
+
     def list_coursework(
         self,
         course_id: str,
@@ -96,18 +258,25 @@ class GoogleClassroomService:
     ) -> List[Mapping[str, Any]]:
         """List coursework for a course."""
 
-        params: Dict[str, Any] = {"pageSize": page_size}
-        if page_token:
-            params["pageToken"] = page_token
-        response = (
-            self._get_service()
-            .courses()
-            .courseWork()
-            .list(courseId=course_id, **params)
-            .execute()
-        )
+        response = self._coursework_page(course_id, self._page_params(page_size, page_token))
         return list(response.get("courseWork", []))
 
+    def iter_coursework(
+        self, course_id: str, *, order_by: Optional[str] = None, prefetch: bool = True
+    ) -> Iterator[Mapping[str, Any]]:
+        """Yield every coursework item of a course, one page in memory at a time.
+
+        ``order_by`` is passed through as ``orderBy`` (e.g. ``"updateTime desc"``).
+        """
+
+        def fetch(token: Optional[str]) -> Page:
+            params = self._page_params(MAX_PAGE_SIZE, token)
+            if order_by:
+                params["orderBy"] = order_by
+            return self._coursework_page(course_id, params)
+
+        return self._iter_items(fetch, "courseWork", prefetch)
+
     def create_coursework(self, course_id: str, body: Mapping[str, Any]) -> Mapping[str, Any]:
         """Create coursework within a Google Classroom course."""
 
@@ -127,21 +296,73 @@ class GoogleClassroomService:
         page_size: int = 30,
         page_token: Optional[str] = None,
     ) -> List[Mapping[str, Any]]:
-        params: Dict[str, Any] = {"pageSize": page_size}
-        if page_token:
-            params["pageToken"] = page_token
-        response = (
-            self._get_service()
-            .courses()
-            .courseWork()
-            .studentSubmissions()
-            .list(courseId=course_id, courseWorkId=coursework_id, **params)
-            .execute()
-        )
+        params = self._page_params(page_size, page_token)
+        response = self._submissions_page(course_id, coursework_id, params)
         return list(response.get("studentSubmissions", []))
 
+    def batch_get_student_submissions(
+        self, coursework: Iterable[CourseworkKey]
+    ) -> Dict[CourseworkKey, List[Mapping[str, Any]]]:
+        """Fetch every submission for many ``(course_id, coursework_id)`` pairs.
+
+        ``studentSubmissions.list`` calls are sent up to :data:`BATCH_LIMIT` at
+        a time in multipart batch requests instead of one round trip each. A
+        sub-request with a ``nextPageToken`` is queued again for its next
+        page, so every pair is read in full. Results are keyed by pair, in
+        input order. If any sub-request fails, :class:`ClassroomBatchError` is
+        raised once all others are done.
+        """
+
+        keys = list(dict.fromkeys(coursework))
+        results: Dict[CourseworkKey, List[Mapping[str, Any]]] = {key: [] for key in keys}
+        errors: Dict[CourseworkKey, Exception] = {}
+        pending: List[Tuple[CourseworkKey, Optional[str]]] = [(key, None) for key in keys]
+        service = self._get_service()
+        while pending:
+            sent, pending = pending[:BATCH_LIMIT], pending[BATCH_LIMIT:]
+            next_pages: List[Tuple[CourseworkKey, Optional[str]]] = []
+
+            def _callback(request_id: str, response: Page, exception: Exception | None) -> None:
+                key = sent[int(request_id)][0]
+                if exception is not None:
+                    errors[key] = exception
+                    return
+                results[key].extend(response.get("studentSubmissions", ()))
+                token = response.get("nextPageToken")
+                if token:
+                    next_pages.append((key, token))
+
+            batch = service.new_batch_http_request(callback=_callback)
+            for index, ((course_id, coursework_id), token) in enumerate(sent):
+                params = self._page_params(MAX_PAGE_SIZE, token)
+                batch.add(
+                    self._submissions_request(service, course_id, coursework_id, params),
+                    request_id=str(index),
+                )
+            batch.execute()
+            # Behind the first pages still waiting, so every batch stays full.
+            pending += next_pages
+        if errors:
+            raise ClassroomBatchError(errors, results)
+        return results
+
+    def iter_submissions(
+        self, course_id: str, coursework_id: str = "-", *, prefetch: bool = True
+    ) -> Iterator[Mapping[str, Any]]:
+        """Yield every student submission, one page in memory at a time.
+
+        ``coursework_id="-"`` covers all coursework in the course.
+        """
+
+        def fetch(token: Optional[str]) -> Page:
+            params = self._page_params(MAX_PAGE_SIZE, token)
+            return self._submissions_page(course_id, coursework_id, params)
+
+        return self._iter_items(fetch, "studentSubmissions", prefetch)
+
 
 __all__ = [
+    "ClassroomBatchError",
     "GoogleClassroomConfig",
     "GoogleClassroomService",
 ]
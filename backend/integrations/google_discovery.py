@@ -0,0 +1,169 @@
+"""Process-wide cache of Google API discovery documents and client builds.
+
+``googleapiclient.discovery.build()`` reads and parses an API's discovery
+document on every call, and SchoolOS builds a client per teacher (and per
+thread) for each request. :class:`DiscoveryCache` parses each document
+once per process and builds clients from it with ``build_from_document``.
+googleapiclient fixes up method descriptions in the document it is given
+as a client is used, so every build gets its own copy of the parsed
+document; copying the plain dicts and lists is cheaper than parsing again.
+
+Documents are loaded from ``$GOOGLE_DISCOVERY_DIR/<api>.<version>.json``
+when that directory is set, otherwise from the static copies bundled with
+google-api-python-client. Neither needs the network, so clients can be
+built offline. The discovery service is fetched only when neither source
+has the API.
+
+Each build and document load is timed. :meth:`DiscoveryCache.metrics`
+reports the timings per API.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import urllib.request
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+DISCOVERY_DIR_ENV = "GOOGLE_DISCOVERY_DIR"
+
+_DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/{api}/{version}/rest"
+
+
+def _static_document(api: str, version: str) -> Optional[str]:
+    directory = os.environ.get(DISCOVERY_DIR_ENV)
+    if directory:
+        path = Path(directory) / f"{api}.{version}.json"
+        if path.is_file():
+            return path.read_text(encoding="utf-8")
+    try:
+        from googleapiclient.discovery_cache import get_static_doc
+    except ImportError:  # pragma: no cover - executed only without deps
+        return None
+    return get_static_doc(api, version)
+
+
+def _fetch_document(api: str, version: str) -> str:
+    url = _DISCOVERY_URL.format(api=api, version=version)
+    with urllib.request.urlopen(url) as response:  # nosec B310 - Google endpoint
+        return response.read().decode("utf-8")
+
+
+def _copy(value: Any) -> Any:
+    """Copy a parsed JSON document; faster than ``copy.deepcopy`` or re-parsing."""
+    if type(value) is dict:
+        return {key: _copy(item) for key, item in value.items()}
+    if type(value) is list:
+        return [_copy(item) for item in value]
+    return value
+
+
+def _builder(feature: str) -> Callable[..., Any]:
+    try:
+        from googleapiclient.discovery import build_from_document
+    except ImportError as exc:  # pragma: no cover
+        raise RuntimeError(f"google-api-python-client is required for {feature}") from exc
+    return build_from_document
+
+
+@dataclass
+class BuildTimings:
+    """Count and wall time of one kind of operation for one API."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        elapsed = seconds * 1000
+        self.count += 1
+        self.total_ms += elapsed
+        self.max_ms = max(self.max_ms, elapsed)
+
+
+class DiscoveryCache:
+    """Parsed discovery documents, keyed by ``(api, version)``, copied for each client."""
+
+    def __init__(self) -> None:
+        self._documents: Dict[Tuple[str, str], Mapping[str, Any]] = {}
+        self._loads: Dict[str, BuildTimings] = {}
+        self._builds: Dict[str, BuildTimings] = {}
+        self._lock = threading.Lock()
+
+    def document(self, api: str, version: str) -> Dict[str, Any]:
+        """A private copy of the parsed document for ``api``/``version``."""
+        return _copy(self._parsed(api, version))
+
+    def _parsed(self, api: str, version: str) -> Mapping[str, Any]:
+        """The shared parsed document, loaded on first use; never handed out."""
+        key = (api, version)
+        document = self._documents.get(key)
+        if document is not None:
+            return document
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None:
+                started = time.perf_counter()
+                text = _static_document(api, version) or _fetch_document(api, version)
+                document = json.loads(text)
+                self._documents[key] = document
+                self._timings(self._loads, api, version).add(time.perf_counter() - started)
+        return document
+
+    def build(self, api: str, version: str, credentials, feature: str):
+        """A client for ``credentials`` built from a copy of the cached document.
+
+        ``feature`` names the integration in the ``RuntimeError`` raised when
+        google-api-python-client is not installed.
+        """
+        build_from_document = _builder(feature)
+        started = time.perf_counter()
+        client = build_from_document(self.document(api, version), credentials=credentials)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._timings(self._builds, api, version).add(elapsed)
+        return client
+
+    @staticmethod
+    def _timings(table: Dict[str, BuildTimings], api: str, version: str) -> BuildTimings:
+        return table.setdefault(f"{api}.{version}", BuildTimings())
+
+    def metrics(self) -> Dict[str, Any]:
+        """Document load and client build timings per ``"<api>.<version>"``.
+
+        Build times include copying the document, and loading it on a cold cache.
+        """
+        with self._lock:
+            return {
+                "documents": {name: asdict(value) for name, value in self._loads.items()},
+                "clients": {name: asdict(value) for name, value in self._builds.items()},
+            }
+
+    def clear(self) -> None:
+        """Forget cached documents and timings (after replacing documents on disk)."""
+        with self._lock:
+            self._documents.clear()
+            self._loads.clear()
+            self._builds.clear()
+
+
+DISCOVERY_CACHE = DiscoveryCache()
+"""The process-wide cache used by the Classroom, Gmail and OAuth helpers."""
+
+
+def build_client(api: str, version: str, credentials, feature: str):
+    """Build a Google API client through :data:`DISCOVERY_CACHE`."""
+    return DISCOVERY_CACHE.build(api, version, credentials, feature)
+
+
+__all__ = [
+    "BuildTimings",
+    "DISCOVERY_CACHE",
+    "DISCOVERY_DIR_ENV",
+    "DiscoveryCache",
+    "build_client",
+]
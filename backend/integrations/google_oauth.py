@@ -7,6 +7,8 @@ import urllib.request
 from dataclasses import dataclass
 from typing import Mapping, Optional, Sequence, Tuple, cast
 
+from .google_discovery import build_client
+
 try:  # pragma: no cover - optional dependency import
     from typing import Protocol
 except ImportError:  # pragma: no cover
@@ -140,13 +142,7 @@ def _credentials_class():
 
 
 def _build_discovery_service(api: str, version: str, credentials):
-    try:
-        from googleapiclient.discovery import build
-    except ImportError as exc:  # pragma: no cover
-        raise RuntimeError(
-            "google-api-python-client is required for Google OAuth operations"
-        ) from exc
-    return build(api, version, credentials=credentials, cache_discovery=False)
+    return build_client(api, version, credentials, "Google OAuth operations")
 
 
 class GoogleOAuthService:
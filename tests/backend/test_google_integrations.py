@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import json
 import sys
+import threading
+import time
 from pathlib import Path
 from types import SimpleNamespace
 
@@ -9,7 +12,12 @@ BACKEND_DIR = REPO_ROOT / "backend"
 if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
 
-from integrations import gmail_service, google_classroom, google_oauth  # noqa: E402
+from integrations import (  # noqa: E402
+    gmail_service,
+    google_classroom,
+    google_discovery,
+    google_oauth,
+)
 
 
 def test_google_oauth_generate_authorization_url(monkeypatch):
@@ -127,6 +135,626 @@ def test_google_classroom_list_courses(monkeypatch):
     }
 
 
+class _PagedRequest:
+    def __init__(self, pages, calls, key, params):
+        self._pages, self._calls, self._key, self._params = pages, calls, key, params
+
+    def execute(self):
+        self._calls.append(self._params)
+        token = self._params.get("pageToken")
+        index = int(token) if token else 0
+        page = {self._key: self._pages[index]}
+        if index + 1 < len(self._pages):
+            page["nextPageToken"] = str(index + 1)
+        return page
+
+
+def _paged_service(pages, calls):
+    class SubmissionsResource:
+        def list(self, **kwargs):
+            return _PagedRequest(pages, calls, "studentSubmissions", kwargs)
+
+    class CourseWorkResource:
+        def list(self, **kwargs):
+            return _PagedRequest(pages, calls, "courseWork", kwargs)
+
+        def studentSubmissions(self):
+            return SubmissionsResource()
+
+    class CoursesResource:
+        def list(self, **kwargs):
+            return _PagedRequest(pages, calls, "courses", kwargs)
+
+        def courseWork(self):
+            return CourseWorkResource()
+
+    class Batch:
+        def __init__(self, callback):
+            self._callback = callback
+            self._requests = []
+
+        def add(self, request, request_id):
+            self._requests.append((request_id, request))
+
+        def execute(self):
+            batches.append(len(self._requests))
+            for request_id, request in self._requests:
+                try:
+                    response, error = request.execute(), None
+                except Exception as exc:  # noqa: BLE001 - delivered like the real batch
+                    response, error = None, exc
+                self._callback(request_id, response, error)
+
+    class Service:
+        def courses(self):
+            return CoursesResource()
+
+        def new_batch_http_request(self, callback):
+            return Batch(callback)
+
+    batches = []
+    service = Service()
+    service.batches = batches
+    return service
+
+
+def test_google_classroom_iter_courses_walks_every_page(monkeypatch):
+    pages = [[{"id": f"course-{page}-{item}"} for item in range(3)] for page in range(4)]
+    calls = []
+    monkeypatch.setattr(
+        google_classroom,
+        "_build_classroom_service",
+        lambda credentials: _paged_service(pages, calls),
+    )
+
+    service = google_classroom.GoogleClassroomService(credentials=object())
+    courses = list(service.iter_courses(teacher_id="teacher-1"))
+    service.close()
+
+    assert courses == [course for page in pages for course in page]
+    assert [call.get("pageToken") for call in calls] == [None, "1", "2", "3"]
+    assert all(call["pageSize"] == google_classroom.MAX_PAGE_SIZE for call in calls)
+    assert all(call["teacherId"] == "teacher-1" for call in calls)
+
+
+def test_google_classroom_iterators_prefetch_the_next_page(monkeypatch):
+    pages = [[{"id": f"work-{page}"}] for page in range(5)]
+    calls = []
+    monkeypatch.setattr(
+        google_classroom,
+        "_build_classroom_service",
+        lambda credentials: _paged_service(pages, calls),
+    )
+
+    service = google_classroom.GoogleClassroomService(credentials=object())
+    coursework = service.iter_coursework("course-1")
+    assert next(coursework) == {"id": "work-0"}
+    deadline = time.monotonic() + 5
+    while len(calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    # Page two was fetched in the background; nothing further was requested.
+    assert [call.get("pageToken") for call in calls] == [None, "1"]
+    coursework.close()
+    service.close()
+    assert len(calls) == 2
+
+    submissions = list(service.iter_submissions("course-1", prefetch=False))
+    assert submissions == [{"id": f"work-{page}"} for page in range(5)]
+    assert calls[2]["courseWorkId"] == "-"
+
+
+def test_google_classroom_batches_submission_lists(monkeypatch):
+    pages = [[{"id": "sub-a"}], [{"id": "sub-b"}]]
+    calls = []
+    fake = _paged_service(pages, calls)
+    monkeypatch.setattr(google_classroom, "_build_classroom_service", lambda credentials: fake)
+
+    service = google_classroom.GoogleClassroomService(credentials=object())
+    pairs = [(f"course-{c}", f"work-{w}") for c in range(3) for w in range(40)]
+    results = service.batch_get_student_submissions(pairs + pairs[:5])
+
+    assert list(results) == pairs
+    assert all(
+        submissions == [{"id": "sub-a"}, {"id": "sub-b"}] for submissions in results.values()
+    )
+    # 120 first pages and 120 second pages, never more than the batch limit per request.
+    assert sum(fake.batches) == 240
+    assert max(fake.batches) == google_classroom.BATCH_LIMIT
+    assert len(fake.batches) == 5
+    first = calls[0]
+    assert (first["courseId"], first["courseWorkId"]) == ("course-0", "work-0")
+    assert first["pageSize"] == google_classroom.MAX_PAGE_SIZE
+
+
+def test_google_classroom_batch_reports_failed_sub_requests(monkeypatch):
+    calls = []
+    fake = _paged_service([[{"id": "sub-a"}]], calls)
+    original_execute = _PagedRequest.execute
+
+    def execute(self):
+        if self._params.get("courseWorkId") == "broken":
+            raise ValueError("HTTP 404")
+        return original_execute(self)
+
+    monkeypatch.setattr(_PagedRequest, "execute", execute)
+    monkeypatch.setattr(google_classroom, "_build_classroom_service", lambda credentials: fake)
+
+    service = google_classroom.GoogleClassroomService(credentials=object())
+    try:
+        service.batch_get_student_submissions([("course-1", "ok"), ("course-1", "broken")])
+    except google_classroom.ClassroomBatchError as exc:
+        error = exc
+    else:  # pragma: no cover - the batch must fail
+        raise AssertionError("expected ClassroomBatchError")
+
+    assert list(error.errors) == [("course-1", "broken")]
+    assert error.results[("course-1", "ok")] == [{"id": "sub-a"}]
+
+
+def _load():
+    """Per-teacher request concurrency, shared by every fake service of a test."""
+    return SimpleNamespace(
+        in_flight={},
+        peaks={},
+        lock=threading.Lock(),
+        calls=[],
+        update_times={},
+        coursework={},
+    )
+
+
+class _DistrictRequest:
+    def __init__(self, teacher, key, items, load):
+        self._teacher, self._key, self._items, self._load = teacher, key, items, load
+
+    def execute(self):
+        load = self._load
+        with load.lock:
+            load.calls.append(self._key)
+            load.in_flight[self._teacher] = load.in_flight.get(self._teacher, 0) + 1
+            peak = max(load.peaks.get(self._teacher, 0), load.in_flight[self._teacher])
+            load.peaks[self._teacher] = peak
+        time.sleep(0.002)
+        with load.lock:
+            load.in_flight[self._teacher] -= 1
+        if self._items is None:
+            raise ValueError("HTTP 404")
+        return {self._key: self._items}
+
+
+def _district_service(district, teacher, load):
+    """A fake Classroom API for ``district``: teacher -> course -> coursework -> submissions."""
+
+    def request(key, items):
+        return _DistrictRequest(teacher, key, items, load)
+
+    def coursework_of(courseId):
+        return next(courses[courseId] for courses in district.values() if courseId in courses)
+
+    class SubmissionsResource:
+        def list(self, courseId, courseWorkId, **kwargs):
+            return request("studentSubmissions", coursework_of(courseId).get(courseWorkId))
+
+    class CourseWorkResource:
+        def list(self, courseId, orderBy=None, **kwargs):
+            items = [
+                {"id": work_id, "title": work_id, "maxPoints": 10}
+                for work_id in coursework_of(courseId)
+            ]
+            for item in items:
+                item.update(load.coursework.get(item["id"], {}))
+                if item["id"] in load.update_times:
+                    item["updateTime"] = load.update_times[item["id"]]
+            if orderBy == "updateTime desc":
+                items.sort(key=lambda item: item.get("updateTime", ""), reverse=True)
+            return request("courseWork", items)
+
+        def studentSubmissions(self):
+            return SubmissionsResource()
+
+    class CoursesResource:
+        def list(self, teacherId, **kwargs):
+            return request("courses", [{"id": course_id} for course_id in district[teacherId]])
+
+        def courseWork(self):
+            return CourseWorkResource()
+
+    class Batch:
+        def __init__(self, callback):
+            self._callback, self._requests = callback, []
+
+        def add(self, request, request_id):
+            self._requests.append((request_id, request))
+
+        def execute(self):
+            for request_id, request in self._requests:
+                try:
+                    response, error = request.execute(), None
+                except Exception as exc:  # noqa: BLE001 - delivered like the real batch
+                    response, error = None, exc
+                self._callback(request_id, response, error)
+
+    class Service:
+        def courses(self):
+            return CoursesResource()
+
+        def new_batch_http_request(self, callback):
+            return Batch(callback)
+
+    return Service()
+
+
+def _sync_district():
+    district = {
+        f"teacher-{t}": {
+            f"course-{t}-{c}": {
+                f"work-{t}-{c}-{w}": [
+                    {"userId": f"student-{s}", "assignedGrade": w + s} for s in range(3)
+                ]
+                for w in range(7)
+            }
+            for c in range(4)
+        }
+        for t in range(5)
+    }
+    district["teacher-0"]["course-0-0"]["work-0-0-6"] = None  # submissions list fails
+    return district
+
+
+def test_classroom_sync_engine_caps_requests_per_teacher(monkeypatch):
+    from integrations.classroom_sync import ClassroomSyncEngine
+
+    district = _sync_district()
+    load = _load()
+    monkeypatch.setattr(
+        google_classroom,
+        "_build_classroom_service",
+        lambda credentials: _district_service(district, credentials, load),
+    )
+    received = {"coursework": {}, "submissions": {}}
+
+    class Sink:
+        def coursework(self, teacher_id, course, items):
+            received["coursework"][course["id"]] = [item["id"] for item in items]
+
+        def submissions(self, teacher_id, course, results):
+            received["submissions"].update(results)
+
+    engine = ClassroomSyncEngine(
+        lambda teacher_id: google_classroom.GoogleClassroomService(credentials=teacher_id),
+        Sink(),
+        max_workers=16,
+        per_teacher=2,
+        batch_size=3,
+    )
+    report = engine.run(district)
+
+    assert (report.teachers, report.courses, report.coursework) == (5, 20, 140)
+    # One failed list call loses only its own coursework item.
+    assert report.submissions == 139 * 3
+    assert len(received["submissions"]) == 140
+    assert received["submissions"][("course-0-0", "work-0-0-6")] == []
+    assert [error["task"] for error in report.errors] == ["submissions"]
+    assert received["coursework"]["course-3-2"] == [f"work-3-2-{w}" for w in range(7)]
+    assert set(load.peaks) == set(district)
+    assert max(load.peaks.values()) == 2
+
+
+def test_classroom_sync_store_sink_writes_assignments_and_grades(monkeypatch):
+    from api.gradebook import GradebookRegistry
+    from api.mock_data import DatasetVersions, MockAssignmentStore
+    from integrations.classroom_sync import ClassroomSyncEngine, StoreSink
+
+    district = {"teacher-1": {"course-a": {"work-1": [], "work-2": []}, "course-b": {}}}
+    district["teacher-1"]["course-a"]["work-1"] = [
+        {"userId": "g-501", "assignedGrade": 9},
+        {"userId": "g-502"},
+        {"userId": "g-unknown", "assignedGrade": 4},
+    ]
+    district["teacher-1"]["course-a"]["work-2"] = [{"userId": "g-502", "assignedGrade": 7}]
+    load = _load()
+    load.coursework["work-1"] = {
+        "dueDate": {"year": 2024, "month": 10, "day": 3},
+        "gradeCategory": {"name": "quiz"},
+    }
+    load.coursework["work-2"] = {"maxPoints": 12.5, "gradeCategory": {"name": "Extra credit"}}
+    monkeypatch.setattr(
+        google_classroom,
+        "_build_classroom_service",
+        lambda credentials: _district_service(district, credentials, load),
+    )
+    fixtures = {
+        301: {
+            "section_id": 301,
+            "category_weights": {},
+            "assignments": [],
+            "students": [
+                {"student_id": 501, "name": "Ada", "grades": {}},
+                {"student_id": 502, "name": "Ben", "grades": {}},
+            ],
+        }
+    }
+    store = MockAssignmentStore()
+    seeded = len(store.all())
+    versions = DatasetVersions()
+    gradebooks = GradebookRegistry(fixtures, store, versions)
+    sections, students = {"course-a": (11, 301)}, {"g-501": 501, "g-502": 502}
+    categories = {301: ["Quiz", "Homework"]}
+    sink = StoreSink(store, gradebooks, sections, students, categories=categories)
+    engine = ClassroomSyncEngine(
+        lambda teacher_id: google_classroom.GoogleClassroomService(credentials=teacher_id), sink
+    )
+
+    report = engine.run(["teacher-1"])
+    first = sink.assignment_id("course-a", "work-1")
+    second = sink.assignment_id("course-a", "work-2")
+    engine.run(["teacher-1"])
+    # A later process picks the links up again instead of duplicating records.
+    restarted = StoreSink(
+        store, gradebooks, sections, students, sink.links(), categories=categories
+    )
+    ClassroomSyncEngine(
+        lambda teacher_id: google_classroom.GoogleClassroomService(credentials=teacher_id),
+        restarted,
+    ).run(["teacher-1"])
+
+    assert report.errors == []
+    assert len(store.all()) == seeded + 2
+    assert sink.assignment_id("course-a", "work-1") == first
+    record = store.get(first)
+    assert (record["title"], record["points_possible"]) == ("work-1", 10)
+    assert record["due_date"] == "2024-10-03"
+    assert (store.get(second)["points_possible"], store.get(second)["due_date"]) == (12.5, None)
+    assert (record["course_id"], record["section_id"], record["category"]) == (11, 301, "Quiz")
+    # Classroom categories outside the section's grading policy count as homework.
+    assert store.get(second)["category"] == "Homework"
+    payload = gradebooks.get(301).to_dict()
+    assert [assignment["id"] for assignment in payload["assignments"]] == [first, second]
+    grades = {row["student_id"]: row["grades"] for row in payload["students"]}
+    assert grades == {501: {first: 9}, 502: {second: 7}}
+    assert sink.skipped == {"courses": 2, "students": 2, "grades": 0}
+
+
+def test_classroom_sync_incremental_run_reads_only_changes(monkeypatch, tmp_path):
+    from datetime import datetime, timedelta, timezone
+
+    from integrations.classroom_sync import ClassroomSyncEngine, SyncWatermarks
+
+    start = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=30)
+
+    def day(n):
+        return (start + timedelta(days=n)).isoformat().replace("+00:00", "Z")
+
+    def submission(user, grade, n):
+        return {"userId": user, "assignedGrade": grade, "updateTime": day(n)}
+
+    coursework = {
+        "old": [submission("s1", 5, 1)],
+        "recent": [submission("s1", 7, 10), submission("s2", 8, 10)],
+    }
+    district = {"teacher-1": {"course-a": coursework}}
+    load = _load()
+    load.update_times.update({"old": day(0).replace("Z", ".123456789Z"), "recent": day(9)})
+    monkeypatch.setattr(
+        google_classroom,
+        "_build_classroom_service",
+        lambda credentials: _district_service(district, credentials, load),
+    )
+    received = []
+
+    class Sink:
+        def coursework(self, teacher_id, course, items):
+            received.append(("coursework", [item["id"] for item in items]))
+
+        def submissions(self, teacher_id, course, results):
+            received.append(("submissions", {key[1]: items for key, items in results.items()}))
+
+    engine = ClassroomSyncEngine(
+        lambda teacher_id: google_classroom.GoogleClassroomService(credentials=teacher_id), Sink()
+    )
+    path = tmp_path / "state" / "watermarks.json"
+    watermarks = SyncWatermarks.load(path, active_days=60)
+    engine.run(["teacher-1"], watermarks)
+    watermarks.save(path)
+    assert received[0] == ("coursework", ["recent", "old"])
+    assert received[1] == ("submissions", coursework)
+
+    # Nothing changed: one coursework page, active coursework polled, nothing passed on.
+    received.clear()
+    load.calls.clear()
+    engine.run(["teacher-1"], SyncWatermarks.load(path, active_days=60))
+    assert received == [("submissions", {"recent": [], "old": []})]
+    assert load.calls == ["courses", "courseWork", "studentSubmissions", "studentSubmissions"]
+
+    # A regrade and a new assignment reach the sink as diffs only.
+    coursework["recent"][1] = submission("s2", 9, 18)
+    coursework["new"] = [submission("s1", 3, 18)]
+    load.update_times["new"] = day(18)
+    received.clear()
+    watermarks = SyncWatermarks.load(path, active_days=60)
+    engine.run(["teacher-1"], watermarks)
+    assert received[0] == ("coursework", ["new"])
+    assert received[1] == (
+        "submissions",
+        {"new": [submission("s1", 3, 18)], "recent": [submission("s2", 9, 18)], "old": []},
+    )
+    marks = watermarks.to_dict()["course-a"]
+    assert marks["updateTime"] == day(18)
+    assert marks["coursework"]["recent"]["submissions"] == day(18)
+
+    # Coursework quiet for longer than the active window is no longer polled.
+    load.calls.clear()
+    engine.run(["teacher-1"], SyncWatermarks(watermarks.to_dict(), active_days=5))
+    assert load.calls == ["courses", "courseWork"]
+
+
+def test_classroom_sync_holds_back_grades_it_cannot_link(monkeypatch, tmp_path):
+    from datetime import datetime, timedelta, timezone
+
+    from api.gradebook import GradebookRegistry
+    from api.mock_data import DatasetVersions, MockAssignmentStore
+    from integrations.classroom_sync import ClassroomSyncEngine, StoreSink, SyncWatermarks
+
+    start = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=3)
+
+    def day(n):
+        return (start + timedelta(days=n)).isoformat().replace("+00:00", "Z")
+
+    work = [{"userId": "g-501", "assignedGrade": 6, "updateTime": day(0)}]
+    district = {"teacher-1": {"course-a": {"work-1": work}}}
+    load = _load()
+    load.update_times["work-1"] = day(0)
+    monkeypatch.setattr(
+        google_classroom,
+        "_build_classroom_service",
+        lambda credentials: _district_service(district, credentials, load),
+    )
+    fixtures = {
+        301: {
+            "section_id": 301,
+            "assignments": [],
+            "students": [{"student_id": 501, "name": "Ada", "grades": {}}],
+        }
+    }
+    store = MockAssignmentStore()
+    gradebooks = GradebookRegistry(fixtures, store, DatasetVersions())
+    path = tmp_path / "watermarks.json"
+
+    def sync(links=None):
+        sink = StoreSink(store, gradebooks, {"course-a": (11, 301)}, {"g-501": 501}, links)
+        watermarks = SyncWatermarks.load(path)
+        ClassroomSyncEngine(
+            lambda teacher_id: google_classroom.GoogleClassroomService(credentials=teacher_id),
+            sink,
+        ).run(["teacher-1"], watermarks)
+        watermarks.update_links(sink.links())
+        watermarks.save(path)
+        return sink, watermarks
+
+    first, _marks = sync()
+    assignment_id = first.assignment_id("course-a", "work-1")
+    saved = SyncWatermarks.load(path)
+    assert saved.links() == {("course-a", "work-1"): assignment_id}
+    assert saved.to_dict()["course-a"]["coursework"]["work-1"]["assignment_id"] == assignment_id
+
+    # Regraded, then synced by a process that lost the links: held back, not skipped past.
+    work[0] = {"userId": "g-501", "assignedGrade": 9, "updateTime": day(1)}
+    unlinked, marks = sync()
+    assert unlinked.skipped["grades"] == 1
+    assert marks.to_dict()["course-a"]["coursework"]["work-1"]["submissions"] == day(0)
+
+    # With the saved links the next run applies the regrade to the same record.
+    seeded = len(store.all())
+    linked, marks = sync(SyncWatermarks.load(path).links())
+    assert linked.skipped["grades"] == 0
+    assert len(store.all()) == seeded
+    assert marks.to_dict()["course-a"]["coursework"]["work-1"]["submissions"] == day(1)
+    grades = gradebooks.get(301).to_dict()["students"][0]["grades"]
+    assert grades == {assignment_id: 9}
+
+
+def test_classroom_sync_store_sink_recreates_locally_deleted_assignments():
+    from api.gradebook import GradebookRegistry
+    from api.mock_data import DatasetVersions, MockAssignmentStore
+    from integrations.classroom_sync import StoreSink
+
+    fixtures = {301: {"section_id": 301, "assignments": [], "students": []}}
+    store = MockAssignmentStore()
+    gradebooks = GradebookRegistry(fixtures, store, DatasetVersions())
+    course = {"id": "course-a"}
+    sink = StoreSink(store, gradebooks, {"course-a": (11, 301)}, {})
+    sink.coursework("teacher-1", course, [{"id": "work-1", "title": "Essay", "maxPoints": 10}])
+    deleted = sink.assignment_id("course-a", "work-1")
+    assert store.delete(deleted)
+
+    # A later run with the saved link, plus a new coursework item in the same batch.
+    restarted = StoreSink(store, gradebooks, {"course-a": (11, 301)}, {}, sink.links())
+    items = [
+        {"id": "work-1", "title": "Essay (revised)", "maxPoints": 10},
+        {"id": "work-2", "title": "Lab", "maxPoints": 5},
+    ]
+    restarted.coursework("teacher-1", course, items)
+
+    recreated = restarted.assignment_id("course-a", "work-1")
+    added = restarted.assignment_id("course-a", "work-2")
+    assert recreated not in (None, deleted)
+    assert store.get(recreated)["title"] == "Essay (revised)"
+    assert store.get(added)["title"] == "Lab"
+    assert restarted.links() == {("course-a", "work-1"): recreated, ("course-a", "work-2"): added}
+
+
+def test_discovery_cache_parses_each_document_once(monkeypatch, tmp_path):
+    (tmp_path / "classroom.v1.json").write_text('{"name": "classroom", "rootUrl": "x"}')
+    (tmp_path / "gmail.v1.json").write_text('{"name": "gmail"}')
+    monkeypatch.setenv(google_discovery.DISCOVERY_DIR_ENV, str(tmp_path))
+
+    def offline(api, version):  # pragma: no cover - must not be reached
+        raise AssertionError("fetched a discovery document over the network")
+
+    built = []
+
+    def build_from_document(document, credentials):
+        built.append((document, credentials))
+        return SimpleNamespace(document=document, credentials=credentials)
+
+    monkeypatch.setattr(google_discovery, "_fetch_document", offline)
+    monkeypatch.setattr(google_discovery, "_builder", lambda feature: build_from_document)
+    cache = google_discovery.DiscoveryCache()
+    monkeypatch.setattr(google_discovery, "DISCOVERY_CACHE", cache)
+
+    first = google_classroom._build_classroom_service("teacher-1")
+    second = google_classroom._build_classroom_service("teacher-2")
+    gmail = gmail_service._build_gmail_service("teacher-1")
+
+    assert (first.credentials, second.credentials) == ("teacher-1", "teacher-2")
+    assert first.document is not second.document
+    assert first.document == {"name": "classroom", "rootUrl": "x"}
+    assert gmail.document == {"name": "gmail"}
+    metrics = cache.metrics()
+    assert {name: timings["count"] for name, timings in metrics["documents"].items()} == {
+        "classroom.v1": 1,
+        "gmail.v1": 1,
+    }
+    assert metrics["clients"]["classroom.v1"]["count"] == 2
+    assert metrics["clients"]["classroom.v1"]["max_ms"] >= 0
+
+
+def test_discovery_cache_builds_concurrently_on_private_copies(monkeypatch, tmp_path):
+    pristine = {"resources": {"courses": {"methods": {"list": {"parameters": {}}}}}}
+    (tmp_path / "classroom.v1.json").write_text(json.dumps(pristine))
+    monkeypatch.setenv(google_discovery.DISCOVERY_DIR_ENV, str(tmp_path))
+    seen = []
+
+    def build_from_document(document, credentials):
+        # Like googleapiclient's parameter fix-up: read, then mutate in place.
+        parameters = document["resources"]["courses"]["methods"]["list"]["parameters"]
+        snapshot = json.dumps(document, sort_keys=True)
+        time.sleep(0.001)
+        parameters[f"pageToken-{credentials}"] = {"type": "string"}
+        seen.append(snapshot)
+        return SimpleNamespace(document=document, credentials=credentials)
+
+    monkeypatch.setattr(google_discovery, "_builder", lambda feature: build_from_document)
+    cache = google_discovery.DiscoveryCache()
+    cache.document("classroom", "v1")
+    barrier = threading.Barrier(8)
+    clients = []
+
+    def build(teacher):
+        barrier.wait()
+        clients.append(cache.build("classroom", "v1", teacher, "Google Classroom"))
+
+    threads = [threading.Thread(target=build, args=(teacher,)) for teacher in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen == [json.dumps(pristine, sort_keys=True)] * 8
+    assert len({id(client.document) for client in clients}) == 8
+    assert cache.document("classroom", "v1") == pristine
+
+
 def test_google_classroom_create_coursework(monkeypatch):
     captured_body = {}
 